@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+USD Instancing Analysis Script
+
+"This asset is placed 500 times - does every copy really need its own prims?"
+
+A prim that references (or payloads) an asset gets its OWN copy of every prim
+of that asset: 500 placements of a 40-prim asset are 20,000 composed prims,
+each with its own prim index and memory. If the placements are marked
+`instanceable = true`, USD composes the asset ONCE (a "prototype") and the
+500 placements share it - 500 instance prims + 40 prototype prims.
+
+Placements can share a prototype when:
+- they have the same composition arcs: the same referenced/payloaded asset
+  (file + prim), the same layer offset, the same inherits/specializes
+- they have the same variant selections
+- nothing below them is overridden in the scene's own layers - prims inside
+  an instance can't have opinions of their own, so such overrides would be
+  lost (opinions on the placement prim itself - transform, material
+  binding, visibility - are fine, every instance keeps them)
+
+This script groups the prims of a stage that way and reports, per group, how
+many composed prims instancing would save. With --measure it opens the stage
+with and without instancing (in fresh processes) and shows the real open
+time, memory and prim count. With --write it writes the `instanceable = true`
+opinions into a DEDICATED layer (default: 020_LYR_USD/Instancing_LYR.usda),
+which is added as the strongest sublayer of the root file with --add-sublayer.
+
+Usage:
+    # Report the groups of the project root file
+    python scripts/analyze_instancing.py
+
+    # Only groups with at least 10 placements, and measure the savings
+    python scripts/analyze_instancing.py --min-count 10 --measure
+
+    # Write 020_LYR_USD/Instancing_LYR.usda and add it as the first sublayer of the root file
+    python scripts/analyze_instancing.py --write --add-sublayer
+
+Note: Without --write this script only reads USD files. Run it again after
+the scene changed - prims that are instances already are not listed again,
+and the layer is updated in place.
+"""
+
+# Standard library imports
+import sys      # For command-line arguments and exit codes
+import os       # For relative paths in the output
+import argparse # For parsing command-line options
+import json     # The measuring child process reports its numbers as JSON
+import subprocess  # --measure opens the stage in fresh Python processes
+import tempfile    # --measure: the opinions go into a temporary layer
+import time     # Wall-clock timing
+from collections import defaultdict  # Prims per group
+from pathlib import Path  # Modern Python path handling
+
+# USD library imports
+try:
+    from pxr import Usd, Pcp, Sdf, Tf
+    # Usd: Main USD API - the composed stage and composition queries
+    # Pcp: Prim Cache Population - USD's composition engine (arc types)
+    # Sdf: Scene Description Foundation - layers and their specs
+    # Tf: Tools Foundation - USD's error type (raised for unparseable files)
+except ImportError:
+    print("Error: usd-core not installed. Install with: pip install usd-core")
+    sys.exit(1)
+
+# Shared helpers from the validation package (scripts/usd_goodstart/validate)
+from usd_goodstart.validate.memory import current_memory_mb
+from usd_goodstart.validate.opinion_layers import add_sublayer, default_layer_path, open_layer_for_update, save_layer
+
+
+# Project root = the folder that contains the scripts/ folder
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# File analyzed when none is given
+DEFAULT_ROOT_FILE = PROJECT_ROOT / "GoodStart_ROOT.usda"
+
+# Name of the instancing layer in the layer folder (see default_layer_path())
+INSTANCING_LAYER_NAME = "Instancing_LYR.usda"
+
+# Groups with fewer placements are not worth a prototype (--min-count)
+DEFAULT_MIN_COUNT = 2
+
+# How many groups and prim paths are listed
+MAX_LISTED_GROUPS = 20
+MAX_LISTED_PRIMS = 3
+
+# Arcs that pull an asset in - a prim needs one of them to become an instance
+ASSET_ARC_TYPES = (Pcp.ArcTypeReference, Pcp.ArcTypePayload)
+
+
+def _relative(file_path, base_dir):
+    """`file_path` relative to `base_dir` if that is shorter to read, else unchanged."""
+    try:
+        relative = os.path.relpath(file_path, base_dir)
+    except ValueError:
+        return str(file_path)  # Different drives on Windows
+    return str(file_path) if relative.startswith(os.path.join(os.pardir, os.pardir)) else relative
+
+
+def composition_key(prim):
+    """
+    What decides whether placements can share a prototype: the prim's own
+    composition arcs (type, target file, target prim, layer offset) and its
+    variant selections. A variant set authored on the prim itself in the
+    scene's layers makes it unique: the variant's target is the prim's own
+    path, so such a prim gets a prototype of its own.
+    Returns None if the prim has no reference or payload of its own.
+    """
+    if not (prim.HasAuthoredReferences() or prim.HasAuthoredPayloads()):
+        return None  # Cheap check first - the composition query is slower
+    arcs, has_asset_arc = [], False
+    for arc in Usd.PrimCompositionQuery(prim).GetCompositionArcs():
+        arc_type = arc.GetArcType()
+        if arc_type == Pcp.ArcTypeRoot or arc.IsAncestral() or arc.IsImplicit():
+            continue
+        has_asset_arc = has_asset_arc or arc_type in ASSET_ARC_TYPES
+        target_layer = arc.GetTargetLayer()
+        offset = arc.GetTargetNode().mapToRoot.timeOffset
+        arcs.append((arc_type.displayName.lower(), target_layer.identifier if target_layer else "",
+                     str(arc.GetTargetPrimPath()), offset.offset, offset.scale))
+    if not has_asset_arc:
+        return None  # The references/payloads were emptied by a stronger layer
+    selections = tuple(sorted(prim.GetVariantSets().GetAllVariantSelections().items()))
+    return tuple(arcs), selections
+
+
+def local_overrides(stage, prim_path):
+    """
+    Paths of the prims below `prim_path` that the stage's own layers (root
+    layer stack and session layer) have opinions on - including opinions
+    inside variants authored there. They would be lost if the prim became an
+    instance.
+    """
+    found = []
+    for layer in stage.GetLayerStack(includeSessionLayers=True):
+        prim_spec = layer.GetPrimAtPath(prim_path)
+        if not prim_spec:
+            continue
+        specs = [prim_spec]
+        for variant_set in prim_spec.variantSets.values():
+            specs += [variant.primSpec for variant in variant_set.variants.values()]
+        for spec in specs:
+            found += [str(prim_path.AppendChild(name)) for name in spec.nameChildren.keys()]
+    return sorted(set(found))
+
+
+def subtree_size(prim):
+    """Number of prims in the subtree of `prim` (the prim included) - what every placement composes."""
+    return sum(1 for _ in Usd.PrimRange(prim))
+
+
+def analyze_instancing(stage, min_count=DEFAULT_MIN_COUNT):
+    """
+    Group the prims of `stage` by composition_key().
+
+    Returns a dict with:
+    - "groups":     groups with at least `min_count` placements, most saved
+                    prims first: key, prims (paths), prims_each, existing
+                    (placements that are instances already), saved_prims
+    - "blocked":    prim path -> overridden prims below it (local_overrides())
+    - "not_instanceable": prims with an authored `instanceable = false`
+    - "instances":  number of prims that are instances already
+    - "prims":      number of composed prims of the stage (without prototypes)
+    """
+    members, existing = defaultdict(list), defaultdict(int)
+    blocked, not_instanceable = {}, []
+    prims = instances = 0
+    for prim in stage.Traverse():  # Does not go into instances - their prims are in the prototype
+        prims += 1
+        key = composition_key(prim)
+        if key is None:
+            continue
+        if prim.IsInstance():
+            instances += 1
+            existing[key] += 1
+        elif prim.HasAuthoredInstanceable():
+            not_instanceable.append(str(prim.GetPath()))  # Someone decided against it - respect that
+        else:
+            overrides = local_overrides(stage, prim.GetPath())
+            if overrides:
+                blocked[str(prim.GetPath())] = overrides
+            else:
+                members[key].append(prim.GetPath())
+
+    # A placement inside another placement that becomes an instance is part
+    # of that instance's prototype already - only the outermost ones count
+    selected = {path for key, paths in members.items() if len(paths) + existing[key] >= min_count for path in paths}
+    groups = []
+    for key, paths in members.items():
+        paths = [path for path in paths if not any(prefix in selected for prefix in path.GetAncestorsRange()
+                                                   if prefix != path)]
+        if not paths or len(paths) + existing[key] < min_count:
+            continue
+        prims_each = subtree_size(stage.GetPrimAtPath(paths[0]))
+        # Every placement keeps its own instance prim; the prototype is
+        # composed once - unless instances of this group exist already
+        prototype = 0 if existing[key] else prims_each
+        groups.append({
+            "key": key,
+            "prims": [str(path) for path in paths],
+            "prims_each": prims_each,
+            "existing": existing[key],
+            "saved_prims": len(paths) * (prims_each - 1) - prototype,
+        })
+    groups.sort(key=lambda group: group["saved_prims"], reverse=True)
+    return {
+        "groups": [group for group in groups if group["saved_prims"] > 0],
+        "blocked": blocked,
+        "not_instanceable": not_instanceable,
+        "instances": instances,
+        "prims": prims,
+    }
+
+
+def describe_key(key, base_dir):
+    """A group's composition key as short text, e.g. "reference 010_ASS_USD/0_CUBE.usda</Cube> {lod=high}"."""
+    arcs, selections = key
+    parts = []
+    for arc_type, layer, prim_path, offset, scale in arcs:
+        text = f"{arc_type} {_relative(layer, base_dir)}<{prim_path}>"
+        if (offset, scale) != (0.0, 1.0):
+            text += f" (offset {offset:g}, scale {scale:g})"
+        parts.append(text)
+    if selections:
+        parts.append("{" + ", ".join(f"{name}={value}" for name, value in selections) + "}")
+    return " + ".join(parts)
+
+
+def write_instanceable(layer, prim_paths):
+    """Author `instanceable = true` on every prim of `prim_paths` in `layer` (plain Sdf edits in one batch)."""
+    with Sdf.ChangeBlock():
+        for prim_path in prim_paths:
+            Sdf.CreatePrimInLayer(layer, prim_path).instanceable = True  # An `over`, unless the layer defines the prim
+
+
+def measure_once(root_file, instancing_layer=None):
+    """
+    Open `root_file` in this process - with `instancing_layer` as a session
+    sublayer, if given - and return its numbers: open time, memory growth,
+    composed prims (prototype prims included) and prototypes.
+
+    Called in a fresh child process (see run_measurement()), so the memory
+    belongs to this stage only.
+    """
+    for extension in ("usda", "usdc"):
+        Sdf.FileFormat.FindByExtension(extension)  # Load the file format plugins first
+    Usd.Stage.CreateInMemory()
+    baseline_rss = current_memory_mb()  # Not the peak: a child starts with its parent's peak
+    session_layer = Sdf.Layer.CreateAnonymous()
+    if instancing_layer:
+        session_layer.subLayerPaths.append(str(instancing_layer))
+    start = time.perf_counter()
+    stage = Usd.Stage.Open(Sdf.Layer.FindOrOpen(str(root_file)), session_layer, Usd.Stage.LoadAll)
+    open_seconds = time.perf_counter() - start
+    prototypes = stage.GetPrototypes()
+    prims = sum(1 for _ in stage.Traverse()) + sum(sum(1 for _ in Usd.PrimRange(p)) for p in prototypes)
+    rss = current_memory_mb()
+    return {
+        "open_seconds": open_seconds,
+        "memory_mb": rss - baseline_rss if rss is not None else None,
+        "prims": prims,
+        "prototypes": len(prototypes),
+    }
+
+
+def run_measurement(root_file, instancing_layer=None):
+    """Measure opening `root_file` in a fresh Python process and return its numbers."""
+    command = [sys.executable, str(Path(__file__).resolve()), "_measure", str(root_file)]
+    if instancing_layer:
+        command.append(str(instancing_layer))
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Measuring {root_file} failed:\n{result.stderr}")
+    return json.loads(result.stdout)
+
+
+def print_measurement(before, after):
+    """Print the numbers of run_measurement() without and with instancing side by side."""
+    print("\nMeasured (fresh process each):")
+    print(f"  {'':<18} {'Before':>10} {'After':>10}")
+    print(f"  {'Open time (ms)':<18} {before['open_seconds'] * 1000:>10.1f} {after['open_seconds'] * 1000:>10.1f}")
+    if before["memory_mb"] is not None:
+        print(f"  {'Memory (MB)':<18} {before['memory_mb']:>10.1f} {after['memory_mb']:>10.1f}")
+    print(f"  {'Composed prims':<18} {before['prims']:>10,} {after['prims']:>10,}")
+    print(f"  {'Prototypes':<18} {before['prototypes']:>10,} {after['prototypes']:>10,}")
+
+
+def print_analysis(analysis, base_dir):
+    """Print the result of analyze_instancing()."""
+    groups = analysis["groups"]
+    placements = sum(len(group["prims"]) for group in groups)
+    saved = sum(group["saved_prims"] for group in groups)
+    print(f"  Prims: {analysis['prims']:,} composed, {analysis['instances']:,} instance(s) already")
+    if not groups:
+        print("✓ No repeated placements to instance")
+    else:
+        print(f"\n  {'Group':>5} {'Placements':>10} {'Prims each':>10} {'Saved prims':>11}  Composition")
+        for number, group in enumerate(groups[:MAX_LISTED_GROUPS], 1):
+            placements_text = f"{len(group['prims'])}" + (f"+{group['existing']}" if group["existing"] else "")
+            print(f"  {number:>5} {placements_text:>10} {group['prims_each']:>10,} {group['saved_prims']:>11,}  "
+                  f"{describe_key(group['key'], base_dir)}")
+            for prim_path in group["prims"][:MAX_LISTED_PRIMS]:
+                print(f"  {'':>41}{prim_path}")
+            if len(group["prims"]) > MAX_LISTED_PRIMS:
+                print(f"  {'':>41}... and {len(group['prims']) - MAX_LISTED_PRIMS} more")
+        if len(groups) > MAX_LISTED_GROUPS:
+            print(f"  ... and {len(groups) - MAX_LISTED_GROUPS} more group(s)")
+        print("  Placements: prims that can become instances (+N: instances of the same asset exist already)")
+        share = saved / analysis["prims"] * 100 if analysis["prims"] else 0.0
+        print(f"\n⚠ {placements:,} prim(s) in {len(groups)} group(s) can become instances: "
+              f"~{saved:,} fewer composed prims ({share:.0f}% of the stage)")
+    for prim_path, overrides in analysis["blocked"].items():
+        listed = ", ".join(overrides[:MAX_LISTED_PRIMS]) + (" ..." if len(overrides) > MAX_LISTED_PRIMS else "")
+        print(f"  Not instanceable - overrides below it would be lost: {prim_path} ({listed})")
+    for prim_path in analysis["not_instanceable"]:
+        print(f"  Skipped - instanceable is authored (false): {prim_path}")
+
+
+def main():
+    """
+    Main function - entry point when script is run from command line.
+
+    Exit codes: 0 = done (also when groups were found), 1 = the file could not
+    be opened or measured.
+    """
+    if len(sys.argv) > 1 and sys.argv[1] == "_measure":
+        # Internal: one measurement in this (fresh) process, see run_measurement()
+        print(json.dumps(measure_once(*sys.argv[2:4])))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(
+        description="Find repeated asset placements that could share one prototype (instanceable = true)"
+    )
+    parser.add_argument("root", nargs="?", default=str(DEFAULT_ROOT_FILE), metavar="ROOT",
+                        help="The file to analyze (default: GoodStart_ROOT.usda)")
+    parser.add_argument("--min-count", type=int, default=DEFAULT_MIN_COUNT, metavar="N",
+                        help=f"Only groups with at least N placements (default: {DEFAULT_MIN_COUNT})")
+    parser.add_argument("--measure", action="store_true",
+                        help="Open the stage with and without instancing and compare time, memory and prims")
+    parser.add_argument("--write", action="store_true",
+                        help="Write the instanceable opinions into the instancing layer")
+    parser.add_argument("--output", "-o", metavar="LAYER",
+                        help=f"The instancing layer (default: 020_LYR_USD/{INSTANCING_LAYER_NAME} next to ROOT)")
+    parser.add_argument("--add-sublayer", action="store_true",
+                        help="With --write: add the instancing layer as the first sublayer of ROOT")
+    args = parser.parse_args()
+
+    root_file = Path(args.root).resolve()
+    if not root_file.is_file():
+        parser.error(f"File not found: {args.root}")
+    if args.min_count < 2:
+        parser.error("--min-count must be at least 2")
+    if args.add_sublayer and not args.write:
+        parser.error("--add-sublayer needs --write")
+    output = Path(args.output).resolve() if args.output else default_layer_path(root_file, INSTANCING_LAYER_NAME)
+    if output.suffix.lower() not in (".usda", ".usd", ".usdc"):
+        parser.error("--output must be a USD layer (.usda, .usd or .usdc)")
+
+    try:
+        stage = Usd.Stage.Open(str(root_file), Usd.Stage.LoadAll)
+    except Tf.ErrorException as exc:
+        print(f"✗ Cannot open {root_file}: {' '.join(str(exc).split())}")
+        sys.exit(1)
+
+    print(f"Instancing analysis: {os.path.relpath(root_file)}")
+    analysis = analyze_instancing(stage, args.min_count)
+    print_analysis(analysis, root_file.parent)
+    prim_paths = [prim_path for group in analysis["groups"] for prim_path in group["prims"]]
+    if not prim_paths:
+        sys.exit(0)
+
+    if args.measure:
+        # Measured before anything is written, with the same opinions in a temporary layer
+        with tempfile.TemporaryDirectory() as temp_dir:
+            measured_layer = Path(temp_dir) / INSTANCING_LAYER_NAME
+            layer = Sdf.Layer.CreateNew(str(measured_layer))
+            write_instanceable(layer, prim_paths)
+            layer.Save()
+            try:
+                before = run_measurement(root_file)
+                after = run_measurement(root_file, measured_layer)
+            except RuntimeError as exc:
+                print(f"✗ {exc}")
+                sys.exit(1)
+        print_measurement(before, after)
+
+    if args.write:
+        instancing_layer = open_layer_for_update(
+            output, "instanceable opinions written by scripts/analyze_instancing.py - run it again to update")
+        write_instanceable(instancing_layer, prim_paths)
+        save_layer(instancing_layer, output)
+        print(f"\n✓ Written: {os.path.relpath(output)} ({len(prim_paths):,} instanceable opinion(s))")
+        if args.add_sublayer:
+            if add_sublayer(root_file, output):
+                print(f"✓ Added as the first sublayer of {os.path.relpath(root_file)}")
+        elif Sdf.Layer.Find(str(output)) not in stage.GetLayerStack(includeSessionLayers=False):
+            print(f"  Add it as the first sublayer of {os.path.relpath(root_file)} (or run with --add-sublayer)")
+    sys.exit(0)
+
+
+# This block runs only when the script is executed directly
+# (not when imported as a module)
+if __name__ == "__main__":
+    main()
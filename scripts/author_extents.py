@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Author Extents Script
+
+Write correct extents (and extentsHints) into a layer of their own.
+
+The validators warn about gprims whose `extent` is missing or does not match
+their geometry (issue codes "missing-extent" and "stale-extent"). Renderers
+and viewers then compute the bounds at load time - or cull and frame the prim
+wrongly. This script fixes that without touching the layers the extents came
+from: the corrected values go into a DEDICATED layer (default:
+020_LYR_USD/Extents_LYR.usda) that is added as the strongest sublayer of the
+root file.
+
+What it writes:
+- `extent` on every gprim whose extent is missing or stale, computed from its
+  geometry. If the points are animated, one extent per time sample.
+- `extentsHint` on every model (component/assembly prims), so viewers can
+  show unloaded assets as boxes (--no-hints skips them). All hints are
+  computed with ONE UsdGeom.BBoxCache for the whole stage: a nested model
+  reuses the bounds of its children instead of adding them up again.
+
+Prims inside instances cannot be edited on the stage - their extents come
+from the asset file, so fix them there (the script lists how many).
+
+Usage:
+    # Show what would be written
+    python scripts/author_extents.py --dry-run
+
+    # Write 020_LYR_USD/Extents_LYR.usda and add it as the first sublayer of the root file
+    python scripts/author_extents.py --add-sublayer
+
+    # An asset file: write the extents next to it
+    python scripts/author_extents.py 010_ASS_USD/0_CUBE.usda -o 010_ASS_USD/0_CUBE_extents.usda
+
+Note: run it again after the geometry changed - the layer is updated in
+place, and extents it already holds are checked like all others.
+"""
+
+# Standard library imports
+import sys      # For command-line arguments and exit codes
+import os       # For operating system operations
+import argparse # For parsing command-line options
+from pathlib import Path  # Modern Python path handling
+
+# USD library imports
+try:
+    from pxr import Usd, UsdGeom, Sdf, Tf
+    # Usd: Main USD API - the composed stage
+    # UsdGeom: Geometry schemas - Gprim, PointBased, ModelAPI
+    # Sdf: Scene Description Foundation - the extents layer
+    # Tf: Tools Foundation - USD's error type (raised for unparseable files)
+except ImportError:
+    print("Error: usd-core not installed. Install with: pip install usd-core")
+    sys.exit(1)
+
+# Shared helpers from the validation package (scripts/usd_goodstart/validate)
+from usd_goodstart.validate import extents
+from usd_goodstart.validate.opinion_layers import add_sublayer, default_layer_path, open_layer_for_update, save_layer
+
+
+# Project root = the folder that contains the scripts/ folder
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# File whose extents are fixed when none is given
+DEFAULT_ROOT_FILE = PROJECT_ROOT / "GoodStart_ROOT.usda"
+
+# Name of the extents layer in the layer folder (see default_layer_path())
+EXTENTS_LAYER_NAME = "Extents_LYR.usda"
+
+# How many prim paths are listed per kind of change
+MAX_LISTED_PRIMS = 10
+
+
+def _extent_times(prim):
+    """Times to write the extent at: the default value, plus every time sample of animated points."""
+    times = [Usd.TimeCode.Default()]
+    if prim.IsA(UsdGeom.PointBased):
+        times += [Usd.TimeCode(time) for time in UsdGeom.PointBased(prim).GetPointsAttr().GetTimeSamples()]
+    return times
+
+
+def write_attribute(layer, prim_path, name, values):
+    """
+    Write the float3[] attribute `name` of `prim_path` into `layer` (plain Sdf
+    edits - fast inside an Sdf.ChangeBlock). `values` is a list of (time,
+    value); anything the layer held for the attribute before is replaced.
+    """
+    prim_spec = Sdf.CreatePrimInLayer(layer, prim_path)  # An `over`, unless the layer defines the prim
+    old_spec = prim_spec.attributes.get(name)
+    if old_spec:
+        prim_spec.RemoveProperty(old_spec)
+    attribute_spec = Sdf.AttributeSpec(prim_spec, name, Sdf.ValueTypeNames.Float3Array)
+    for time, value in values:
+        if time.IsDefault():
+            attribute_spec.default = value
+        else:
+            layer.SetTimeSample(attribute_spec.path, time.GetValue(), value)
+
+
+def remove_attribute(layer, prim_path, name):
+    """Remove the attribute `name` of `prim_path` from `layer`, and the overs that are left empty."""
+    prim_spec = layer.GetPrimAtPath(prim_path)
+    if prim_spec and name in prim_spec.attributes:
+        prim_spec.RemoveProperty(prim_spec.attributes[name])
+    while prim_spec and prim_spec.specifier == Sdf.SpecifierOver and not prim_spec.properties \
+            and not prim_spec.nameChildren and set(prim_spec.ListInfoKeys()) <= {"specifier"}:
+        parent = prim_spec.nameParent
+        if parent:
+            del parent.nameChildren[prim_spec.name]
+        else:
+            del layer.rootPrims[prim_spec.name]
+        prim_spec = parent
+
+
+def overridden_extents(stage, layer, prim_paths):
+    """
+    The prims of `prim_paths` whose extent is still stale after it was
+    written to `layer` - a stronger layer (e.g. the root file itself, which
+    is stronger than all of its sublayers) holds an extent too.
+    Returns prim path -> identifier of that stronger layer.
+    """
+    overridden = {}
+    for prim_path in prim_paths:
+        prim = stage.GetPrimAtPath(prim_path)
+        extent_attr = UsdGeom.Boundable(prim).GetExtentAttr()
+        if extents.bounds_differ(extent_attr.Get(extents.EXTENT_TIME), extents.computed_extent(prim)):
+            strongest = extent_attr.GetPropertyStack(extents.EXTENT_TIME)[0].layer
+            if strongest != layer:
+                overridden[prim_path] = strongest.identifier
+    return overridden
+
+
+def find_stale_gprim_extents(stage):
+    """
+    Compute the extent of every gprim whose extent is missing or stale.
+    Returns (prim path -> [(time, extent)], number of gprims inside
+    instances that can't be fixed on this stage).
+    """
+    found, in_instances = {}, 0
+    predicate = Usd.TraverseInstanceProxies(Usd.PrimDefaultPredicate)
+    for prim in Usd.PrimRange.Stage(stage, predicate):
+        if not prim.IsA(UsdGeom.Gprim):
+            continue
+        computed = extents.computed_extent(prim)
+        if computed is None:
+            continue  # No extent computation for this type
+        extent_attr = UsdGeom.Boundable(prim).GetExtentAttr()
+        authored = extent_attr.Get(extents.EXTENT_TIME) if extent_attr.HasAuthoredValue() else None  # Not the fallback
+        if authored is not None and not extents.bounds_differ(authored, computed):
+            continue
+        if prim.IsInstanceProxy():
+            in_instances += 1
+            continue
+        found[prim.GetPath()] = [(time, extents.computed_extent(prim, time)) for time in _extent_times(prim)]
+    return found, in_instances
+
+
+def find_stale_extents_hints(stage):
+    """
+    Compute the extentsHint of every model (not inside instances) whose hint
+    is missing or stale, with ONE BBoxCache for the whole stage. The hints
+    add up the gprim extents - so write the gprim extents first.
+    Returns prim path -> extentsHint.
+    """
+    bbox_cache = extents.new_bbox_cache()
+    found = {}
+    for prim in stage.Traverse():
+        if not prim.IsModel():
+            continue
+        computed = extents.computed_extents_hint(prim, bbox_cache)
+        if not len(computed) or extents.is_empty(computed):
+            continue  # Nothing with bounds below this model
+        if extents.bounds_differ(UsdGeom.ModelAPI(prim).GetExtentsHint(extents.EXTENT_TIME), computed):
+            found[prim.GetPath()] = computed
+    return found
+
+
+def list_prims(label, paths):
+    """Print `label` and the first MAX_LISTED_PRIMS of `paths`."""
+    if not paths:
+        return
+    print(f"  {label}: {len(paths)}")
+    for path in paths[:MAX_LISTED_PRIMS]:
+        print(f"    {path}")
+    if len(paths) > MAX_LISTED_PRIMS:
+        print(f"    ... and {len(paths) - MAX_LISTED_PRIMS} more")
+
+
+def main():
+    """
+    Main function - entry point when script is run from command line.
+
+    Exit codes: 0 = done (or nothing to fix), 1 = the file could not be opened.
+    """
+    parser = argparse.ArgumentParser(description="Write correct extents and extentsHints into a layer of their own.")
+    parser.add_argument("root", nargs="?", default=str(DEFAULT_ROOT_FILE), metavar="ROOT",
+                        help="The file whose extents are fixed (default: GoodStart_ROOT.usda)")
+    parser.add_argument("--output", "-o", metavar="LAYER",
+                        help=f"The extents layer (default: 020_LYR_USD/{EXTENTS_LAYER_NAME} next to ROOT)")
+    parser.add_argument("--add-sublayer", action="store_true",
+                        help="Add the extents layer as the first sublayer of ROOT (if it isn't one yet)")
+    parser.add_argument("--no-hints", action="store_true",
+                        help="Only fix gprim extents, don't write extentsHints on models")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only show what would be written")
+    args = parser.parse_args()
+
+    root_file = Path(args.root).resolve()
+    if not root_file.is_file():
+        parser.error(f"File not found: {args.root}")
+    output = Path(args.output).resolve() if args.output else default_layer_path(root_file, EXTENTS_LAYER_NAME)
+    if output.suffix.lower() not in (".usda", ".usd", ".usdc"):
+        parser.error("--output must be a USD layer (.usda, .usd or .usdc)")
+
+    try:
+        stage = Usd.Stage.Open(str(root_file), Usd.Stage.LoadAll)
+    except Tf.ErrorException as exc:
+        print(f"✗ Cannot open {root_file}: {' '.join(str(exc).split())}")
+        sys.exit(1)
+    extents_layer = open_layer_for_update(
+        output, "Extents and extentsHints written by scripts/author_extents.py - run it again to update")
+    root_layer = stage.GetRootLayer()
+    in_layer_stack = extents_layer in stage.GetLayerStack(includeSessionLayers=False)
+    if not in_layer_stack:
+        # Not a sublayer yet: add it where it belongs, as the first sublayer
+        # (in memory only), so the stage sees what a renderer will see
+        root_layer.subLayerPaths.insert(0, extents_layer.identifier)
+
+    print(f"Authoring extents for {os.path.relpath(root_file)} -> {os.path.relpath(output)}")
+    gprim_extents, in_instances = find_stale_gprim_extents(stage)
+    with Sdf.ChangeBlock():  # Batch all edits - the stage recomposes once, not per prim
+        for prim_path, values in gprim_extents.items():
+            write_attribute(extents_layer, prim_path, "extent", values)
+    overridden = overridden_extents(stage, extents_layer, gprim_extents)
+    with Sdf.ChangeBlock():
+        for prim_path in overridden:
+            remove_attribute(extents_layer, prim_path, "extent")  # It would have no effect
+            del gprim_extents[prim_path]
+    hints = {} if args.no_hints else find_stale_extents_hints(stage)
+    with Sdf.ChangeBlock():
+        for prim_path, hint in hints.items():
+            write_attribute(extents_layer, prim_path, "extentsHint", [(Usd.TimeCode.Default(), hint)])
+
+    list_prims("Gprim extents written", list(gprim_extents))
+    list_prims("Model extentsHints written", list(hints))
+    for prim_path, layer_identifier in overridden.items():
+        print(f"⚠ {prim_path}: the extent in {os.path.relpath(layer_identifier)} is stronger than "
+              f"{output.name} - fix it there")
+    if in_instances:
+        print(f"⚠ {in_instances} gprim(s) inside instances have a missing/stale extent - "
+              "fix them in their asset file")
+    if not in_layer_stack:
+        root_layer.subLayerPaths.remove(extents_layer.identifier)  # Saved below only with --add-sublayer
+    if args.dry_run:
+        print(f"\n(dry run - {os.path.relpath(output)} not written)")
+        sys.exit(0)
+    if not gprim_extents and not hints:
+        print("✓ All extents are up to date - nothing to write")
+        if extents_layer.anonymous:
+            sys.exit(0)  # No extents layer - nothing to add as a sublayer either
+    else:
+        save_layer(extents_layer, output)
+        print(f"\n✓ Written: {os.path.relpath(output)}")
+    if args.add_sublayer:
+        if add_sublayer(root_file, output):
+            print(f"✓ Added as the first sublayer of {os.path.relpath(root_file)}")
+    elif not in_layer_stack:
+        print(f"  Add it as the first sublayer of {os.path.relpath(root_file)} (or run with --add-sublayer)")
+    sys.exit(0)
+
+
+# This block runs only when the script is executed directly
+# (not when imported as a module)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+USD Validation Benchmark Script
+
+Measures how the validation scripts scale with scene size.
+
+The project's own files are tiny (0_CUBE.usda, four small layers), so this
+script GENERATES synthetic scenes in the GoodStart layout:
+
+    Bench_ROOT.usda
+      -> 020_LYR_USD/Bench_XX_LYR.usda          (N-1 override layers)
+      -> 020_LYR_USD/Bench_AssetImport_LYR.usda (K prims referencing M assets,
+                                                  some with a variant set)
+          -> 010_ASS_USD/Bench_Asset_XXXX.usda  (M assets with a mesh and material)
+              -> 030_TEX/bench_tex_XXX.png      (T texture files)
+
+and times three validation paths on it:
+- "asset": validate_asset() on the asset import layer (K references to check)
+- "scene": validate_scene() on the root file (composes everything)
+- "auto":  validate_file() on the root file (auto-detection + scene validation)
+
+Each measurement runs in a FRESH Python process, so nothing is cached between
+runs and the peak memory of each run can be measured on its own. For every
+path the script records wall time, peak memory (RSS) and prims per second,
+and writes everything - together with the git commit and usd-core version -
+to a JSON results file. Two results files can be compared, e.g. before and
+after a change, and the comparison can fail if things got slower.
+
+Usage:
+    # Benchmark a small synthetic scene (results go to .usd_validate_cache/benchmarks/)
+    python scripts/benchmark_validation.py run
+
+    # Bigger scene, 5 repetitions per measurement, explicit results file
+    python scripts/benchmark_validation.py run --preset large --repeat 5 -o before.json
+
+    # Custom scene size
+    python scripts/benchmark_validation.py run --sublayers 8 --assets 100 --prims 20000
+
+    # Same scene, but every asset reference is instanceable
+    python scripts/benchmark_validation.py run --preset medium --instanceable
+
+    # Compare two results files; exit code 1 if any path got more than 10% slower
+    python scripts/benchmark_validation.py compare before.json after.json --max-regression 10
+
+    # Only generate a synthetic scene (e.g. to look at it in usdview)
+    python scripts/benchmark_validation.py generate /tmp/bench_scene --preset medium
+
+Note: Peak memory is measured with usd_goodstart.validate.memory, which
+can't measure it on Windows - there it is reported as "n/a".
+"""
+
+# Standard library imports
+import sys      # For command-line arguments and exit codes
+import os       # For operating system operations
+import argparse # For parsing command-line options
+import contextlib  # For silencing the validators' text output
+import json     # Results are stored as JSON
+import platform # Machine description for the results file
+import shutil   # For removing the generated scene
+import statistics  # Median of repeated measurements
+import subprocess  # Each measurement runs in its own process
+import tempfile # Generated scenes live in a temporary folder by default
+import time     # Wall-clock timing
+from pathlib import Path  # Modern Python path handling
+
+# USD library imports
+try:
+    from pxr import Usd, Sdf
+    # Usd: Main USD API (used here only for the version number)
+    # Sdf: Scene Description Foundation - writes the synthetic layers directly
+except ImportError:
+    print("Error: usd-core not installed. Install with: pip install usd-core")
+    sys.exit(1)
+
+
+# Project root = the folder that contains the scripts/ folder
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Where results files go when no --output is given (git-ignored)
+DEFAULT_RESULTS_DIR = PROJECT_ROOT / ".usd_validate_cache" / "benchmarks"
+
+# Bump this when the results format changes
+RESULTS_VERSION = 1
+
+# Scene sizes for --preset. Every value can be overridden on the command line.
+PRESETS = {
+    "small":  {"sublayers": 4,  "assets": 10,  "prims": 1000,   "variants": 3, "textures": 10},
+    "medium": {"sublayers": 8,  "assets": 50,  "prims": 10000,  "variants": 4, "textures": 50},
+    "large":  {"sublayers": 16, "assets": 200, "prims": 100000, "variants": 4, "textures": 200},
+}
+
+# The validation paths that are measured, in this order
+TARGETS = ("asset", "scene", "auto")
+
+# Every n-th referencing prim gets a variant set (variants on every prim would
+# make the scene unrealistically heavy)
+VARIANT_PRIM_INTERVAL = 10
+
+
+def generate_scene(out_dir, sublayers, assets, prims, variants, textures, instanceable=False):
+    """
+    Write a synthetic scene in the GoodStart layout to `out_dir`.
+
+    - sublayers: number of layers in the root file's subLayers list
+                 (the last one is the asset import layer, the others override prims)
+    - assets:    number of asset files in 010_ASS_USD
+    - prims:     number of prims in the asset import layer, each referencing an asset
+    - variants:  number of variants in the "lod" variant set (0 = no variant sets)
+    - textures:  number of texture files in 030_TEX (shared by the assets)
+    - instanceable: mark every referencing prim as instanceable, so prims that
+                 reference the same asset share one prototype
+
+    Layers are written with the Sdf API (no stage is composed), so even big
+    scenes are generated quickly. Returns the path of the root file.
+    """
+    out_dir = Path(out_dir)
+    for folder in ("010_ASS_USD", "020_LYR_USD", "030_TEX"):
+        (out_dir / folder).mkdir(parents=True, exist_ok=True)
+
+    # Texture files: the validators only check that they exist, so a few
+    # placeholder bytes are enough
+    texture_names = [f"bench_tex_{index:03d}.png" for index in range(max(textures, 1))]
+    for texture_name in texture_names:
+        (out_dir / "030_TEX" / texture_name).write_bytes(b"\x89PNG\r\n\x1a\n")
+
+    # Assets: one mesh plus a material whose texture points into 030_TEX
+    asset_names = [f"Bench_Asset_{index:04d}.usda" for index in range(max(assets, 1))]
+    for index, asset_name in enumerate(asset_names):
+        layer = Sdf.Layer.CreateNew(str(out_dir / "010_ASS_USD" / asset_name))
+        with Sdf.ChangeBlock():  # Batch all edits - much faster for big layers
+            root = Sdf.PrimSpec(layer, "Asset", Sdf.SpecifierDef, "Xform")
+            layer.defaultPrim = "Asset"
+            mesh = Sdf.PrimSpec(root, "Geo", Sdf.SpecifierDef, "Mesh")
+            Sdf.AttributeSpec(mesh, "points", Sdf.ValueTypeNames.Point3fArray).default = \
+                [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
+            Sdf.AttributeSpec(mesh, "faceVertexCounts", Sdf.ValueTypeNames.IntArray).default = [4]
+            Sdf.AttributeSpec(mesh, "faceVertexIndices", Sdf.ValueTypeNames.IntArray).default = [0, 1, 2, 3]
+            Sdf.AttributeSpec(mesh, "extent", Sdf.ValueTypeNames.Float3Array).default = [(0, 0, 0), (1, 1, 0)]
+            material = Sdf.PrimSpec(root, "Mtl", Sdf.SpecifierDef, "Material")
+            shader = Sdf.PrimSpec(material, "Texture", Sdf.SpecifierDef, "Shader")
+            texture_name = texture_names[index % len(texture_names)]
+            Sdf.AttributeSpec(shader, "inputs:file", Sdf.ValueTypeNames.Asset).default = \
+                Sdf.AssetPath(f"../030_TEX/{texture_name}")
+        layer.Save()
+
+    # Asset import layer: K prims, each referencing one of the assets
+    import_name = "Bench_AssetImport_LYR.usda"
+    layer = Sdf.Layer.CreateNew(str(out_dir / "020_LYR_USD" / import_name))
+    with Sdf.ChangeBlock():
+        world = Sdf.PrimSpec(layer, "World", Sdf.SpecifierDef, "Xform")
+        set_spec = Sdf.PrimSpec(world, "Set", Sdf.SpecifierDef, "Xform")
+        for index in range(prims):
+            prim = Sdf.PrimSpec(set_spec, f"Prim_{index:06d}", Sdf.SpecifierDef, "Xform")
+            asset_name = asset_names[index % len(asset_names)]
+            prim.referenceList.Prepend(Sdf.Reference(f"../010_ASS_USD/{asset_name}"))
+            if instanceable:
+                prim.instanceable = True
+            if variants and index % VARIANT_PRIM_INTERVAL == 0:
+                variant_set = Sdf.VariantSetSpec(prim, "lod")
+                for variant_index in range(variants):
+                    variant = Sdf.VariantSpec(variant_set, f"lod{variant_index}")
+                    Sdf.AttributeSpec(variant.primSpec, "bench:lod", Sdf.ValueTypeNames.Int,
+                                      Sdf.VariabilityUniform).default = variant_index
+                prim.variantSetNameList.Prepend("lod")
+                prim.variantSelections["lod"] = "lod0"
+    layer.Save()
+
+    # Override layers: each one adds an opinion to a share of the prims
+    override_count = max(sublayers - 1, 0)
+    override_names = [f"Bench_{index + 1:02d}_LYR.usda" for index in range(override_count)]
+    for layer_index, override_name in enumerate(override_names):
+        layer = Sdf.Layer.CreateNew(str(out_dir / "020_LYR_USD" / override_name))
+        with Sdf.ChangeBlock():
+            for index in range(layer_index, prims, override_count):
+                prim = Sdf.CreatePrimInLayer(layer, f"/World/Set/Prim_{index:06d}")
+                Sdf.AttributeSpec(prim, "bench:layer", Sdf.ValueTypeNames.Int).default = layer_index
+        layer.Save()
+
+    # Root file: override layers first (strongest), asset import layer at the bottom
+    root_path = out_dir / "Bench_ROOT.usda"
+    layer = Sdf.Layer.CreateNew(str(root_path))
+    Sdf.PrimSpec(layer, "World", Sdf.SpecifierDef, "Xform")
+    layer.defaultPrim = "World"
+    layer.subLayerPaths = [f"./020_LYR_USD/{name}" for name in override_names + [import_name]]
+    layer.Save()
+    return root_path
+
+
+def measure_once(target, scene_dir):
+    """
+    Run ONE validation of `target` in this process and return its numbers.
+
+    Called in a fresh child process (see run_measurement()), so the memory
+    peak belongs to this validation only. The validators' text output is
+    discarded.
+    """
+    # Imported here, so "run" and "compare" don't pay for it
+    from usd_goodstart.validate import ValidationReport, validate_asset, validate_file, validate_scene
+    from usd_goodstart.validate.memory import peak_memory_mb
+
+    scene_dir = Path(scene_dir)
+    if target == "asset":
+        usd_file = scene_dir / "020_LYR_USD" / "Bench_AssetImport_LYR.usda"
+        run = lambda report: validate_asset(usd_file, report=report)
+    elif target == "scene":
+        usd_file = scene_dir / "Bench_ROOT.usda"
+        run = lambda report: validate_scene(usd_file, report=report)
+    else:
+        usd_file = scene_dir / "Bench_ROOT.usda"
+        run = lambda report: validate_file(usd_file, report=report)
+
+    report = ValidationReport(usd_file)
+    baseline_rss = peak_memory_mb()  # Python + pxr already imported
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        passed = run(report)
+        wall_seconds = time.perf_counter() - start
+    peak_rss = peak_memory_mb()
+
+    prims = report.stats.get("prims", 0)
+    return {
+        "passed": passed,
+        "wall_seconds": wall_seconds,
+        "peak_rss_mb": peak_rss,
+        "baseline_rss_mb": baseline_rss,
+        "prims": prims,
+        "prims_per_second": prims / wall_seconds if wall_seconds else None,
+        "timings": report.to_dict()["timings"],
+    }
+
+
+def run_measurement(target, scene_dir):
+    """Measure `target` in a fresh Python process and return its numbers."""
+    command = [sys.executable, str(Path(__file__).resolve()), "_measure", target, str(scene_dir)]
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Measuring '{target}' failed:\n{result.stderr}")
+    return json.loads(result.stdout)
+
+
+def _summarize(runs):
+    """Median of the repeated runs (the median ignores single outliers)."""
+    def median_of(key):
+        values = [run[key] for run in runs if run[key] is not None]
+        return statistics.median(values) if values else None
+    return {
+        "wall_seconds": median_of("wall_seconds"),
+        "peak_rss_mb": median_of("peak_rss_mb"),
+        "prims": runs[0]["prims"],
+        "prims_per_second": median_of("prims_per_second"),
+        "passed": all(run["passed"] for run in runs),
+    }
+
+
+def _git_commit():
+    """Current git commit of the project (short hash), or None outside a git checkout."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmark(scene_params, repeat, keep_dir=None):
+    """
+    Generate a scene with `scene_params`, measure every target `repeat` times
+    and return the results dict (see the "run" command).
+    """
+    scene_dir = Path(keep_dir) if keep_dir else Path(tempfile.mkdtemp(prefix="usd_bench_"))
+    try:
+        print(f"Generating scene in {scene_dir} ...")
+        start = time.perf_counter()
+        generate_scene(scene_dir, **scene_params)
+        print(f"  done in {time.perf_counter() - start:.2f}s "
+              f"({scene_params['sublayers']} sublayers, {scene_params['assets']} assets, "
+              f"{scene_params['prims']} prims"
+              + (", instanceable" if scene_params.get("instanceable") else "") + ")")
+
+        results = {}
+        for target in TARGETS:
+            runs = []
+            for repetition in range(repeat):
+                print(f"Measuring {target} ({repetition + 1}/{repeat}) ...")
+                runs.append(run_measurement(target, scene_dir))
+            results[target] = {"summary": _summarize(runs), "runs": runs}
+    finally:
+        if not keep_dir:
+            shutil.rmtree(scene_dir, ignore_errors=True)
+
+    return {
+        "version": RESULTS_VERSION,
+        "commit": _git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "usd_version": "{}.{}.{}".format(*Usd.GetVersion()),
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "scene": scene_params,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def _format_number(value, digits=3):
+    """Format a measurement for the tables below ("n/a" if it is missing)."""
+    return "n/a" if value is None else f"{value:.{digits}f}"
+
+
+def print_results(data):
+    """Print the summary table of one results dict."""
+    print(f"\nBenchmark results (commit {data['commit'] or 'unknown'}, usd-core {data['usd_version']})")
+    print(f"{'target':<8} {'wall s':>10} {'peak MB':>10} {'prims':>10} {'prims/s':>12}  passed")
+    for target, result in data["results"].items():
+        summary = result["summary"]
+        print(f"{target:<8} {_format_number(summary['wall_seconds']):>10} "
+              f"{_format_number(summary['peak_rss_mb'], 1):>10} {summary['prims']:>10} "
+              f"{_format_number(summary['prims_per_second'], 0):>12}  {'✓' if summary['passed'] else '✗'}")
+
+
+def compare_results(old, new, max_regression=None):
+    """
+    Print the change between two results dicts.
+
+    Returns False if `max_regression` (percent) is given and the wall time of
+    any target grew by more than that.
+    """
+    if old["scene"] != new["scene"]:
+        print("⚠ The results were measured on different scene sizes - comparison is not meaningful")
+
+    print(f"\nComparing {old['commit'] or 'old'} -> {new['commit'] or 'new'}")
+    print(f"{'target':<8} {'old wall s':>11} {'new wall s':>11} {'change':>9} {'old MB':>9} {'new MB':>9}")
+    within_budget = True
+    for target in TARGETS:
+        if target not in old["results"] or target not in new["results"]:
+            continue
+        old_summary = old["results"][target]["summary"]
+        new_summary = new["results"][target]["summary"]
+        change = (new_summary["wall_seconds"] / old_summary["wall_seconds"] - 1) * 100
+        marker = ""
+        if max_regression is not None and change > max_regression:
+            within_budget = False
+            marker = "  ✗ over budget"
+        print(f"{target:<8} {_format_number(old_summary['wall_seconds']):>11} "
+              f"{_format_number(new_summary['wall_seconds']):>11} {change:>+8.1f}% "
+              f"{_format_number(old_summary['peak_rss_mb'], 1):>9} "
+              f"{_format_number(new_summary['peak_rss_mb'], 1):>9}{marker}")
+
+    if max_regression is not None:
+        if within_budget:
+            print(f"\n✓ All targets within the {max_regression:g}% budget")
+        else:
+            print(f"\n✗ Some targets are more than {max_regression:g}% slower")
+    return within_budget
+
+
+def _add_scene_arguments(parser):
+    """Scene size options shared by the "run" and "generate" commands."""
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small",
+                        help="Scene size preset (default: small)")
+    for name, help_text in (("sublayers", "layers in the root file's subLayers list"),
+                            ("assets", "asset files in 010_ASS_USD"),
+                            ("prims", "prims referencing the assets"),
+                            ("variants", "variants per variant set (0 = none)"),
+                            ("textures", "texture files in 030_TEX")):
+        parser.add_argument(f"--{name}", type=int, metavar="N", help=f"Number of {help_text}")
+    parser.add_argument("--instanceable", action="store_true",
+                        help="Make every asset reference instanceable (measures instancing)")
+
+
+def _scene_params(args):
+    """The preset, with every size given on the command line replacing its value."""
+    params = dict(PRESETS[args.preset])
+    for name in params:
+        if getattr(args, name) is not None:
+            params[name] = getattr(args, name)
+    if args.instanceable:
+        params["instanceable"] = True  # Only stored when set, so older results still compare
+    return params
+
+
+def main():
+    """
+    Main function - entry point when script is run from command line.
+
+    Sub-commands:
+    - run:               generate a scene, measure all targets, write a results file
+    - compare OLD NEW:   compare two results files (optionally against a budget)
+    - generate OUT_DIR:  only write a synthetic scene
+    """
+    if len(sys.argv) == 4 and sys.argv[1] == "_measure" and sys.argv[2] in TARGETS:
+        # Internal: one measurement in a fresh process (see run_measurement()) -
+        # handled before argparse, so it is not listed in --help
+        json.dump(measure_once(sys.argv[2], sys.argv[3]), sys.stdout)
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Benchmark the USD validation scripts on synthetic scenes.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Generate a scene and measure the validators")
+    _add_scene_arguments(run_parser)
+    run_parser.add_argument("--repeat", type=int, default=3, metavar="N",
+                            help="Measurements per target; the median is reported (default: 3)")
+    run_parser.add_argument("--output", "-o", metavar="FILE",
+                            help=f"Results file (default: {DEFAULT_RESULTS_DIR}/<commit>.json)")
+    run_parser.add_argument("--keep", metavar="DIR",
+                            help="Generate the scene in DIR and keep it (default: temporary folder)")
+
+    compare_parser = commands.add_parser("compare", help="Compare two results files")
+    compare_parser.add_argument("old", metavar="OLD")
+    compare_parser.add_argument("new", metavar="NEW")
+    compare_parser.add_argument("--max-regression", type=float, metavar="PERCENT",
+                                help="Exit with code 1 if any target's wall time grew by more than PERCENT")
+
+    generate_parser = commands.add_parser("generate", help="Only generate a synthetic scene")
+    generate_parser.add_argument("out_dir", metavar="OUT_DIR")
+    _add_scene_arguments(generate_parser)
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        root_path = generate_scene(args.out_dir, **_scene_params(args))
+        print(f"✓ Synthetic scene written: {root_path}")
+        sys.exit(0)
+
+    if args.command == "compare":
+        old = json.loads(Path(args.old).read_text(encoding="utf-8"))
+        new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+        sys.exit(0 if compare_results(old, new, args.max_regression) else 1)
+
+    # "run"
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    data = run_benchmark(_scene_params(args), args.repeat, keep_dir=args.keep)
+    print_results(data)
+
+    output = Path(args.output) if args.output else DEFAULT_RESULTS_DIR / f"{data['commit'] or 'results'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    print(f"\nResults written to: {output}")
+    sys.exit(0)
+
+
+# This block runs only when the script is executed directly
+# (not when imported as a module)
+if __name__ == "__main__":
+    main()
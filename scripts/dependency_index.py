@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+USD Dependency Index Script
+
+Builds a dependency graph of the project and answers the question
+"which files are affected if I change this asset?".
+
+The graph follows the GoodStart layout:
+    GoodStart_ROOT.usda -> 020_LYR_USD sublayers -> 010_ASS_USD references/payloads -> 030_TEX textures
+
+It is built at the layer level (no stage composition), stored as a JSON index
+and can be queried in both directions:
+- forward ("deps"):     what does this file use?
+- reverse ("affected"): which files use this file, directly or indirectly?
+
+Usage:
+    # Build (or update) the index for the whole project
+    python scripts/dependency_index.py build
+
+    # Which files have to be re-validated when 0_CUBE.usda changes?
+    python scripts/dependency_index.py affected 010_ASS_USD/0_CUBE.usda
+
+    # Re-validate exactly those files
+    python scripts/validate_usd.py --tree $(python scripts/dependency_index.py affected 010_ASS_USD/0_CUBE.usda --paths-only)
+
+    # What does the root file depend on?
+    python scripts/dependency_index.py deps GoodStart_ROOT.usda
+
+Note: This script only reads USD files, it never modifies them.
+Updating the index is incremental: files whose content hash did not change
+since the last build are not read again.
+"""
+
+# Standard library imports
+import sys      # For command-line arguments and exit codes
+import os       # For operating system operations
+import argparse # For parsing command-line options
+import json     # The index is stored as JSON
+from pathlib import Path  # Modern Python path handling
+
+# USD library imports
+try:
+    from pxr import Sdf, Tf
+    # Sdf: Scene Description Foundation - low-level layer and data access
+    # Tf: Tools Foundation - USD's error type (raised for unparseable files)
+except ImportError:
+    print("Error: usd-core not installed. Install with: pip install usd-core")
+    sys.exit(1)
+
+# Shared helpers from the validation package (scripts/usd_goodstart/validate)
+from usd_goodstart.validate import collect_usd_files, file_content_hash
+from usd_goodstart.validate.asset_files import MDL_SOURCE_ATTRIBUTE, UDIM_TOKEN, AssetFileChecker
+from usd_goodstart.validate.resolution import iter_layer_asset_paths, resolve_layer_asset_path
+
+
+# Project root = the folder that contains the scripts/ folder
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Where the index is stored by default (git-ignored, next to the result cache)
+DEFAULT_INDEX_FILE = PROJECT_ROOT / ".usd_validate_cache" / "dependency_index.json"
+
+# Folders scanned by "build" when no paths are given
+DEFAULT_SCAN_PATHS = [
+    PROJECT_ROOT / "GoodStart_ROOT.usda",
+    PROJECT_ROOT / "020_LYR_USD",
+    PROJECT_ROOT / "010_ASS_USD",
+]
+
+# Bump this when the index format changes - old index files are then rebuilt
+INDEX_VERSION = 3
+
+# Dependencies that are not project files, so they can't be missing: bare
+# MDL names like @OmniPBR.mdl@ that the renderer finds in its search paths,
+# and URLs (classified like AssetFileRule does, see asset_files.py)
+EXTERNAL_STATUSES = ("search-path", "remote")
+
+
+def _normalize(path):
+    """Absolute, normalized path string used as node name in the graph."""
+    return os.path.normpath(os.path.abspath(str(path)))
+
+
+def scan_file_dependencies(file_path, asset_checker=None):
+    """
+    Read ONE USD file and list the files it points to directly.
+
+    Returns a list of {"kind", "path", "exists", "status"} dicts where kind is
+    "sublayer", "reference", "payload" or "asset" (textures, MDL files, ...)
+    and status is "found", "missing" or one of EXTERNAL_STATUSES.
+    Paths that don't resolve are kept too (with "exists": False), so adding
+    the missing file later still maps back to the files that wanted it.
+    A UDIM texture path has one edge per existing tile.
+    """
+    try:
+        layer = Sdf.Layer.FindOrOpen(str(file_path))
+    except Tf.ErrorException:
+        layer = None  # Unparseable file - it has no readable dependencies
+    if not layer:
+        return []
+    asset_checker = asset_checker or AssetFileChecker()
+
+    edges = {}
+    for kind, asset_path, spec_path in iter_layer_asset_paths(layer):
+        if kind == "asset":
+            # Textures/MDL files: use the checker's result as-is - a UDIM path
+            # (wood.<UDIM>.png) only exists as its tiles (wood.1001.png, ...)
+            result = asset_checker.check(layer, asset_path)
+            status = result["status"]
+            if status == "search-path" and spec_path.name != MDL_SOURCE_ATTRIBUTE:
+                status = "missing"  # Only MDL names are expected to come from the renderer
+            if status in EXTERNAL_STATUSES:
+                edges[(kind, asset_path)] = {"kind": kind, "path": asset_path, "exists": False, "status": status}
+                continue
+            for edge in _asset_edges(result["path"], result["files"] if status == "found" else []):
+                edges[(kind, edge["path"])] = edge
+            continue
+        resolved_path = resolve_layer_asset_path(layer, asset_path)
+        if resolved_path:
+            target = _normalize(resolved_path)
+        else:
+            # Not found: keep the path USD would have looked for
+            anchored_path = Sdf.ComputeAssetPathRelativeToLayer(layer, asset_path)
+            target = _normalize(anchored_path) if os.path.isabs(anchored_path) else anchored_path
+        exists = os.path.exists(target)
+        edges[(kind, target)] = {"kind": kind, "path": target, "exists": exists,
+                                 "status": "found" if exists else "missing"}
+    return sorted(edges.values(), key=lambda edge: (edge["path"], edge["kind"]))
+
+
+def _asset_edges(asset_file, files):
+    """
+    The "asset" edges for the texture/MDL file `asset_file` and its existing
+    `files`: one per file (each tile of a UDIM path), or one missing edge.
+    UDIM edges remember their "template" so an update can list the tiles again.
+    """
+    asset_file = _normalize(asset_file) if os.path.isabs(asset_file) else asset_file
+    template = {"template": asset_file} if UDIM_TOKEN in asset_file else {}
+    if not files:
+        return [{"kind": "asset", "path": asset_file, "exists": False, "status": "missing", **template}]
+    return [{"kind": "asset", "path": _normalize(file), "exists": True, "status": "found", **template}
+            for file in files]
+
+
+def refresh_dependencies(dependencies, asset_checker):
+    """
+    Update the stored edges of an unchanged file to the files on disk now,
+    without reading the file: check whether each target exists, and list the
+    tiles of UDIM paths again (tiles may have been added or removed).
+    """
+    refreshed = {}
+    for edge in dependencies:
+        if "template" in edge:
+            template = edge["template"]
+            for tile_edge in _asset_edges(template, asset_checker.directories.udim_tiles(template)):
+                refreshed[(tile_edge["kind"], tile_edge["path"])] = tile_edge
+            continue
+        if edge["status"] not in EXTERNAL_STATUSES:
+            edge["exists"] = os.path.exists(edge["path"])
+            edge["status"] = "found" if edge["exists"] else "missing"
+        refreshed[(edge["kind"], edge["path"])] = edge
+    return sorted(refreshed.values(), key=lambda edge: (edge["path"], edge["kind"]))
+
+
+def load_index(index_file):
+    """Load an index file, or return an empty index if there is none (or it is outdated)."""
+    index_file = Path(index_file)
+    if index_file.exists():
+        try:
+            index = json.loads(index_file.read_text(encoding="utf-8"))
+            if index.get("version") == INDEX_VERSION:
+                return index
+        except ValueError:
+            pass  # Broken index file - rebuild it
+    return {"version": INDEX_VERSION, "files": {}}
+
+
+def indexed_scan_paths(index_file):
+    """The files/folders the index at `index_file` was built from (DEFAULT_SCAN_PATHS for a new index)."""
+    return load_index(index_file).get("scan_paths") or DEFAULT_SCAN_PATHS
+
+
+def save_index(index, index_file):
+    """Write the index to disk (atomically, so a crash never leaves half a file)."""
+    index_file = Path(index_file)
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = index_file.with_suffix(".tmp")
+    temp_file.write_text(json.dumps(index, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(temp_file, index_file)
+
+
+def build_index(scan_paths, index_file):
+    """
+    Build or update the dependency index.
+
+    Every USD file in `scan_paths` is scanned, plus every layer those files pull
+    in (sublayers, references, payloads), even if it lives outside the scanned
+    folders. Files whose content hash matches the previous index are reused
+    without being read again. The scan paths are stored in the index, so
+    queries can update it from the same paths.
+
+    Returns the index dict.
+    """
+    old_index = load_index(index_file)
+    index = {"version": INDEX_VERSION, "scan_paths": [_normalize(path) for path in scan_paths], "files": {}}
+
+    scanned = 0
+    reused = 0
+    asset_checker = AssetFileChecker()  # Lists each texture folder once for all files
+    to_visit = [_normalize(path) for path in collect_usd_files(scan_paths)]
+    while to_visit:
+        file_path = to_visit.pop(0)
+        if file_path in index["files"]:
+            continue
+
+        content_hash = file_content_hash(file_path)
+        old_entry = old_index["files"].get(file_path)
+        if old_entry and content_hash and old_entry["hash"] == content_hash:
+            # Unchanged since the last build - reuse the known dependencies,
+            # only refresh whether their targets exist now
+            dependencies = refresh_dependencies(old_entry["dependencies"], asset_checker)
+            reused += 1
+        else:
+            dependencies = scan_file_dependencies(file_path, asset_checker)
+            scanned += 1
+
+        index["files"][file_path] = {"hash": content_hash, "dependencies": dependencies}
+
+        # Follow layers (not textures) so the graph is complete
+        for edge in dependencies:
+            if edge["kind"] != "asset" and edge["exists"]:
+                to_visit.append(edge["path"])
+
+    save_index(index, index_file)
+    print(f"Indexed {len(index['files'])} file(s): {scanned} scanned, {reused} unchanged")
+    print(f"Index written to: {index_file}")
+    return index
+
+
+def reverse_edges(index):
+    """Turn "file -> what it uses" into "file -> who uses it"."""
+    users = {}
+    for file_path, entry in index["files"].items():
+        for edge in entry["dependencies"]:
+            users.setdefault(edge["path"], set()).add(file_path)
+    return users
+
+
+def find_affected(index, changed_files):
+    """
+    Return every indexed file that depends on any of `changed_files`,
+    directly or through other files (e.g. asset -> layer -> root).
+    The changed files themselves are included if they are indexed.
+    """
+    users = reverse_edges(index)
+    affected = set()
+    to_visit = [_normalize(path) for path in changed_files]
+    while to_visit:
+        file_path = to_visit.pop()
+        if file_path in affected:
+            continue
+        if file_path in index["files"]:
+            affected.add(file_path)
+        to_visit.extend(users.get(file_path, ()))
+    return sorted(affected)
+
+
+def find_dependencies(index, file_path):
+    """Return every file `file_path` depends on (transitively) as (kind, path, status) tuples."""
+    found = {}
+    to_visit = [_normalize(file_path)]
+    visited = set()
+    while to_visit:
+        current = to_visit.pop()
+        if current in visited:
+            continue
+        visited.add(current)
+        for edge in index["files"].get(current, {}).get("dependencies", []):
+            found[edge["path"]] = (edge["kind"], edge["path"], edge["status"])
+            to_visit.append(edge["path"])
+    return sorted(found.values(), key=lambda item: item[1])
+
+
+def main():
+    """
+    Main function - entry point when script is run from command line.
+
+    Sub-commands:
+    - build [PATH ...]:     build/update the index (default: the GoodStart folders;
+                            later queries update it from the same paths)
+    - affected FILE [...]:  list files that depend on FILE (reverse query)
+    - deps FILE:            list files FILE depends on (forward query)
+    """
+    parser = argparse.ArgumentParser(description="Build and query the USD dependency index.")
+    parser.add_argument("--index", default=str(DEFAULT_INDEX_FILE), metavar="FILE",
+                        help=f"Index file (default: {DEFAULT_INDEX_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="Build or update the index")
+    build_parser.add_argument("paths", nargs="*", metavar="PATH",
+                              help="Files/folders to scan (default: root file, 020_LYR_USD, 010_ASS_USD)")
+
+    affected_parser = commands.add_parser("affected", help="Which files depend on these files?")
+    affected_parser.add_argument("files", nargs="+", metavar="FILE")
+    affected_parser.add_argument("--paths-only", action="store_true",
+                                 help="Print only the paths (e.g. to pass them to validate_usd.py --tree)")
+    affected_parser.add_argument("--no-update", action="store_true",
+                                 help="Use the stored index as-is instead of updating it first")
+
+    deps_parser = commands.add_parser("deps", help="Which files does this file depend on?")
+    deps_parser.add_argument("file", metavar="FILE")
+    deps_parser.add_argument("--no-update", action="store_true",
+                             help="Use the stored index as-is instead of updating it first")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_index(args.paths or DEFAULT_SCAN_PATHS, args.index)
+        sys.exit(0)
+
+    # Queries update the index first (cheap: unchanged files are not read again),
+    # so answers always match the files on disk - from the paths of the last
+    # "build", so files outside the default folders stay in the index
+    if args.no_update:
+        index = load_index(args.index)
+    else:
+        output = sys.stderr if getattr(args, "paths_only", False) else sys.stdout
+        stdout, sys.stdout = sys.stdout, output  # Keep --paths-only output clean
+        try:
+            index = build_index(indexed_scan_paths(args.index), args.index)
+        finally:
+            sys.stdout = stdout
+
+    if args.command == "affected":
+        affected = find_affected(index, args.files)
+        if args.paths_only:
+            for file_path in affected:
+                print(file_path)
+            sys.exit(0)
+        print(f"\n{len(affected)} file(s) affected by changes to: {', '.join(args.files)}")
+        users = reverse_edges(index)
+        for file_path in affected:
+            # Files nobody else uses are top-level scenes/roots
+            marker = "ROOT " if not users.get(file_path) else "     "
+            print(f"  {marker}{file_path}")
+        sys.exit(0)
+
+    if args.command == "deps":
+        dependencies = find_dependencies(index, args.file)
+        print(f"\n{args.file} depends on {len(dependencies)} file(s):")
+        markers = {"found": "✓", "missing": "✗ MISSING", "search-path": "⚠ SEARCH PATH", "remote": "⚠ REMOTE"}
+        for kind, file_path, status in dependencies:
+            print(f"  {markers[status]} [{kind}] {file_path}")
+        if any(status in EXTERNAL_STATUSES for _, _, status in dependencies):
+            print("  ⚠ SEARCH PATH/REMOTE: provided by the renderer or a server - not checked on disk")
+        sys.exit(1 if any(status == "missing" for _, _, status in dependencies) else 0)
+
+
+# This block runs only when the script is executed directly
+# (not when imported as a module)
+if __name__ == "__main__":
+    main()
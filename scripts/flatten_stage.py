@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Flatten Stage Script
+
+A flattened copy of a scene for render-farm loading.
+
+Every farm task that opens GoodStart_ROOT.usda reads the root file, its four
+sublayers and all referenced assets, and composes every prim from them -
+once per frame task. A flattened file holds the RESULT of that composition in
+one layer, so a task only reads one crate file and composes (almost) nothing.
+
+Two methods:
+- stage:       Usd.Stage.Flatten - the whole composed stage (sublayers,
+               references, payloads, variants) in one layer. Instancing is
+               kept (the prototypes become "Flattened_Prototype_N" prims).
+- layer-stack: UsdUtils.FlattenLayerStack - only the root file and its
+               sublayers are merged. References and payloads stay arcs to
+               the asset files, so assets can still be updated on their own.
+
+The flattened file is rebuilt only when it has to be: it is keyed by the
+content hashes of every layer it was built from (the dependency closure, see
+cache.py), and a manifest next to it (NAME.usdc.json) records them. Textures
+and other asset files are not part of the key - they are not copied into the
+flattened file, only pointed to.
+
+After building, the flattened file is opened and compared with the original
+stage: both must compose to the same prims with the same properties. Only
+then does it replace the previous flattened file, so farm tasks never see a
+broken or half-written file.
+
+Asset paths: flattening anchors every relative asset path (textures,
+references) to an absolute path. Paths inside the root file's folder are
+written back relative to the flattened file, so the project can be mounted
+under another path on the farm.
+
+Usage:
+    # Build (or reuse) the flattened root: .usd_validate_cache/flattened/GoodStart_ROOT.stage.usdc
+    python scripts/flatten_stage.py
+
+    # Only merge the sublayers, write to a chosen file
+    python scripts/flatten_stage.py GoodStart_ROOT.usda --method layer-stack -o farm/GoodStart_flat.usdc
+
+    # Farm pre-task: is the flattened file up to date? (exit code 1 if not)
+    python scripts/flatten_stage.py --check
+
+    # Rebuild even if nothing changed
+    python scripts/flatten_stage.py --force
+"""
+
+# Standard library imports
+import sys      # For command-line arguments and exit codes
+import os       # For operating system operations
+import argparse # For parsing command-line options
+import hashlib  # The key of a flattened file is a hash of its inputs
+import json     # The manifest is stored as JSON
+import time     # Wall-clock timing
+from pathlib import Path  # Modern Python path handling
+
+# USD library imports
+try:
+    from pxr import Usd, UsdUtils, Sdf, Tf
+    # Usd: Main USD API - opens and flattens stages
+    # UsdUtils: USD utilities - flattens layer stacks, rewrites asset paths
+    # Sdf: Scene Description Foundation - layers and file formats
+    # Tf: Tools Foundation - USD's error type (raised for unparseable files)
+except ImportError:
+    print("Error: usd-core not installed. Install with: pip install usd-core")
+    sys.exit(1)
+
+# Shared helpers from the validation package (scripts/usd_goodstart/validate)
+from usd_goodstart.validate import file_content_hash
+from usd_goodstart.validate.cache import collect_dependency_closure
+from usd_goodstart.validate.resolution import iter_layer_asset_paths, open_layer, resolve_layer_asset_path
+
+
+# Project root = the folder that contains the scripts/ folder
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# File flattened when none is given
+DEFAULT_ROOT_FILE = PROJECT_ROOT / "GoodStart_ROOT.usda"
+
+# Where flattened files are written by default (git-ignored, next to the result cache)
+DEFAULT_OUTPUT_DIR = PROJECT_ROOT / ".usd_validate_cache" / "flattened"
+
+# Flatten methods (see module docstring)
+METHODS = ("stage", "layer-stack")
+
+# Bump this when the way files are flattened changes - old flattened files are then rebuilt
+FLATTEN_VERSION = 1
+
+# How many differences the verification prints at most
+MAX_SHOWN_DIFFERENCES = 20
+
+
+def _is_layer_file(path):
+    """True for files USD reads as layers (.usd, .usda, .usdc, ...), False for textures etc."""
+    return Sdf.FileFormat.FindByExtension(Path(path).suffix.lstrip(".")) is not None
+
+
+def collect_inputs(root_file, method):
+    """
+    The layers a flattened `root_file` is built from, at the layer level (no stage).
+
+    - stage:       the whole dependency closure (sublayers, references, payloads)
+    - layer-stack: the root file and its sublayers only
+
+    Returns (files, missing): sorted existing layer files, and sorted authored
+    layer paths that do not resolve right now (if one shows up later, the
+    flattened file has to be rebuilt).
+    """
+    if method == "stage":
+        files, missing, _ = collect_dependency_closure(root_file)
+        return ([path for path in files if _is_layer_file(path)],
+                [path for path in missing if _is_layer_file(path)])
+
+    files, missing = set(), set()
+    to_visit = [str(Path(root_file).resolve())]
+    while to_visit:
+        layer_path = to_visit.pop(0)
+        if layer_path in files:
+            continue
+        files.add(layer_path)
+        layer, _ = open_layer(layer_path)
+        if not layer:
+            continue  # Unreadable layers still count as input (by content hash)
+        for _, asset_path, _ in iter_layer_asset_paths(layer, kinds=("sublayer",)):
+            resolved_path = resolve_layer_asset_path(layer, asset_path)
+            if resolved_path and Path(resolved_path).exists():
+                to_visit.append(resolved_path)
+            else:
+                missing.add(Sdf.ComputeAssetPathRelativeToLayer(layer, asset_path))
+    return sorted(files), sorted(missing)
+
+
+def compute_key(root_file, method, output, dependencies, missing):
+    """
+    The key of a flattened file: a hash of everything it is built from - the
+    content hashes of its input layers, the missing paths, the method, the
+    output location (asset paths are written relative to it) and the USD version.
+    """
+    key = json.dumps({
+        "version": FLATTEN_VERSION,
+        "usd": list(Usd.GetVersion()),
+        "root": str(root_file),
+        "method": method,
+        "output": str(output),
+        "dependencies": dependencies,
+        "missing": missing,
+    }, sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def manifest_path(output):
+    """The manifest of the flattened file `output` (NAME.usdc.json next to it)."""
+    return Path(f"{output}.json")
+
+
+def read_manifest(output):
+    """The manifest of `output` as a dict, or None if there is none (or it is broken)."""
+    try:
+        return json.loads(manifest_path(output).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def changed_inputs(manifest, dependencies, missing):
+    """Which inputs differ from the ones in `manifest` (as a list of text lines)."""
+    old_dependencies = manifest.get("dependencies", {})
+    changes = []
+    for path in sorted(set(old_dependencies) | set(dependencies)):
+        if path not in dependencies:
+            changes.append(f"no longer used: {os.path.relpath(path)}")
+        elif path not in old_dependencies:
+            changes.append(f"new: {os.path.relpath(path)}")
+        elif old_dependencies[path] != dependencies[path]:
+            changes.append(f"changed: {os.path.relpath(path)}")
+    for path in sorted(set(manifest.get("missing", [])) - set(missing)):
+        changes.append(f"found now: {path}")
+    return changes
+
+
+def _relative_asset_paths(project_dir, output_dir):
+    """
+    An asset path function for UsdUtils.ModifyAssetPaths(): absolute paths
+    inside `project_dir` become relative to `output_dir`, all others stay.
+    """
+    project_dir = os.path.normpath(str(project_dir))
+
+    def modify(asset_path):
+        path = os.path.normpath(asset_path) if os.path.isabs(asset_path) else None
+        if path and os.path.commonpath([path, project_dir]) == project_dir:
+            relative = os.path.relpath(path, output_dir).replace(os.sep, "/")
+            return relative if relative.startswith(".") else f"./{relative}"
+        return asset_path
+    return modify
+
+
+def flatten(stage, method, output):
+    """Flatten `stage` with `method` into a new layer whose asset paths are relative to `output`."""
+    if method == "stage":
+        layer = stage.Flatten()
+    else:
+        layer = UsdUtils.FlattenLayerStack(stage)
+    root_dir = Path(stage.GetRootLayer().realPath).parent
+    UsdUtils.ModifyAssetPaths(layer, _relative_asset_paths(root_dir, Path(output).parent))
+    return layer
+
+
+def composed_properties(stage):
+    """
+    prim path -> sorted (property name, type name) of every defined prim of
+    `stage`, also inside instances. Flattened prototypes are overs, so they
+    are not listed - only the prims a renderer sees.
+    """
+    predicate = Usd.TraverseInstanceProxies(Usd.PrimIsActive & Usd.PrimIsDefined & Usd.PrimIsLoaded)
+    result = {}
+    for prim in Usd.PrimRange.Stage(stage, predicate):
+        result[str(prim.GetPath())] = sorted(
+            (prop.GetName(), str(prop.GetTypeName()) if isinstance(prop, Usd.Attribute) else "rel")
+            for prop in prim.GetAuthoredProperties())
+    return result
+
+
+def compare_stages(original, flattened):
+    """
+    Compare the prims and authored properties of two stages.
+    Returns the differences as text lines - an empty list means they match.
+    """
+    expected, found = composed_properties(original), composed_properties(flattened)
+    differences = [f"missing prim: {path}" for path in sorted(expected.keys() - found.keys())]
+    differences += [f"extra prim: {path}" for path in sorted(found.keys() - expected.keys())]
+    for path in sorted(expected.keys() & found.keys()):
+        if expected[path] != found[path]:
+            missing = sorted(name for name, _ in set(expected[path]) - set(found[path]))
+            extra = sorted(name for name, _ in set(found[path]) - set(expected[path]))
+            differences.append(f"properties differ on {path}: missing {missing or '-'}, extra/retyped {extra or '-'}")
+    return differences
+
+
+def _open_timed(file_path):
+    """Open `file_path` as a stage (with payloads). Returns (stage, seconds)."""
+    start = time.perf_counter()
+    stage = Usd.Stage.Open(str(file_path), Usd.Stage.LoadAll)
+    return stage, time.perf_counter() - start
+
+
+def build(root_file, method, output, verify=True):
+    """
+    Flatten `root_file` into `output` (crate) and verify it. Returns a dict
+    with the numbers for the manifest, or None if it failed (nothing is written).
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        stage, open_seconds = _open_timed(root_file)
+    except Tf.ErrorException as exc:
+        print(f"✗ Cannot open {root_file}: {' '.join(str(exc).split())}")
+        return None
+
+    start = time.perf_counter()
+    layer = flatten(stage, method, output)
+    # Same folder as the final file, so the relative asset paths resolve while verifying
+    temp_path = output.with_name(f"{output.stem}.building{output.suffix}")
+    if not layer.Export(str(temp_path), args={"format": "usdc"}):
+        print(f"✗ Export failed: {temp_path}")
+        return None
+    flatten_seconds = time.perf_counter() - start
+
+    flattened_stage, flattened_open_seconds = _open_timed(temp_path)
+    prims = len(composed_properties(flattened_stage))
+    if verify:
+        differences = compare_stages(stage, flattened_stage)
+        if differences:
+            del flattened_stage
+            temp_path.unlink()
+            print(f"✗ The flattened stage does not match {os.path.relpath(root_file)} - nothing written:")
+            for line in differences[:MAX_SHOWN_DIFFERENCES]:
+                print(f"    {line}")
+            if len(differences) > MAX_SHOWN_DIFFERENCES:
+                print(f"    ... and {len(differences) - MAX_SHOWN_DIFFERENCES} more")
+            return None
+        print(f"✓ Verified: {prims} prim(s) with the same properties as the original stage")
+    del flattened_stage
+    os.replace(temp_path, output)
+    return {
+        "layers": len(stage.GetUsedLayers()),
+        "prims": prims,
+        "open_seconds": open_seconds,
+        "flatten_seconds": flatten_seconds,
+        "flattened_open_seconds": flattened_open_seconds,
+        "size": output.stat().st_size,
+    }
+
+
+def write_manifest(output, entry):
+    """Write the manifest of `output` (temporary file + rename, like the result cache)."""
+    path = manifest_path(output)
+    temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(entry, indent=1), encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def main():
+    """
+    Main function - entry point when script is run from command line.
+
+    Builds the flattened file if its inputs changed, reuses it otherwise.
+    Exit codes: 0 = up to date (or built), 1 = build/verification failed
+    or, with --check, the flattened file is out of date.
+    """
+    parser = argparse.ArgumentParser(description="Flatten a USD scene into one crate file for render-farm loading.")
+    parser.add_argument("root", nargs="?", default=str(DEFAULT_ROOT_FILE), metavar="ROOT",
+                        help="The file to flatten (default: GoodStart_ROOT.usda)")
+    parser.add_argument("--method", choices=METHODS, default="stage",
+                        help="stage: Usd.Stage.Flatten, everything in one layer (default); "
+                             "layer-stack: UsdUtils.FlattenLayerStack, only the sublayers are merged")
+    parser.add_argument("--output", "-o", metavar="FILE",
+                        help="Flattened file to write (default: .usd_validate_cache/flattened/ROOT.METHOD.usdc)")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild even if no input changed")
+    parser.add_argument("--check", action="store_true",
+                        help="Only check if the flattened file is up to date (exit code 1 if not)")
+    parser.add_argument("--no-verify", action="store_true",
+                        help="Skip the comparison of the flattened stage with the original")
+    args = parser.parse_args()
+
+    root_file = Path(args.root).resolve()
+    if not root_file.is_file():
+        parser.error(f"File not found: {args.root}")
+    output = Path(args.output).resolve() if args.output else DEFAULT_OUTPUT_DIR / f"{root_file.stem}.{args.method}.usdc"
+    if output.suffix.lower() not in (".usd", ".usdc"):
+        parser.error("--output must be a .usdc (or .usd) file - the flattened file is written as crate")
+
+    files, missing = collect_inputs(root_file, args.method)
+    dependencies = {path: file_content_hash(path) for path in files}
+    key = compute_key(root_file, args.method, output, dependencies, missing)
+    manifest = read_manifest(output)
+    up_to_date = manifest is not None and manifest.get("key") == key and output.exists()
+
+    print(f"Flattening {os.path.relpath(root_file)} ({args.method}, {len(files)} input layer(s))")
+    if up_to_date and not args.force:
+        print(f"✓ Up to date: {os.path.relpath(output)}")
+        sys.exit(0)
+    if manifest is not None and not up_to_date:
+        for line in changed_inputs(manifest, dependencies, missing) or ["flatten settings or USD version changed"]:
+            print(f"  {line}")
+    if args.check:
+        print(f"✗ Out of date: {os.path.relpath(output)}")
+        sys.exit(1)
+    for path in missing:
+        print(f"⚠ Missing layer (flattened without it): {path}")
+
+    numbers = build(root_file, args.method, output, verify=not args.no_verify)
+    if numbers is None:
+        sys.exit(1)
+    write_manifest(output, {
+        "key": key,
+        "version": FLATTEN_VERSION,
+        "root": str(root_file),
+        "method": args.method,
+        "dependencies": dependencies,
+        "missing": missing,
+        **numbers,
+    })
+    print(f"✓ Written: {os.path.relpath(output)} ({numbers['size'] / 1024:.1f} KB, {numbers['prims']} prim(s))")
+    print(f"  Open time: {numbers['open_seconds'] * 1000:.1f} ms for {numbers['layers']} layer(s) -> "
+          f"{numbers['flattened_open_seconds'] * 1000:.1f} ms flattened")
+    if numbers["flattened_open_seconds"] >= numbers["open_seconds"]:
+        # Many prims referencing a few shared assets compose cheaply - flattened,
+        # every prim gets its own copy of the asset's specs
+        print("⚠ The flattened file does not open faster than the original here"
+              + (" - try --method layer-stack" if args.method == "stage" else ""))
+    sys.exit(0)
+
+
+# This block runs only when the script is executed directly
+# (not when imported as a module)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Layer Hygiene Script
+
+Strip editor bloat and dead specs from USD layers.
+
+DCC tools leave things in layers that only they use. Omniverse, for example,
+writes a customLayerData block into every layer it saves:
+- cameraSettings: the viewport cameras of the last session
+- omni_layer:     the layer it was authored from - often an absolute path on
+                  somebody's machine (E:/SynologyDrive/...)
+- renderSettings: usually an empty dictionary
+and editing a referenced prim and undoing the edit leaves empty `over` specs
+behind. None of this changes the composed scene, but all of it is parsed on
+every stage open, in every tool of the pipeline.
+
+This script works on the layers themselves (Sdf level, no stage composition):
+- report: lists what could be removed from each layer, and measures its file
+          size and parse time before and after cleaning (a cleaned copy is
+          written to a temporary folder - the layer itself is not changed)
+- clean:  removes it and saves the layers (--dry-run shows the diff instead)
+
+What counts as removable:
+- editor-only customLayerData keys (EDITOR_LAYER_DATA_KEYS, --strip-key adds
+  more, --keep-key keeps one) and empty dictionaries in customLayerData
+- empty `over` specs: no metadata (not even a type name - `over Sphere`
+  is an opinion on the prim's type), no properties, no children - also
+  overs that are only left with empty children
+- with --empty-properties: empty property specs in overs - attributes
+  without a value, time samples or connections, relationships without
+  targets. Custom properties are always kept. Off by default: a property
+  that no other layer declares (e.g. an attribute outside the prim's schema)
+  disappears from the composed prim with its last declaration.
+
+Usage:
+    # What could be removed from the root file and 020_LYR_USD, with size/parse time
+    python scripts/layer_hygiene.py report
+
+    # Also show the changes as a diff
+    python scripts/layer_hygiene.py report --diff 020_LYR_USD/Variant_LYR.usda
+
+    # Show what "clean" would change, then clean
+    python scripts/layer_hygiene.py clean --dry-run
+    python scripts/layer_hygiene.py clean
+
+    # Keep the Omniverse viewport cameras, remove another key as well
+    python scripts/layer_hygiene.py clean --keep-key cameraSettings --strip-key refinementOverrideImplVersion
+
+    # Also remove valueless property specs from overs
+    python scripts/layer_hygiene.py clean --empty-properties
+
+Note: "clean" saves the layer through USD, so a text layer is written back
+in USD's own formatting. Commit or back up the layers before cleaning, and
+check the result with the validators.
+"""
+
+# Standard library imports
+import sys      # For command-line arguments and exit codes
+import os       # For operating system operations
+import argparse # For parsing command-line options
+import difflib  # Shows the changes as a unified diff
+import statistics  # Median of repeated measurements
+import tempfile # Cleaned copies for measuring live in a temporary folder
+import time     # Wall-clock timing
+from pathlib import Path  # Modern Python path handling
+
+# USD library imports
+try:
+    from pxr import Sdf, Tf
+    # Sdf: Scene Description Foundation - reads, edits and writes layers
+    # Tf: Tools Foundation - USD's error type (raised for unparseable files)
+except ImportError:
+    print("Error: usd-core not installed. Install with: pip install usd-core")
+    sys.exit(1)
+
+# Shared helpers from the validation package (scripts/usd_goodstart/validate)
+from usd_goodstart.validate import collect_usd_files
+from usd_goodstart.validate.layer_format import detect_file_format, format_size
+from usd_goodstart.validate.resolution import is_absolute_file_path
+
+
+# Project root = the folder that contains the scripts/ folder
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Files and folders looked at when no paths are given
+DEFAULT_SCAN_PATHS = [
+    PROJECT_ROOT / "GoodStart_ROOT.usda",
+    PROJECT_ROOT / "020_LYR_USD",
+]
+
+# customLayerData keys that only an editor reads (Omniverse Kit viewport and
+# layer panel state) - they never change the composed scene
+EDITOR_LAYER_DATA_KEYS = ("cameraSettings", "omni_layer")
+
+# Property fields that carry no opinion on their own (a declaration only)
+DECLARATION_FIELDS = {"typeName", "custom", "variability"}
+
+
+def clean_layer_data(layer, strip_keys):
+    """
+    Remove the `strip_keys` and empty dictionaries from the customLayerData of
+    `layer`. Returns a list of what was removed, as text.
+    """
+    data = dict(layer.customLayerData)
+    removed = []
+    for key, value in list(data.items()):
+        if key in strip_keys:
+            note = ""
+            authoring_layer = value.get("authoring_layer") if isinstance(value, dict) else None
+            if isinstance(authoring_layer, str) and is_absolute_file_path(authoring_layer):
+                note = f" (absolute authoring path {authoring_layer})"
+            removed.append(f"customLayerData {key}{note}")
+            del data[key]
+        elif isinstance(value, dict) and not value:
+            removed.append(f"customLayerData {key} (empty)")
+            del data[key]
+    if removed:
+        if data:
+            layer.customLayerData = data
+        else:
+            layer.ClearCustomLayerData()
+    return removed
+
+
+def _is_empty_property(prop):
+    """True for a non-custom property spec that only declares the property."""
+    return not prop.custom and set(prop.ListInfoKeys()) <= DECLARATION_FIELDS
+
+
+def _is_empty_over(spec):
+    """
+    True for an `over` without metadata, properties, children or variants.
+    A type name counts as metadata: `over Sphere "Thing"` changes the type of
+    the composed prim, removing it would change the scene.
+    """
+    return (spec.specifier == Sdf.SpecifierOver
+            and set(spec.ListInfoKeys()) == {"specifier"}
+            and not spec.properties and not spec.nameChildren and not spec.variantSets)
+
+
+def clean_prim(spec, removed, empty_properties=False):
+    """
+    Remove empty overs (and with empty_properties=True empty over properties)
+    below and on `spec`, children first - so an over that only held empty
+    overs goes as well. Removed paths are added to `removed` ("over" and
+    "property" lists). Returns True if `spec` itself is now an empty over.
+    """
+    for child in list(spec.nameChildren):
+        if clean_prim(child, removed, empty_properties):
+            removed["over"].append(child.path)
+            del spec.nameChildren[child.name]
+    for variant_set in spec.variantSets.values():
+        for variant in variant_set.variants.values():
+            for child in list(variant.primSpec.nameChildren):
+                if clean_prim(child, removed, empty_properties):
+                    removed["over"].append(child.path)
+                    del variant.primSpec.nameChildren[child.name]
+    if empty_properties and spec.specifier == Sdf.SpecifierOver:
+        for prop in list(spec.properties):
+            if _is_empty_property(prop):
+                removed["property"].append(prop.path)
+                spec.RemoveProperty(prop)
+    return _is_empty_over(spec)
+
+
+def clean(layer, strip_keys, empty_properties=False):
+    """
+    Clean `layer` in memory (see module docstring).
+
+    Returns a dict: "layer_data" (removed customLayerData entries as text),
+    "over" and "property" (removed spec paths).
+    """
+    removed = {"layer_data": [], "over": [], "property": []}
+    with Sdf.ChangeBlock():  # Batch all edits - much faster for big layers
+        removed["layer_data"] = clean_layer_data(layer, strip_keys)
+        for root_prim in list(layer.rootPrims):
+            if clean_prim(root_prim, removed, empty_properties):
+                removed["over"].append(root_prim.path)
+                del layer.rootPrims[root_prim.name]
+    return removed
+
+
+def cleaned_copy(layer, strip_keys, empty_properties=False):
+    """An anonymous copy of `layer`, cleaned, and what was removed from it."""
+    copy = Sdf.Layer.CreateAnonymous(f"cleaned.{layer.GetFileFormat().primaryFileExtension}")
+    copy.TransferContent(layer)
+    return copy, clean(copy, strip_keys, empty_properties)
+
+
+def layer_diff(layer, copy):
+    """The changes from `layer` to `copy` as unified diff lines (both written as text)."""
+    return list(difflib.unified_diff(layer.ExportToString().splitlines(), copy.ExportToString().splitlines(),
+                                     "original", "cleaned", lineterm=""))
+
+
+def measure_parse(file_path, repeat):
+    """Median time (seconds) to read `file_path` into a new layer, over `repeat` reads."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Sdf.Layer.OpenAsAnonymous(str(file_path))  # Always reads the file - no layer registry
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def measure_cleaned(file_path, copy, repeat):
+    """
+    File size and parse time of `file_path` and of its cleaned `copy`, which is
+    written in the same format to a temporary folder.
+    Returns ((size before, size after), (seconds before, seconds after)).
+    """
+    with tempfile.TemporaryDirectory(prefix="layer_hygiene_") as temp_dir:
+        cleaned_path = Path(temp_dir) / Path(file_path).name
+        copy.Export(str(cleaned_path), args={"format": detect_file_format(file_path) or "usda"})
+        sizes = (Path(file_path).stat().st_size, cleaned_path.stat().st_size)
+        seconds = (measure_parse(file_path, repeat), measure_parse(cleaned_path, repeat))
+    return sizes, seconds
+
+
+def open_layer(file_path):
+    """Open `file_path` as a layer, or print why not and return None."""
+    try:
+        layer = Sdf.Layer.FindOrOpen(str(file_path))
+    except Tf.ErrorException:
+        layer = None
+    if not layer:
+        print(f"  ✗ Cannot open {os.path.relpath(file_path)}")
+    return layer
+
+
+def print_removed(removed):
+    """Print what was (or would be) removed from one layer."""
+    for entry in removed["layer_data"]:
+        print(f"  ⚠ Editor metadata: {entry}")
+    for kind, label in (("over", "empty over(s)"), ("property", "empty property spec(s) in overs")):
+        paths = removed[kind]
+        if paths:
+            shown = ", ".join(str(path) for path in paths[:5]) + (", ..." if len(paths) > 5 else "")
+            print(f"  ⚠ {len(paths)} {label}: {shown}")
+
+
+def report_layers(paths, strip_keys, empty_properties=False, measure=True, repeat=5, show_diff=False):
+    """Print the hygiene report (see module docstring). Returns the number of layers that could be cleaned."""
+    files = [file_path for file_path in collect_usd_files(paths) if file_path.is_file()]
+    print(f"Layer hygiene: {len(files)} layer(s)")
+    total_before = total_after = 0
+    seconds_before = seconds_after = 0.0
+    to_clean = 0
+    for file_path in files:
+        layer = open_layer(file_path)
+        if not layer:
+            continue
+        copy, removed = cleaned_copy(layer, strip_keys, empty_properties)
+        if not any(removed.values()):
+            print(f"\n✓ {os.path.relpath(file_path)}: nothing to remove")
+            continue
+        to_clean += 1
+        print(f"\n{os.path.relpath(file_path)}")
+        print_removed(removed)
+        if measure:
+            (size_before, size_after), (parse_before, parse_after) = measure_cleaned(file_path, copy, repeat)
+            total_before, total_after = total_before + size_before, total_after + size_after
+            seconds_before, seconds_after = seconds_before + parse_before, seconds_after + parse_after
+            print(f"  Size: {format_size(size_before)} -> {format_size(size_after)} "
+                  f"({(size_after - size_before) / size_before:+.0%}), "
+                  f"parse: {parse_before * 1000:.2f} ms -> {parse_after * 1000:.2f} ms")
+        if show_diff:
+            for line in layer_diff(layer, copy):
+                print(f"    {line}")
+
+    print()
+    if not to_clean:
+        print("✓ All layers are clean")
+        return 0
+    summary = f"⚠ {to_clean} layer(s) can be cleaned"
+    if measure and total_before:
+        summary += (f": {format_size(total_before)} -> {format_size(total_after)}, "
+                    f"parse {seconds_before * 1000:.2f} ms -> {seconds_after * 1000:.2f} ms")
+    print(summary + " -> clean with: python scripts/layer_hygiene.py clean")
+    return to_clean
+
+
+def clean_file(file_path, strip_keys, empty_properties=False, dry_run=False):
+    """
+    Clean the layer `file_path` and save it (with dry_run=True only print the
+    diff). Returns True if the layer was (or would be) changed, False if there
+    was nothing to remove, None if it could not be opened or saved.
+    """
+    layer = open_layer(file_path)
+    if not layer:
+        return None
+    copy, removed = cleaned_copy(layer, strip_keys, empty_properties)
+    if not any(removed.values()):
+        print(f"  ✓ {os.path.relpath(file_path)}: nothing to remove")
+        return False
+    if dry_run:
+        print(f"  Would clean {os.path.relpath(file_path)}:")
+        print_removed(removed)
+        for line in layer_diff(layer, copy):
+            print(f"    {line}")
+        return True
+
+    size_before = Path(file_path).stat().st_size
+    layer.TransferContent(copy)
+    if not layer.Save():
+        print(f"  ✗ Saving failed: {file_path}")
+        return None
+    print(f"  ✓ {os.path.relpath(file_path)}: {format_size(size_before)} -> "
+          f"{format_size(Path(file_path).stat().st_size)}")
+    print_removed(removed)
+    return True
+
+
+def main():
+    """
+    Main function - entry point when script is run from command line.
+
+    Sub-commands:
+    - report [PATH ...]: what could be removed, with size and parse time before/after
+    - clean [PATH ...]:  remove it and save the layers (--dry-run: only show the diff)
+    """
+    parser = argparse.ArgumentParser(description="Report and remove editor-only metadata and empty specs from USD layers.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_common_arguments(command_parser):
+        command_parser.add_argument("paths", nargs="*", metavar="PATH",
+                                    help="Files/folders to look at (default: root file and 020_LYR_USD)")
+        command_parser.add_argument("--strip-key", action="append", default=[], metavar="KEY",
+                                    help="Also remove this customLayerData key (can be given several times; "
+                                         f"always removed: {', '.join(EDITOR_LAYER_DATA_KEYS)})")
+        command_parser.add_argument("--keep-key", action="append", default=[], metavar="KEY",
+                                    help="Keep this customLayerData key (can be given several times)")
+        command_parser.add_argument("--empty-properties", action="store_true",
+                                    help="Also remove property specs in overs that have no value, time samples, "
+                                         "connections or targets (custom properties are kept)")
+
+    report_parser = commands.add_parser("report", help="What could be removed, with size and parse time before/after")
+    add_common_arguments(report_parser)
+    report_parser.add_argument("--diff", action="store_true",
+                               help="Also show the changes of each layer as a diff")
+    report_parser.add_argument("--no-measure", action="store_true",
+                               help="Only list what could be removed (no size/parse time)")
+    report_parser.add_argument("--repeat", type=int, default=5, metavar="N",
+                               help="Read each layer N times before and after and keep the median (default: 5)")
+
+    clean_parser = commands.add_parser("clean", help="Remove it and save the layers")
+    add_common_arguments(clean_parser)
+    clean_parser.add_argument("--dry-run", action="store_true",
+                              help="Only show what would be removed, as a diff")
+
+    args = parser.parse_args()
+    strip_keys = (set(EDITOR_LAYER_DATA_KEYS) | set(args.strip_key)) - set(args.keep_key)
+    paths = args.paths or DEFAULT_SCAN_PATHS
+
+    if args.command == "report":
+        if args.repeat < 1:
+            parser.error("--repeat must be at least 1")
+        report_layers(paths, strip_keys, args.empty_properties, measure=not args.no_measure, repeat=args.repeat, show_diff=args.diff)
+        sys.exit(0)
+
+    if args.command == "clean":
+        files = [file_path for file_path in collect_usd_files(paths) if file_path.is_file()]
+        print(f"{'Checking' if args.dry_run else 'Cleaning'} {len(files)} layer(s):")
+        results = [clean_file(file_path, strip_keys, args.empty_properties, dry_run=args.dry_run) for file_path in files]
+        changed = results.count(True)
+        print()
+        if args.dry_run:
+            print(f"{changed} layer(s) would be cleaned - run without --dry-run to save them")
+        else:
+            print(f"✓ {changed} layer(s) cleaned" if changed else "✓ All layers are clean")
+        failed = results.count(None)
+        if failed:
+            print(f"✗ {failed} layer(s) could not be opened or saved")
+        sys.exit(1 if failed else 0)
+
+
+# This block runs only when the script is executed directly
+# (not when imported as a module)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+USD Composition Profiler Script
+
+"The scene suddenly takes 30 seconds to open - which layer or arc did that?"
+
+Opening a stage does two things:
+1. reading layers:  every sublayer of GoodStart_ROOT.usda and every
+                    referenced/payloaded asset file is parsed
+2. composing:       for every prim, USD combines the opinions of all those
+                    layers into a "prim index" - one node per layer stack the
+                    prim gets opinions from (root layer stack, each reference,
+                    payload, inherit, variant, ...)
+
+This script measures both and shows where the time goes:
+- per layer (sublayers and referenced assets): time to open it on its own,
+  number of specs in it, composition arcs authored in it and pointing at it,
+  how many prims it has opinions on and how long those prims take to compose
+- per prim: the heaviest prim indexes - time to compose, number of nodes,
+  how deeply the arcs are nested, number of specs and arcs
+  (read with Usd.PrimCompositionQuery)
+
+Usage:
+    # Profile the project root file
+    python scripts/profile_composition.py
+
+    # Profile any file, show the 25 heaviest prims, open each layer 5 times
+    python scripts/profile_composition.py 010_ASS_USD/0_Geo_Shader_Ball_Env.usd --top 25 --repeat 5
+
+    # The prims with the most deeply nested arcs (reference in reference in ...)
+    python scripts/profile_composition.py --sort depth
+
+    # Without payloads, or only part of the scene
+    python scripts/profile_composition.py --load-none
+    python scripts/profile_composition.py --mask /World/Geo
+
+    # Also write all numbers as JSON (e.g. to compare two versions of a scene)
+    python scripts/profile_composition.py -o composition_profile.json
+
+Note: This script only reads USD files, it never modifies them.
+Times are wall-clock times of this machine - compare them with each other,
+not with numbers measured on another computer.
+"""
+
+# Standard library imports
+import sys      # For command-line arguments and exit codes
+import os       # For relative paths in the output
+import argparse # For parsing command-line options
+import json     # The --output file is JSON
+import statistics  # Median of repeated measurements
+import time     # Wall-clock timing
+from collections import Counter, defaultdict  # Per-layer totals
+from pathlib import Path  # Modern Python path handling
+
+# USD library imports
+try:
+    from pxr import Usd, Pcp, Sdf, Tf
+    # Usd: Main USD API for stages, prims and composition queries
+    # Pcp: Prim Cache Population - USD's composition engine (arc types)
+    # Sdf: Scene Description Foundation - layers and their specs
+    # Tf: Tools Foundation - USD's error type (raised for unparseable files)
+except ImportError:
+    print("Error: usd-core not installed. Install with: pip install usd-core")
+    sys.exit(1)
+
+# Shared helpers from the validation package (scripts/usd_goodstart/validate)
+from usd_goodstart.validate import open_stage
+from usd_goodstart.validate.cli import check_stage_loading_arguments
+
+
+# Project root = the folder that contains the scripts/ folder
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# File profiled when no file is given
+DEFAULT_FILE = PROJECT_ROOT / "GoodStart_ROOT.usda"
+
+# Default number of heaviest prims listed (--top)
+DEFAULT_TOP = 10
+
+# How the heaviest prims can be sorted (--sort) -> key in the profile_prim() result
+PRIM_SORT_KEYS = {"time": "compose_seconds", "nodes": "nodes", "depth": "depth"}
+
+
+def _relative(file_path, base_dir):
+    """`file_path` relative to `base_dir` if that is shorter to read, else unchanged."""
+    try:
+        relative = os.path.relpath(file_path, base_dir)
+    except ValueError:
+        return str(file_path)  # Different drives on Windows
+    return str(file_path) if relative.startswith(os.path.join(os.pardir, os.pardir)) else relative
+
+
+def _arc_type_name(arc_type):
+    """Short name of a Pcp.ArcType, e.g. "reference" or "payload"."""
+    return arc_type.displayName.lower()
+
+
+def _walk_nodes(node, depth=0):
+    """Yield (node, depth) for `node` and all nodes below it; depth = number of arcs from the prim."""
+    yield node, depth
+    for child in node.children:
+        yield from _walk_nodes(child, depth + 1)
+
+
+def time_layer_open(file_path, repeat=1):
+    """
+    Seconds it takes to read `file_path` as a layer (median of `repeat` opens),
+    or None if it cannot be read.
+
+    Sdf.Layer.OpenAsAnonymous reads the file again every time, even if the
+    stage already has the layer open - so this is the pure reading cost.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            layer = Sdf.Layer.OpenAsAnonymous(file_path)
+        except Tf.ErrorException:
+            return None
+        times.append(time.perf_counter() - start)
+        if not layer:
+            return None
+    return statistics.median(times)
+
+
+def count_specs(layer):
+    """Number of specs (prims, properties, variants, ...) in `layer`."""
+    paths = []
+    layer.Traverse(Sdf.Path.absoluteRootPath, paths.append)
+    return len(paths) - 1  # Without the pseudo-root
+
+
+def iter_profiled_prims(stage):
+    """
+    Every prim that has its own prim index: all prims of the stage (also
+    inactive and abstract ones) and the prims inside instance prototypes.
+    Instances share the prim index of their prototype, so those prims are
+    composed - and listed - only once.
+    """
+    yield from Usd.PrimRange.Stage(stage, Usd.PrimAllPrimsPredicate)
+    for prototype in stage.GetPrototypes():
+        yield from Usd.PrimRange(prototype, Usd.PrimAllPrimsPredicate)
+
+
+def profile_prim(prim):
+    """
+    Composition numbers of ONE prim, or None if it has no prim index of its
+    own (the root of an instance prototype).
+
+    - compose_seconds: time to compute the prim index again
+                       (Usd.Prim.ComputeExpandedPrimIndex - the layers are
+                       already in memory, so this is composition only)
+    - nodes:  nodes in the prim index (layer stacks the prim is composed from)
+    - depth:  how deeply arcs are nested (reference in a reference = 2)
+    - specs:  prim specs that have opinions on the prim (its "prim stack")
+    - arcs:   composition arcs of the prim itself (Usd.PrimCompositionQuery,
+              without the arcs inherited from its parents)
+    """
+    prim_index = prim.GetPrimIndex()
+    if not prim_index.IsValid():
+        return None
+    start = time.perf_counter()
+    prim.ComputeExpandedPrimIndex()
+    compose_seconds = time.perf_counter() - start
+
+    depths = [depth for _, depth in _walk_nodes(prim_index.rootNode)]
+    arcs = [arc for arc in Usd.PrimCompositionQuery(prim).GetCompositionArcs()
+            if arc.GetArcType() != Pcp.ArcTypeRoot and not arc.IsAncestral() and not arc.IsImplicit()]
+    return {
+        "prim": str(prim.GetPath()),
+        "compose_seconds": compose_seconds,
+        "nodes": len(depths),
+        "depth": max(depths),
+        "specs": len(prim_index.primStack),
+        "arcs": [{
+            "type": _arc_type_name(arc.GetArcType()),
+            "introduced_in": arc.GetIntroducingLayer().identifier if arc.GetIntroducingLayer() else None,
+            "target": arc.GetTargetLayer().identifier if arc.GetTargetLayer() else None,
+        } for arc in arcs],
+        "layers": sorted({spec.layer.identifier for spec in prim_index.primStack}),
+    }
+
+
+def profile_composition(usd_file, load_none=False, mask=None, repeat=1):
+    """
+    Open `usd_file`, time it, and profile every layer and prim of it.
+
+    Returns a dict with:
+    - "stage":  open time, number of prims and layers, summed read/compose times
+    - "layers": one entry per layer (see print_profile() for the columns)
+    - "prims":  one entry per prim (see profile_prim()), heaviest first
+    Raises Tf.ErrorException / RuntimeError if the file cannot be opened.
+    """
+    # Load the file format and schema plugins first - that happens once per
+    # process and is not part of opening this file
+    for extension in ("usda", "usdc"):
+        Sdf.FileFormat.FindByExtension(extension)
+    Usd.Stage.CreateInMemory()
+
+    start = time.perf_counter()
+    stage = open_stage(str(usd_file), load_none=load_none, mask=mask)
+    open_seconds = time.perf_counter() - start
+    if not stage:
+        raise RuntimeError(f"Failed to open file: {usd_file}")
+
+    # Prims
+    prims = [result for result in map(profile_prim, iter_profiled_prims(stage)) if result]
+    prims.sort(key=lambda result: result["compose_seconds"], reverse=True)
+
+    # What every layer is to the stage: the root layer stack first,
+    # then the files that arcs point at
+    roles = {layer.identifier: "sublayer" for layer in stage.GetLayerStack(includeSessionLayers=False)}
+    roles[stage.GetRootLayer().identifier] = "root"
+    arcs_in, arcs_to = Counter(), Counter()
+    prim_counts, compose_seconds = Counter(), defaultdict(float)
+    for result in prims:
+        for arc in result["arcs"]:
+            arcs_in[arc["introduced_in"]] += 1
+            arcs_to[arc["target"]] += 1
+            roles.setdefault(arc["target"], arc["type"])
+        for identifier in result["layers"]:
+            prim_counts[identifier] += 1
+            compose_seconds[identifier] += result["compose_seconds"]
+
+    layers = []
+    for layer in stage.GetUsedLayers(includeClipLayers=False):
+        if layer.anonymous:
+            continue  # The session layer - nothing on disk to profile
+        identifier = layer.identifier
+        layers.append({
+            "layer": identifier,
+            "role": roles.get(identifier, "nested sublayer"),  # A sublayer of a referenced file
+            "open_seconds": time_layer_open(layer.realPath or identifier, repeat),
+            "specs": count_specs(layer),
+            "arcs_in": arcs_in[identifier],
+            "arcs_to": arcs_to[identifier],
+            "prims": prim_counts[identifier],
+            "compose_seconds": compose_seconds[identifier],
+        })
+    layers.sort(key=lambda entry: entry["open_seconds"] or 0.0, reverse=True)
+
+    return {
+        "file": str(usd_file),
+        "stage": {
+            "open_seconds": open_seconds,
+            "prims": len(prims),
+            "layers": len(layers),
+            "read_seconds": sum(entry["open_seconds"] or 0.0 for entry in layers),
+            "compose_seconds": sum(result["compose_seconds"] for result in prims),
+        },
+        "layers": layers,
+        "prims": prims,
+    }
+
+
+def print_profile(profile, top=DEFAULT_TOP, sort="time"):
+    """Print the profile from profile_composition() as tables; the prims sorted by `sort` (see PRIM_SORT_KEYS)."""
+    base_dir = Path(profile["file"]).parent
+    stage = profile["stage"]
+    print(f"Composition profile: {profile['file']}")
+    print(f"  Stage open:     {stage['open_seconds'] * 1000:9.1f} ms  "
+          f"({stage['prims']} prim indexes, {stage['layers']} layers)")
+    print(f"  Reading layers: {stage['read_seconds'] * 1000:9.1f} ms  (every layer opened on its own, summed)")
+    print(f"  Composing:      {stage['compose_seconds'] * 1000:9.1f} ms  (every prim index computed again, summed)")
+
+    print("\nLayers (slowest to open first):")
+    print(f"  {'Open ms':>9} {'Specs':>8} {'Arcs in':>8} {'Arcs to':>8} {'Prims':>7} {'Compose ms':>11}  "
+          f"{'Role':<16} Layer")
+    for entry in profile["layers"]:
+        open_ms = f"{entry['open_seconds'] * 1000:.1f}" if entry["open_seconds"] is not None else "✗"
+        print(f"  {open_ms:>9} {entry['specs']:>8} {entry['arcs_in']:>8} {entry['arcs_to']:>8} "
+              f"{entry['prims']:>7} {entry['compose_seconds'] * 1000:>11.1f}  {entry['role']:<16} "
+              f"{_relative(entry['layer'], base_dir)}")
+    print("  Open ms:    reading the file on its own (✗ = cannot be read)")
+    print("  Arcs in:    composition arcs authored in the layer (references, payloads, inherits, ...)")
+    print("  Arcs to:    composition arcs that point at the layer")
+    print("  Prims:      prims the layer has opinions on")
+    print("  Compose ms: time to compose those prims (a prim counts for every layer it uses)")
+
+    sort_key = PRIM_SORT_KEYS[sort]
+    heaviest = sorted(profile["prims"], key=lambda result: result[sort_key], reverse=True)[:top]
+    if not heaviest:
+        return
+    print(f"\nHeaviest prim indexes (top {len(heaviest)} of {len(profile['prims'])} by {sort}):")
+    print(f"  {'Compose ms':>10} {'Nodes':>6} {'Depth':>6} {'Specs':>6} {'Arcs':>5}  Prim")
+    for result in heaviest:
+        arc_types = Counter(arc["type"] for arc in result["arcs"])
+        arcs = ", ".join(f"{count} {arc_type}" for arc_type, count in sorted(arc_types.items()))
+        print(f"  {result['compose_seconds'] * 1000:>10.3f} {result['nodes']:>6} {result['depth']:>6} "
+              f"{result['specs']:>6} {len(result['arcs']):>5}  {result['prim']}" + (f"  ({arcs})" if arcs else ""))
+    print("  Nodes: layer stacks the prim is composed from - Depth: arcs nested in arcs")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Show which layers and composition arcs make a USD file slow to open"
+    )
+    parser.add_argument("file", nargs="?", default=str(DEFAULT_FILE),
+                        help="USD file to profile (default: GoodStart_ROOT.usda)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, metavar="N",
+                        help=f"List the N heaviest prim indexes (default: {DEFAULT_TOP})")
+    parser.add_argument("--sort", choices=sorted(PRIM_SORT_KEYS), default="time",
+                        help="Sort the heaviest prims by compose time (default), number of "
+                             "prim index nodes, or arc nesting depth")
+    parser.add_argument("--repeat", type=int, default=1, metavar="N",
+                        help="Open every layer N times and keep the median time (default: 1)")
+    parser.add_argument("--load-none", action="store_true",
+                        help="Open the stage without loading payloads (Usd.Stage.LoadNone)")
+    parser.add_argument("--mask", action="append", metavar="PRIM_PATH",
+                        help="Only compose and profile this prim and its children. Can be given several times.")
+    parser.add_argument("--output", "-o", metavar="FILE",
+                        help="Also write all numbers (every layer and prim) as JSON to FILE")
+
+    args = parser.parse_args()
+    check_stage_loading_arguments(parser, args)
+    if args.top < 0:
+        parser.error("--top must not be negative")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    usd_file = Path(args.file).resolve()
+    if not usd_file.exists():
+        print(f"✗ File not found: {usd_file}")
+        sys.exit(1)
+
+    try:
+        profile = profile_composition(usd_file, load_none=args.load_none, mask=args.mask, repeat=args.repeat)
+    except (Tf.ErrorException, RuntimeError) as exc:
+        print(f"✗ Cannot open {usd_file}: {' '.join(str(exc).split())}")
+        sys.exit(1)
+    print_profile(profile, top=args.top, sort=args.sort)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            json.dump(profile, stream, indent=2)
+            stream.write("\n")
+        print(f"\n✓ Wrote {args.output}")
+
+
+# This block runs only when the script is executed directly
+# (not when imported as a module)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+USD Format Script
+
+Text (.usda) or binary crate (.usdc)?
+
+The library mixes both: 0_CUBE.usda and all layers are text,
+0_Geo_Shader_Ball_Env.usd is crate. Text is great for small layers people edit
+and diff in git. For heavy geometry it is slow: every number of every point is
+parsed from text when the file is opened. Crate files open many times faster
+and use less memory.
+
+This script:
+- report:  lists the format and size of every USD file and measures how long
+           it takes to open and to read all its values - and how much memory
+           it needs - in BOTH formats (crate loads big arrays only when they
+           are read, so opening alone would flatter it).
+           Text files of at least --min-size MB are flagged for conversion.
+- convert: converts those text files to crate (Sdf.Layer.Export) and checks
+           that nothing was lost: the converted file must read back exactly
+           like the original (round-trip comparison).
+
+Usage:
+    # Formats, sizes and open + read time / memory in both formats
+    python scripts/usd_format.py report
+    python scripts/usd_format.py report 010_ASS_USD --repeat 5
+
+    # Only list formats and sizes (no measuring)
+    python scripts/usd_format.py report --no-measure
+
+    # Convert every text file of at least 1 MB (writes NAME.usdc next to NAME.usda)
+    python scripts/usd_format.py convert 010_ASS_USD
+
+    # .usd files can be converted in place - references to them keep working
+    python scripts/usd_format.py convert --in-place 010_ASS_USD/heavy_asset.usd
+
+    # Only show what would be converted
+    python scripts/usd_format.py convert --dry-run --min-size 0.5
+
+Note: "convert" never changes or deletes a .usda file. A .usda file can only
+hold text, so the crate version is written as NAME.usdc next to it, and the
+script lists the layers whose references have to be switched to the new file.
+Files with the extension .usd can hold either format - with --in-place they
+are replaced by their crate version under the same name.
+The validators report large text layers with the issue code "large-text-layer".
+"""
+
+# Standard library imports
+import sys      # For command-line arguments and exit codes
+import os       # For operating system operations
+import argparse # For parsing command-line options
+import difflib  # Shows what differs if a round trip is not exact
+import json     # Measurements are passed between processes as JSON
+import statistics  # Median of repeated measurements
+import subprocess  # Each measurement runs in its own process
+import tempfile # The other-format copies for measuring live in a temporary folder
+import time     # Wall-clock timing
+from pathlib import Path  # Modern Python path handling
+
+# USD library imports
+try:
+    from pxr import Sdf, Tf
+    # Sdf: Scene Description Foundation - reads and writes layers in both formats
+    # Tf: Tools Foundation - USD's error type (raised for unparseable files)
+except ImportError:
+    print("Error: usd-core not installed. Install with: pip install usd-core")
+    sys.exit(1)
+
+# Shared helpers from the validation package (scripts/usd_goodstart/validate)
+from usd_goodstart.validate import collect_usd_files
+from usd_goodstart.validate.layer_format import DEFAULT_TEXT_SIZE_LIMIT, detect_file_format, format_size
+from usd_goodstart.validate.memory import current_memory_mb, peak_memory_mb, reset_peak_memory
+from usd_goodstart.validate.resolution import iter_layer_asset_paths, resolve_layer_asset_path
+
+
+# Project root = the folder that contains the scripts/ folder
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Files and folders looked at when no paths are given
+DEFAULT_SCAN_PATHS = [
+    PROJECT_ROOT / "GoodStart_ROOT.usda",
+    PROJECT_ROOT / "020_LYR_USD",
+    PROJECT_ROOT / "010_ASS_USD",
+]
+
+# Default --min-size in MB (same limit the validators warn about)
+DEFAULT_MIN_SIZE_MB = DEFAULT_TEXT_SIZE_LIMIT / (1024 * 1024)
+
+
+def read_all_values(layer):
+    """
+    Read every attribute value authored in `layer` (defaults and time samples).
+
+    Crate only reads the header when a file is opened and loads big arrays
+    (points, normals, ...) when they are first used, while text parses
+    everything up front - so comparing open times alone flatters crate.
+    Returns the number of values read.
+    """
+    paths = []
+    layer.Traverse(Sdf.Path.absoluteRootPath, paths.append)
+    values = 0
+    for path in paths:
+        attribute = layer.GetAttributeAtPath(path) if path.IsPropertyPath() else None
+        if not attribute:
+            continue
+        if attribute.HasDefaultValue():
+            attribute.default
+            values += 1
+        for time_code in layer.ListTimeSamplesForPath(path):
+            layer.QueryTimeSample(path, time_code)
+            values += 1
+    return values
+
+
+def measure_once(file_path):
+    """
+    Open `file_path` as a layer in this process, read all its values and
+    return the numbers.
+
+    Called in a fresh child process (see run_measurement()), so nothing is
+    cached from an earlier open. Memory is the growth of the process's peak
+    memory while opening and reading - e.g. the temporary buffers of the text
+    parser, or the arrays crate loads on demand.
+    """
+    # Load the file format plugins first - that happens once per process and
+    # is not part of opening this file
+    for extension in ("usda", "usdc"):
+        Sdf.FileFormat.FindByExtension(extension)
+    if reset_peak_memory():
+        baseline_rss = current_memory_mb()
+    else:
+        baseline_rss = peak_memory_mb()  # Python + pxr already imported
+    start = time.perf_counter()
+    layer = Sdf.Layer.FindOrOpen(str(file_path))
+    open_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    values = read_all_values(layer) if layer else 0
+    read_seconds = time.perf_counter() - start
+    peak_rss = peak_memory_mb()
+    return {
+        "opened": bool(layer),
+        "open_seconds": open_seconds,
+        "read_seconds": read_seconds,
+        "values": values,
+        "memory_mb": peak_rss - baseline_rss if peak_rss is not None else None,
+    }
+
+
+def run_measurement(file_path):
+    """Measure opening and reading `file_path` in a fresh Python process and return its numbers."""
+    command = [sys.executable, str(Path(__file__).resolve()), "_measure", str(file_path)]
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Measuring '{file_path}' failed:\n{result.stderr}")
+    return json.loads(result.stdout)
+
+
+def measure_formats(file_path, file_format, repeat=3):
+    """
+    Open time, read time and memory of `file_path` as text AND as crate.
+
+    The file itself is measured in its own format; for the other format a
+    converted copy is written to a temporary folder. Each format is opened
+    and read `repeat` times (in fresh processes) and the median is kept.
+    Returns {"usda": {...}, "usdc": {...}} with "open_seconds", "read_seconds"
+    and "memory_mb".
+    """
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="usd_format_") as temp_dir:
+        layer = Sdf.Layer.FindOrOpen(str(file_path))
+        for target_format in ("usda", "usdc"):
+            if target_format == file_format:
+                measured_path = file_path
+            else:
+                measured_path = Path(temp_dir) / f"{Path(file_path).stem}.{target_format}"
+                layer.Export(str(measured_path))
+            runs = [run_measurement(measured_path) for _ in range(repeat)]
+            memory = [run["memory_mb"] for run in runs if run["memory_mb"] is not None]
+            results[target_format] = {
+                "open_seconds": statistics.median(run["open_seconds"] for run in runs),
+                "read_seconds": statistics.median(run["read_seconds"] for run in runs),
+                "memory_mb": statistics.median(memory) if memory else None,
+            }
+    return results
+
+
+def scan_formats(paths, min_size_mb):
+    """
+    Format and size of every USD file in `paths`.
+
+    Returns a list of dicts with "path", "format", "size" and "convert"
+    (True for text files of at least `min_size_mb` MB).
+    """
+    entries = []
+    for file_path in collect_usd_files(paths):
+        if not file_path.is_file():
+            print(f"  ✗ Not found: {file_path}")
+            continue
+        file_format = detect_file_format(file_path)
+        size = file_path.stat().st_size
+        entries.append({
+            "path": file_path,
+            "format": file_format,
+            "size": size,
+            "convert": file_format == "usda" and size >= min_size_mb * 1024 * 1024,
+        })
+    return entries
+
+
+def report_formats(paths, min_size_mb, measure=True, repeat=3):
+    """Print the format report (see module docstring). Returns the scanned entries."""
+    entries = scan_formats(paths, min_size_mb)
+    if measure and peak_memory_mb() is None:
+        print("Note: memory can't be measured on this system - shown as n/a")
+
+    # Per format: open time + time to read all values, and memory
+    print(f"\n{'Format':<7} {'Size':>9}   {'Open + read as usda':>27}   {'Open + read as usdc':>27}   File")
+    for entry in entries:
+        timing = ""
+        if measure and entry["format"] in ("usda", "usdc"):
+            results = measure_formats(entry["path"], entry["format"], repeat)
+            timing = "   ".join(
+                f"{results[name]['open_seconds'] * 1000:>7.1f} +{results[name]['read_seconds'] * 1000:>6.1f} ms"
+                + (f" {results[name]['memory_mb']:>5.1f} MB" if results[name]["memory_mb"] is not None else "      n/a")
+                for name in ("usda", "usdc"))
+            entry["measured"] = results
+        print(f"{entry['format'] or '?':<7} {format_size(entry['size']):>9}   {timing:<57}   "
+              f"{os.path.relpath(entry['path'])}")
+
+    to_convert = [entry for entry in entries if entry["convert"]]
+    print()
+    if not to_convert:
+        print(f"✓ No text files of {min_size_mb:g} MB or more - nothing to convert")
+    for entry in to_convert:
+        message = f"⚠ {os.path.relpath(entry['path'])}: {format_size(entry['size'])} of text"
+        measured = entry.get("measured")
+        if measured:
+            text_seconds = measured["usda"]["open_seconds"] + measured["usda"]["read_seconds"]
+            crate_seconds = measured["usdc"]["open_seconds"] + measured["usdc"]["read_seconds"]
+            if crate_seconds:
+                message += f" - opens and reads {text_seconds / crate_seconds:.0f}x faster as crate"
+        print(message + " -> convert with: python scripts/usd_format.py convert")
+    return entries
+
+
+def compare_round_trip(source_layer, converted_path):
+    """
+    Read `converted_path` back and compare it with `source_layer`.
+
+    Both are written out as text in memory and compared line by line, so ANY
+    difference (values, metadata, specs) shows up. Returns the differing lines
+    as a unified diff - an empty list means the round trip is exact.
+    """
+    converted_layer = Sdf.Layer.OpenAsAnonymous(str(converted_path))
+    if not converted_layer:
+        return [f"Cannot read the converted file: {converted_path}"]
+    original = source_layer.ExportToString().splitlines()
+    converted = converted_layer.ExportToString().splitlines()
+    if original == converted:
+        return []
+    return list(difflib.unified_diff(original, converted, "original", "converted", lineterm=""))
+
+
+def find_users(scan_paths):
+    """
+    Which layers point to which file?
+
+    Returns a dict: file path -> list of (layer file, authored path) for every
+    sublayer, reference and payload in the layers found in `scan_paths`.
+    """
+    users = {}
+    for layer_file in collect_usd_files(scan_paths):
+        try:
+            layer = Sdf.Layer.FindOrOpen(str(layer_file))
+        except Tf.ErrorException:
+            layer = None  # Unparseable file - it can't point anywhere
+        if not layer:
+            continue
+        for kind, asset_path, _ in iter_layer_asset_paths(layer):
+            if kind == "asset":
+                continue  # Textures, MDL files, ...
+            resolved_path = resolve_layer_asset_path(layer, asset_path)
+            if resolved_path:
+                users.setdefault(os.path.normpath(resolved_path), []).append((layer_file, asset_path))
+    return users
+
+
+def convert_file(file_path, in_place=False, dry_run=False, users=None):
+    """
+    Convert the text file `file_path` to crate.
+
+    Writes NAME.usdc next to it - or, with in_place=True, replaces .usd files
+    by their crate version under the same name. The crate file is first written under a temporary
+    name and only takes its final name after the round-trip comparison
+    passed, so a failed conversion never leaves a broken file behind.
+
+    `users` (see find_users()) lists the layers that point to the file, so
+    they can be printed as "references to update". Returns True on success.
+    """
+    file_path = Path(file_path).resolve()
+    # Only .usd files can hold crate under the same name - a .usda file can only hold text
+    in_place = in_place and file_path.suffix.lower() == ".usd"
+    target = file_path if in_place else file_path.with_suffix(".usdc")
+    if not in_place and target.exists():
+        print(f"  ✗ {file_path.name}: {target.name} already exists - not overwritten")
+        return False
+    if dry_run:
+        print(f"  Would convert {file_path.name} -> {target.name}")
+        return True
+
+    try:
+        source_layer = Sdf.Layer.FindOrOpen(str(file_path))
+    except Tf.ErrorException:
+        source_layer = None
+    if not source_layer:
+        print(f"  ✗ Cannot open {file_path}")
+        return False
+
+    source_size = file_path.stat().st_size
+    temp_path = target.with_name(f"{target.stem}.converting{target.suffix}")
+    if not source_layer.Export(str(temp_path), args={"format": "usdc"}):
+        print(f"  ✗ Export failed: {file_path}")
+        return False
+    differences = compare_round_trip(source_layer, temp_path)
+    if differences:
+        temp_path.unlink()
+        print(f"  ✗ {file_path.name}: round trip is not exact - nothing written. First differences:")
+        for line in differences[:20]:
+            print(f"      {line}")
+        return False
+    os.replace(temp_path, target)
+
+    print(f"  ✓ {file_path.name} ({format_size(source_size)}) -> "
+          f"{target.name} ({format_size(target.stat().st_size)}), round trip verified")
+    if not in_place:
+        for layer_file, asset_path in (users or {}).get(os.path.normpath(str(file_path)), []):
+            print(f"    Update @{asset_path}@ in {os.path.relpath(layer_file)} to point to {target.name}")
+    return True
+
+
+def main():
+    """
+    Main function - entry point when script is run from command line.
+
+    Sub-commands:
+    - report [PATH ...]:  formats, sizes and open + read time/memory in both formats
+    - convert [PATH ...]: convert big text files to crate (with round-trip check)
+    """
+    if len(sys.argv) == 3 and sys.argv[1] == "_measure":
+        # Internal: one measurement in a fresh process (see run_measurement()) -
+        # handled before argparse, so it is not listed in --help
+        print(json.dumps(measure_once(sys.argv[2])))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Report USD file formats (text/crate) and convert text to crate.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_common_arguments(command_parser):
+        command_parser.add_argument("paths", nargs="*", metavar="PATH",
+                                    help="Files/folders to look at (default: root file, 020_LYR_USD, 010_ASS_USD)")
+        command_parser.add_argument("--min-size", type=float, default=DEFAULT_MIN_SIZE_MB, metavar="MB",
+                                    help=f"Text files of at least MB megabytes should be crate "
+                                         f"(default: {DEFAULT_MIN_SIZE_MB:g})")
+
+    report_parser = commands.add_parser("report", help="Formats, sizes and open + read time/memory in both formats")
+    add_common_arguments(report_parser)
+    report_parser.add_argument("--no-measure", action="store_true",
+                               help="Only list formats and sizes (fast)")
+    report_parser.add_argument("--repeat", type=int, default=3, metavar="N",
+                               help="Open each file N times per format and keep the median (default: 3)")
+
+    convert_parser = commands.add_parser("convert", help="Convert big text files to crate")
+    add_common_arguments(convert_parser)
+    convert_parser.add_argument("--in-place", action="store_true",
+                                help="Replace .usd files by their crate version (same name, "
+                                     "references keep working); .usda files still get a NAME.usdc")
+    convert_parser.add_argument("--dry-run", action="store_true",
+                                help="Only show what would be converted")
+
+    args = parser.parse_args()
+
+    if args.min_size < 0:
+        parser.error("--min-size must not be negative")
+    paths = args.paths or DEFAULT_SCAN_PATHS
+
+    if args.command == "report":
+        if args.repeat < 1:
+            parser.error("--repeat must be at least 1")
+        report_formats(paths, args.min_size, measure=not args.no_measure, repeat=args.repeat)
+        sys.exit(0)
+
+    if args.command == "convert":
+        to_convert = [entry for entry in scan_formats(paths, args.min_size) if entry["convert"]]
+        if not to_convert:
+            print(f"✓ No text files of {args.min_size:g} MB or more - nothing to convert")
+            sys.exit(0)
+        print(f"Converting {len(to_convert)} text file(s) to crate:")
+        # Which layers point to the files, so the references to update can be listed
+        users = None if args.dry_run else find_users(DEFAULT_SCAN_PATHS + list(args.paths))
+        results = [convert_file(entry["path"], in_place=args.in_place, dry_run=args.dry_run, users=users)
+                   for entry in to_convert]
+        failed = results.count(False)
+        if failed:
+            print(f"\n✗ {failed} of {len(results)} file(s) could not be converted")
+        sys.exit(1 if failed else 0)
+
+
+# This block runs only when the script is executed directly
+# (not when imported as a module)
+if __name__ == "__main__":
+    main()
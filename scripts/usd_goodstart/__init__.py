@@ -0,0 +1,13 @@
+"""
+USD GoodStart Python tools.
+
+Subpackages:
+- usd_goodstart.validate: asset/scene validation (used by the scripts in this folder)
+
+The package lives in the scripts/ folder. Scripts in that folder can import it
+directly; other tools add the folder to the import path first:
+
+    import sys
+    sys.path.insert(0, "path/to/USD_GoodStart/scripts")
+    from usd_goodstart.validate import validate
+"""
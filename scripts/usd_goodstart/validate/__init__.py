@@ -0,0 +1,75 @@
+"""
+USD Validation
+
+Python API of the validation scripts (validate_asset.py, validate_scene.py,
+validate_usd.py). Pipeline tools can validate in-process instead of running
+a script and parsing its output:
+
+    from usd_goodstart.validate import validate
+
+    report = validate("GoodStart_ROOT.usda")
+    print(report.passed, report.errors, report.warnings)
+
+Modules:
+- core:       validate_asset(), validate_scene(), validate_file(), validate()
+- rules:      the rule engine and the built-in rules (add your own with @register_rule)
+- report:     ValidationReport, issue codes, JSON/JUnit output
+- resolution: asset path resolution and the reference cache
+- asset_files: texture/MDL file checks (folder listing cache, UDIM tiles)
+- layer_format: text (.usda) vs. crate (.usdc) detection
+- geometry:   mesh topology checks with NumPy (optional)
+- extents:    extent/extentsHint computation with a shared BBoxCache
+- opinion_layers: dedicated layers written by the fix-up scripts, added as first sublayer
+- memory:     current and peak memory use of the process (--payload-memory-limit, measurements)
+- profiling:  per-rule timings, counters and Chrome traces (--profile)
+- probes:     concurrent file system checks with a timeout (network storage)
+- fast_scan:  layer-only scan (--fast)
+- cache:      incremental validation (--cache)
+- watch:      validate again whenever a layer is saved (--watch)
+- batch:      many files in one run (--tree, --jobs)
+- cli:        command-line options shared by the scripts
+"""
+
+from .report import (
+    ISSUE_CODES,
+    REPORT_FORMATS,
+    ValidationReport,
+    human_output_for,
+    print_findings,
+    write_reports,
+)
+from .rules import RULES, Rule, ValidationContext, register_rule, run_rules
+from .core import check_stage, detect_kind, open_stage, validate, validate_asset, validate_file, validate_scene
+from .fast_scan import fast_scan_file
+from .cache import DEFAULT_CACHE_DIR, file_content_hash
+from .batch import collect_usd_files, validate_tree
+from .probes import configure_probes
+from .watch import watch_file
+
+__all__ = [
+    "DEFAULT_CACHE_DIR",
+    "ISSUE_CODES",
+    "REPORT_FORMATS",
+    "RULES",
+    "Rule",
+    "ValidationContext",
+    "ValidationReport",
+    "check_stage",
+    "collect_usd_files",
+    "configure_probes",
+    "detect_kind",
+    "fast_scan_file",
+    "file_content_hash",
+    "human_output_for",
+    "open_stage",
+    "print_findings",
+    "register_rule",
+    "run_rules",
+    "validate",
+    "validate_asset",
+    "validate_file",
+    "validate_scene",
+    "validate_tree",
+    "watch_file",
+    "write_reports",
+]
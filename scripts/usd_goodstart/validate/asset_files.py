@@ -0,0 +1,246 @@
+"""
+Asset File Checks (textures, MDL files, ...)
+
+Asset-valued attributes point to files that the stage never opens itself:
+
+    asset inputs:file = @../030_TEX/wood_basecolor.png@
+    asset inputs:file = @../030_TEX/wood_basecolor.<UDIM>.png@   (UDIM tiles)
+    uniform asset info:mdl:sourceAsset = @OmniPBR.mdl@           (MDL material)
+
+A texture-heavy set has thousands of them, mostly pointing into a few folders.
+Asking the file system about every single file (os.path.exists) is slow,
+especially on network drives. So:
+- every unique (layer, path) pair is checked only once
+- each folder is LISTED once (os.scandir) and every file in it is looked up in
+  that listing - one file system call per folder instead of one per file
+- a UDIM path matches all its tiles with a single listing
+- the folders are listed concurrently (see probes.py)
+"""
+
+# Standard library imports
+import os       # For listing folders
+import re       # For matching UDIM tile numbers
+from pathlib import Path  # Modern Python path handling
+
+from pxr import Sdf, Ar
+# Sdf: Scene Description Foundation - anchors paths to the layer they are written in
+# Ar: Asset Resolution - finds search-path assets (e.g. @OmniPBR.mdl@)
+
+from .probes import TIMED_OUT, run_probes
+
+
+# Placeholder for the tile number in UDIM texture paths (wood.<UDIM>.png -> wood.1001.png)
+UDIM_TOKEN = "<UDIM>"
+
+# Attribute that points a material to its MDL file (Omniverse materials)
+MDL_SOURCE_ATTRIBUTE = "info:mdl:sourceAsset"
+
+# File extensions reported as textures (they belong in 030_TEX)
+TEXTURE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".exr", ".hdr", ".tif", ".tiff",
+                      ".tga", ".bmp", ".tx", ".dds", ".ktx")
+
+# Folder names or files that mark the top folder of a project (see find_project_root())
+PROJECT_ROOT_MARKERS = (".git",)
+PROJECT_ROOT_FILE_PATTERN = re.compile(r".*_ROOT\.usd[ac]?$")
+
+
+def _list_directory(directory):
+    """Names in `directory`, or None if it can't be listed (probe for run_probes())."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return None
+
+
+class DirectoryListingCache:
+    """
+    Remembers the file names in each folder, so every folder is read only once.
+
+    `directories_listed` counts the folders read from disk, `timed_out` holds
+    the folders whose listing took longer than the probe timeout.
+    """
+
+    def __init__(self):
+        self._listings = {}  # folder path -> set of names (None if the folder is missing)
+        self.directories_listed = 0
+        self.timed_out = set()
+
+    def prefetch(self, directories):
+        """List all `directories` that are not cached yet - concurrently."""
+        missing = {os.path.normpath(directory) for directory in directories} - self._listings.keys()
+        for directory, names in run_probes(_list_directory, sorted(missing)).items():
+            self.directories_listed += 1
+            if names == TIMED_OUT:
+                self.timed_out.add(directory)
+                names = None
+            self._listings[directory] = names
+
+    def listing(self, directory):
+        """Names of the files and folders in `directory` (None if it does not exist)."""
+        directory = os.path.normpath(directory)
+        if directory not in self._listings:
+            self.prefetch([directory])
+        return self._listings[directory]
+
+    def is_timed_out(self, file_path):
+        """True if the folder of `file_path` did not answer in time."""
+        return os.path.dirname(os.path.normpath(file_path)) in self.timed_out
+
+    def exists(self, file_path):
+        """True if `file_path` exists with exactly this spelling (upper/lower case included)."""
+        directory, name = os.path.split(os.path.normpath(file_path))
+        names = self.listing(directory)
+        return names is not None and name in names
+
+    def case_insensitive_match(self, file_path):
+        """
+        The real name of `file_path` if it only exists with different upper/lower
+        case (e.g. Wood.PNG instead of wood.png), otherwise None.
+
+        Windows and macOS find such files anyway, Linux does not - so the path
+        works on one machine and breaks on the next.
+        """
+        directory, name = os.path.split(os.path.normpath(file_path))
+        lower_name = name.lower()
+        for candidate in self.listing(directory) or ():
+            if candidate.lower() == lower_name:
+                return candidate
+        return None
+
+    def udim_tiles(self, file_path):
+        """All existing tiles of a UDIM path (…/wood.<UDIM>.png -> […/wood.1001.png, ...])."""
+        directory, name = os.path.split(os.path.normpath(file_path))
+        prefix, _, suffix = name.partition(UDIM_TOKEN)
+        tile_name = re.compile(re.escape(prefix) + r"\d{4}" + re.escape(suffix) + "$")
+        return sorted(os.path.join(directory, candidate)
+                      for candidate in self.listing(directory) or () if tile_name.match(candidate))
+
+
+def is_search_path(asset_path):
+    """
+    True for paths like @OmniPBR.mdl@ or @textures/wood.png@ - neither absolute
+    nor starting with ./ or ../. USD looks for them next to the layer first and
+    then in the resolver's search paths (for MDL: the renderer's MDL paths).
+    """
+    return not (asset_path.startswith(("./", "../", ".\\", "..\\"))
+                or os.path.isabs(asset_path) or (len(asset_path) > 1 and asset_path[1] == ":"))
+
+
+def is_remote_path(asset_path):
+    """True for URLs like omniverse://server/... - they can't be checked on disk."""
+    return "://" in asset_path
+
+
+def find_project_root(file_path, directories=None):
+    """
+    The top folder of the project `file_path` belongs to.
+
+    Walks up from the file's folder to the first folder that contains a `.git`
+    folder or a *_ROOT.usda file (like GoodStart_ROOT.usda). Falls back to the
+    file's own folder.
+    """
+    directories = directories or DirectoryListingCache()
+    start = Path(file_path).resolve().parent
+    directories.prefetch([start, *start.parents])
+    for folder in (start, *start.parents):
+        names = directories.listing(folder) or ()
+        if any(marker in names for marker in PROJECT_ROOT_MARKERS) \
+                or any(PROJECT_ROOT_FILE_PATTERN.match(name) for name in names):
+            return folder
+    return start
+
+
+class AssetFileChecker:
+    """
+    Resolves and checks asset paths (textures, MDL files, ...) - each unique
+    (anchor layer, asset path) pair only once, using a DirectoryListingCache.
+
+    `hits` and `misses` count lookups answered from memory and lookups that
+    had to do the real work.
+    """
+
+    def __init__(self, directories=None):
+        self.directories = directories or DirectoryListingCache()
+        self._entries = {}  # (anchor layer identifier, asset path) -> result dict
+        self.hits = 0
+        self.misses = 0
+
+    def check(self, anchor_layer, asset_path):
+        """
+        Check `asset_path` as authored in `anchor_layer`.
+
+        Returns a dict with:
+        - "status": "found", "missing", "case-mismatch", "search-path" (a bare
+          name like @OmniPBR.mdl@ that is not next to the layer and not in the
+          resolver's search paths - usually provided by the renderer),
+          "remote" (a URL, not checked) or "timeout" (the folder did not
+          answer within the probe timeout)
+        - "path":   the file path that was looked for (anchored to the layer)
+        - "files":  the existing files (several for a UDIM path)
+        """
+        key = (anchor_layer.identifier, asset_path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = self._check(anchor_layer, asset_path)
+        self._entries[key] = entry
+        return entry
+
+    def prefetch(self, asset_paths):
+        """
+        List the folders of all (anchor layer, asset path) pairs in one
+        concurrent batch, so the check() calls that follow need no disk access.
+        """
+        folders = set()
+        for anchor_layer, asset_path in asset_paths:
+            file_path = self._file_path(anchor_layer, asset_path)
+            if file_path:
+                folders.add(os.path.dirname(os.path.normpath(file_path)))
+        self.directories.prefetch(folders)
+
+    def _file_path(self, anchor_layer, asset_path):
+        """The file path USD looks for first (None for URLs and in-memory layers)."""
+        if is_remote_path(asset_path) or anchor_layer.anonymous:
+            return None
+        if is_search_path(asset_path):
+            # USD looks next to the layer first
+            return os.path.join(os.path.dirname(anchor_layer.realPath), asset_path)
+        return Sdf.ComputeAssetPathRelativeToLayer(anchor_layer, asset_path)
+
+    def _check(self, anchor_layer, asset_path):
+        file_path = self._file_path(anchor_layer, asset_path)
+        if file_path is None:
+            return {"status": "remote", "path": asset_path, "files": []}
+        if self.directories.is_timed_out(file_path):
+            return {"status": "timeout", "path": file_path, "files": []}
+
+        if is_search_path(asset_path):
+            if not self._find(file_path):
+                # ... and then in the resolver's search paths
+                resolved_path = str(Ar.GetResolver().Resolve(asset_path))
+                if resolved_path:
+                    return {"status": "found", "path": resolved_path, "files": [resolved_path]}
+                return {"status": "search-path", "path": asset_path, "files": []}
+
+        files = self._find(file_path)
+        if files:
+            return {"status": "found", "path": file_path, "files": files}
+        actual_name = None if UDIM_TOKEN in file_path else self.directories.case_insensitive_match(file_path)
+        if actual_name:
+            return {"status": "case-mismatch", "path": file_path, "files": [], "actual_name": actual_name}
+        return {"status": "missing", "path": file_path, "files": []}
+
+    def _find(self, file_path):
+        """Existing files for `file_path` (all tiles of a UDIM path)."""
+        if UDIM_TOKEN in file_path:
+            return self.directories.udim_tiles(file_path)
+        return [os.path.normpath(file_path)] if self.directories.exists(file_path) else []
+
+    def summary(self):
+        """One-line description of the checker statistics for reports."""
+        return (f"Asset files: {len(self._entries)} unique path(s), "
+                f"{self.directories.directories_listed} folder(s) listed")
@@ -0,0 +1,181 @@
+"""
+Batch Validation (--tree, --jobs)
+
+Validates many USD files in one run - in one process that shares parsed
+layers and resolver lookups, or spread over a pool of worker processes.
+"""
+
+# Standard library imports
+import contextlib  # For capturing printed output of worker processes
+import functools  # For passing options to worker processes
+import io       # In-memory text buffers for captured output
+import multiprocessing  # Process pool for --jobs (parallel validation)
+from pathlib import Path  # Modern Python path handling
+
+from pxr import Ar
+# Ar: Asset Resolution - its scoped cache remembers every lookup of a run
+
+from .core import validate_file
+from .probes import configure_probes, probe_settings
+from .profiling import enable_profiling, profiling_settings
+from .report import ValidationReport
+from . import resolution
+
+
+# File extensions that are treated as USD files when walking folders in --tree mode
+USD_EXTENSIONS = (".usd", ".usda", ".usdc", ".usdz")
+
+# Resolver cache that a --jobs worker process keeps open for its whole lifetime
+_worker_resolver_cache = None
+
+
+def collect_usd_files(paths):
+    """
+    Expand a list of files and folders into a sorted list of USD files.
+
+    Folders are searched recursively (so `010_ASS_USD` picks up every asset in it).
+    Hidden folders such as `.thumbs` are skipped. Each file appears only once,
+    even if it is listed directly AND found inside a listed folder.
+    """
+    found = {}
+    for path in paths:
+        path = Path(path).resolve()
+        if path.is_dir():
+            for candidate in sorted(path.rglob("*")):
+                relative_parts = candidate.relative_to(path).parts
+                if any(part.startswith(".") for part in relative_parts):
+                    continue  # Skip hidden folders/files (.thumbs, .git, ...)
+                if candidate.is_file() and candidate.suffix.lower() in USD_EXTENSIONS:
+                    found[str(candidate)] = candidate
+        else:
+            # Files are passed through even if they don't exist,
+            # so they are reported as missing instead of silently ignored
+            found[str(path)] = path
+    return sorted(found.values())
+
+
+def _init_worker(probe_config, profile_config):
+    """
+    Set up a process-pool worker for --jobs mode.
+
+    Each worker is its own Python process with its own USD library state
+    (USD stages must not be shared between threads or processes). To stay
+    "warm", each worker keeps its own layer registry and resolver cache for
+    its whole lifetime, just like a single-process batch run does.
+    `probe_config` carries the main process' probe settings (see probes.py),
+    `profile_config` its profiling settings (see profiling.py, None = off).
+    """
+    global _worker_resolver_cache
+    configure_probes(*probe_config)
+    if profile_config:
+        enable_profiling(*profile_config)
+    resolution.start_batch_session()
+    _worker_resolver_cache = Ar.ResolverScopedCache()
+    _worker_resolver_cache.__enter__()  # Stays open until the worker exits
+
+
+def _validate_file_captured(usd_file, **options):
+    """
+    Pool worker task: validate one file and capture everything it prints.
+
+    Workers run at the same time, so letting them print directly would mix
+    their reports together. Instead each report is returned as text and the
+    main process prints them one after another in the original file order.
+    """
+    output = io.StringIO()
+    report = ValidationReport(usd_file)
+    with contextlib.redirect_stdout(output):
+        try:
+            validate_file(usd_file, report=report, **options)
+        except Exception as exc:  # Keep one broken file from killing the whole run
+            report.error("validator-crash", f"Validation crashed for {usd_file}: {exc}")
+            print(f"ERROR: Validation crashed for {usd_file}: {exc}")
+    # Reports travel back to the main process as plain data
+    return output.getvalue(), report.to_dict()
+
+
+def validate_tree(paths, jobs=1, reports=None, **options):
+    """
+    Batch mode: validate many USD files in a single run.
+
+    Why? Running one script per file pays the Python + pxr import cost every time
+    and re-parses shared layers over and over. Here:
+    - one asset resolver cache is active for the whole run (Ar.ResolverScopedCache)
+    - one layer registry keeps every parsed layer alive, so a layer that is used by
+      several files (e.g. 0_CUBE.usda) is only read from disk once
+
+    With jobs > 1 the files are spread over a pool of worker processes (one USD
+    stage per worker at a time) so validation scales with the CPU cores.
+    Reports are still printed in the same, sorted file order as a serial run.
+
+    Extra keyword `options` are passed on to validate_file() for every file.
+    One ValidationReport per file is appended to `reports` if a list is given.
+
+    Returns True if every file passed (warnings are OK).
+    """
+    usd_files = collect_usd_files(paths)
+    if not usd_files:
+        print("ERROR: No USD files found in: " + ", ".join(str(p) for p in paths))
+        return False
+
+    # Never start more workers than there are files to validate
+    jobs = max(1, min(jobs, len(usd_files)))
+
+    print(f"Batch validation of {len(usd_files)} USD file(s)"
+          + (f" using {jobs} worker processes" if jobs > 1 else ""))
+
+    if reports is None:
+        reports = []
+    results = []  # List of (file, passed) tuples in validation order
+    if jobs > 1:
+        # "spawn" starts clean worker processes. Forking a process that already
+        # loaded USD (and its worker threads) is not safe.
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(processes=jobs, initializer=_init_worker, initargs=(probe_settings(), profiling_settings())) as pool:
+            # imap() hands back results in input order, even if a later file
+            # finishes first - this keeps the output deterministic
+            task = functools.partial(_validate_file_captured, **options)
+            for usd_file, (text, report_data) in zip(usd_files, pool.imap(task, usd_files)):
+                print("\n" + "=" * 70)
+                print(text, end="")
+                report = ValidationReport.from_dict(report_data)
+                reports.append(report)
+                results.append((usd_file, report.passed))
+        summary_title = f"BATCH SUMMARY ({jobs} worker processes)"
+    else:
+        resolution.start_batch_session()
+        try:
+            # The scoped cache makes the resolver remember every lookup it has done
+            # until the "with" block ends - shared assets are resolved only once
+            with Ar.ResolverScopedCache():
+                for usd_file in usd_files:
+                    print("\n" + "=" * 70)
+                    report = ValidationReport(usd_file)
+                    reports.append(report)
+                    results.append((usd_file, validate_file(usd_file, report=report, **options)))
+            reference_cache = resolution.shared_reference_cache()
+            summary_title = f"BATCH SUMMARY ({resolution.batch_layer_count()} unique layer(s) loaded"
+            if reference_cache.hits or reference_cache.misses:
+                summary_title += f", {reference_cache.summary()}"
+            asset_checker = resolution.shared_asset_checker()
+            if asset_checker.hits or asset_checker.misses:
+                summary_title += f", {asset_checker.summary()}"
+            summary_title += ")"
+        finally:
+            # Release all layers and cached lookups once the batch is done
+            resolution.end_batch_session()
+
+    # Report per-file results
+    failed = [usd_file for usd_file, passed in results if not passed]
+    print("\n" + "=" * 70)
+    print(summary_title)
+    for usd_file, passed in results:
+        marker = "✓" if passed else "✗"
+        print(f"  {marker} {usd_file}")
+
+    if failed:
+        print(f"\n✗ {len(failed)} of {len(results)} file(s) failed validation")
+    else:
+        print(f"\n✓ All {len(results)} file(s) passed validation")
+
+    return not failed
@@ -0,0 +1,204 @@
+"""
+Incremental Validation (--cache)
+
+Stores each file's validation result on disk and reuses it on the next run if
+the file, everything it depends on and the validator itself are unchanged.
+"""
+
+# Standard library imports
+import os       # For operating system operations
+import contextlib  # For capturing the validator's printed output
+import hashlib  # Content hashes of files and validator sources
+import io       # In-memory text buffer for captured output
+import json     # Result cache entries are stored as JSON
+from pathlib import Path  # Modern Python path handling
+
+from pxr import Usd, Sdf, Ar
+# Usd: Main USD API (used here for the version number)
+# Sdf: Scene Description Foundation - low-level layer and data access
+# Ar: Asset Resolution - turns authored asset paths into real file paths
+
+from . import core
+from .asset_files import UDIM_TOKEN, AssetFileChecker
+from .resolution import iter_layer_asset_paths, open_layer, resolve_layer_asset_path
+
+
+# Default folder for the incremental result cache (--cache)
+DEFAULT_CACHE_DIR = ".usd_validate_cache"
+
+# Issues that depend on this run's environment, not on the files: a slow
+# network share (probe-timeout) or the memory in use (payload-not-loaded).
+# Results with these issues are not cached - the next run checks again.
+ENVIRONMENT_ISSUE_CODES = ("probe-timeout", "payload-not-loaded")
+
+# Content hashes computed during this run: file path -> ((mtime, size), hash)
+_file_hashes = {}
+
+
+def file_content_hash(file_path):
+    """
+    SHA-256 of a file's content (hex string), or None if the file is missing.
+
+    Hashes are remembered for the rest of the run (until the file's size or
+    modification time changes), so shared layers are only read once.
+    """
+    file_path = str(file_path)
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _file_hashes.get(file_path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as stream:
+        for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+            digest.update(chunk)
+    _file_hashes[file_path] = (signature, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def collect_dependency_closure(usd_file):
+    """
+    Find every file `usd_file` depends on, at the layer level (no stage).
+
+    Returns a tuple (files, missing, layers):
+    - files:   sorted list of existing files - the file itself, all layers it pulls
+               in (sublayers, references, payloads) and asset files (textures, ...)
+    - missing: sorted list of authored paths that do not resolve right now. If one
+               of them shows up later, the result may change.
+    - layers:  the opened layers. Hold on to this list while validating, so the
+               validator's stage reuses them instead of reading the files again.
+    """
+    files = set()
+    missing = set()
+    layers = []
+    asset_checker = AssetFileChecker()  # Textures: one folder listing per folder
+    to_visit = [str(Path(usd_file).resolve())]
+    while to_visit:
+        layer_path = to_visit.pop(0)
+        if layer_path in files:
+            continue
+        files.add(layer_path)
+        layer, _ = open_layer(layer_path)
+        if not layer:
+            continue  # Unreadable layers still count as dependency (by content hash)
+        layers.append(layer)
+        for kind, asset_path, _ in iter_layer_asset_paths(layer):
+            if kind == "asset":
+                result = asset_checker.check(layer, asset_path)
+                if result["files"]:
+                    files.update(result["files"])  # Every tile of a UDIM texture
+                elif result["status"] != "remote":
+                    missing.add(result["path"])
+                continue
+            resolved_path = resolve_layer_asset_path(layer, asset_path)
+            if not resolved_path or not Path(resolved_path).exists():
+                missing.add(Sdf.ComputeAssetPathRelativeToLayer(layer, asset_path))
+            else:
+                to_visit.append(resolved_path)
+    return sorted(files), sorted(missing), layers
+
+
+def _validator_version():
+    """
+    Identify the validator for the result cache: the usd-core version plus
+    a hash of this package's source files. Editing the checks automatically
+    invalidates all cached results.
+    """
+    digest = hashlib.sha256()
+    for source_file in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(file_content_hash(source_file).encode("ascii"))
+    return "usd-{}.{}.{}/{}".format(*Usd.GetVersion(), digest.hexdigest())
+
+
+def _result_cache_file(cache_dir, usd_file, options):
+    """Path of the cache entry for `usd_file` validated with `options`."""
+    key = json.dumps({"file": str(usd_file), "options": options}, sort_keys=True)
+    return Path(cache_dir) / (hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+
+def _cached_result_is_valid(entry):
+    """True if nothing the cached result depends on has changed since."""
+    if entry.get("validator_version") != _validator_version():
+        return False
+    # Every dependency must still have exactly the same content ...
+    for dependency, content_hash in entry["dependencies"].items():
+        if file_content_hash(dependency) != content_hash:
+            return False
+    # ... and every path that was missing must still be missing
+    # (for a UDIM path: no tile may have appeared)
+    resolver = Ar.GetResolver()
+    checker = AssetFileChecker()
+    for missing_path in entry["missing"]:
+        if UDIM_TOKEN in missing_path:
+            if checker.directories.udim_tiles(missing_path):
+                return False
+        elif resolver.Resolve(missing_path):
+            return False
+    return True
+
+
+def validate_file_with_result_cache(usd_file, cache_dir, report, **options):
+    """
+    Incremental validation: reuse the last result if nothing has changed.
+
+    A result is reused when the file, every layer and asset it depends on
+    (transitively) and the validator itself are byte-for-byte the same as in the
+    run that produced it. Changing 0_CUBE.usda therefore re-validates 0_CUBE.usda
+    and every scene that uses it - and nothing else.
+
+    Results are stored as small JSON files in `cache_dir`. The structured
+    result is restored into `report` (a ValidationReport). Results with
+    ENVIRONMENT_ISSUE_CODES are not stored.
+    """
+    usd_file = Path(usd_file).resolve()
+    cache_file = _result_cache_file(cache_dir, usd_file, options)
+
+    if cache_file.exists():
+        try:
+            with report.phase("total"):
+                entry = json.loads(cache_file.read_text(encoding="utf-8"))
+                cache_hit = _cached_result_is_valid(entry)
+                if cache_hit:
+                    report.restore(entry["report_data"])
+                    report.timings = {}  # Only the time of this (cached) run counts
+                    report.profile = None  # Nothing was profiled in this run
+                    report.stats["from_cache"] = True
+            if cache_hit:
+                print(entry["report"], end="")
+                print("(unchanged since last run - result taken from cache)")
+                return report.passed
+        except (OSError, ValueError, KeyError):
+            pass  # Broken cache entry - just validate again
+
+    # Cache miss: find the dependencies, validate, and remember the result.
+    # `layers` keeps the dependency layers in memory during validation.
+    files, missing, layers = collect_dependency_closure(usd_file)
+    text = io.StringIO()
+    with contextlib.redirect_stdout(text):
+        passed = core.validate_file(usd_file, report=report, **options)
+    print(text.getvalue(), end="")
+    if any(issue["code"] in ENVIRONMENT_ISSUE_CODES for issue in report.issues):
+        return passed  # Would be replayed as "unchanged" although the next run may find something else
+
+    entry = {
+        "validator_version": _validator_version(),
+        "file": str(usd_file),
+        "options": options,
+        "dependencies": {dependency: file_content_hash(dependency) for dependency in files},
+        "missing": missing,
+        "passed": passed,
+        "report": text.getvalue(),
+        "report_data": report.to_dict(),
+    }
+    # Write to a temporary file first, then rename: parallel workers
+    # (--jobs) never see a half-written cache entry
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    temp_file.write_text(json.dumps(entry, indent=1), encoding="utf-8")
+    os.replace(temp_file, cache_file)
+    del layers
+    return passed
@@ -0,0 +1,142 @@
+"""
+Command-Line Helpers
+
+Options shared by validate_asset.py, validate_scene.py and validate_usd.py,
+so all three scripts spell and check them the same way.
+"""
+
+from pxr import Sdf
+# Sdf: Scene Description Foundation - used to check --mask prim paths
+
+from .probes import DEFAULT_PROBE_TIMEOUT, DEFAULT_PROBE_WORKERS, configure_probes
+from .profiling import enable_profiling, print_profile, write_trace
+from .report import REPORT_FORMATS
+from .watch import DEFAULT_WATCH_INTERVAL
+
+
+def add_stage_loading_arguments(parser):
+    """Add --load-none, --mask, --all-instances, --all-variants and the payload loading options."""
+    parser.add_argument("--load-none", action="store_true",
+                        help="Open stages without loading payloads (Usd.Stage.LoadNone); "
+                             "payload files are still checked on disk")
+    parser.add_argument("--mask", action="append", metavar="PRIM_PATH",
+                        help="Only compose and validate this prim and its children "
+                             "(e.g. /World/Geo_Shader_Ball). Can be given several times.")
+    parser.add_argument("--all-instances", action="store_true",
+                        help="Validate the subtree of every instance, not just one "
+                             "instance per prototype (slower on heavily instanced scenes)")
+    parser.add_argument("--all-variants", action="store_true",
+                        help="Also validate the variants that are not selected - each variant once, "
+                             "on the same stage (references, payloads and textures inside variants)")
+    parser.add_argument("--payloads-one-at-a-time", action="store_true",
+                        help="Open without payloads, then load, validate and unload each payload on its "
+                             "own - keeps peak memory at about the stage plus its biggest payload")
+    parser.add_argument("--payload-memory-limit", type=float, metavar="MB",
+                        help="With --payloads-one-at-a-time: load no more payloads while this process uses "
+                             "more than MB megabytes (those are only checked on disk)")
+
+
+def check_stage_loading_arguments(parser, args):
+    """Reject --mask values that are not absolute prim paths, and a --payload-memory-limit on its own."""
+    for prim_path in args.mask or ():
+        if not Sdf.Path.IsValidPathString(prim_path) or not Sdf.Path(prim_path).IsAbsolutePath() \
+                or not Sdf.Path(prim_path).IsPrimPath():
+            parser.error(f"--mask needs an absolute prim path like /World/Geo, got: {prim_path}")
+    if getattr(args, "payload_memory_limit", None) is not None:  # Not every script has the payload options
+        if not args.payloads_one_at_a_time:
+            parser.error("--payload-memory-limit needs --payloads-one-at-a-time")
+        if args.payload_memory_limit <= 0:
+            parser.error("--payload-memory-limit must be a positive number of MB")
+
+
+def add_geometry_arguments(parser):
+    """Add --max-faces and --max-points (geometry budget of an asset, see MeshGeometryRule)."""
+    parser.add_argument("--max-faces", type=int, metavar="N",
+                        help="Warn if the meshes of an asset have more than N faces together")
+    parser.add_argument("--max-points", type=int, metavar="N",
+                        help="Warn if the meshes of an asset have more than N points together")
+
+
+def check_geometry_arguments(parser, args):
+    """Reject a geometry budget that is not a positive number."""
+    for option, value in (("--max-faces", args.max_faces), ("--max-points", args.max_points)):
+        if value is not None and value < 1:
+            parser.error(f"{option} must be a positive number")
+
+
+def add_report_arguments(parser):
+    """Add --format and --output (machine-readable reports)."""
+    parser.add_argument("--format", choices=REPORT_FORMATS, default="text",
+                        help="Report format: human-readable text (default), json or junit")
+    parser.add_argument("--output", "-o", metavar="FILE",
+                        help="Write the json/junit report to FILE instead of stdout")
+
+
+def add_probe_arguments(parser):
+    """Add --probe-workers and --probe-timeout (file checks on network storage)."""
+    parser.add_argument("--probe-workers", type=int, default=DEFAULT_PROBE_WORKERS, metavar="N",
+                        help="Check up to N files/folders at the same time - helps on network "
+                             f"storage (default: {DEFAULT_PROBE_WORKERS}, 1 = one at a time)")
+    parser.add_argument("--probe-timeout", type=float, default=DEFAULT_PROBE_TIMEOUT, metavar="SECONDS",
+                        help="Give up on a file check after SECONDS and report it as timed out "
+                             f"(default: {DEFAULT_PROBE_TIMEOUT:g}, 0 = wait as long as it takes)")
+
+
+def apply_probe_arguments(parser, args):
+    """Check --probe-workers/--probe-timeout and apply them (see probes.py)."""
+    if args.probe_workers < 1:
+        parser.error("--probe-workers must be at least 1")
+    if args.probe_timeout < 0:
+        parser.error("--probe-timeout must not be negative")
+    configure_probes(workers=args.probe_workers, timeout=args.probe_timeout)
+
+
+def add_watch_arguments(parser):
+    """Add --watch and --watch-interval (validate again on every save, see watch.py)."""
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep the file open and validate again whenever one of its layers "
+                             "is saved - only the changed layers are reloaded (stop with Ctrl+C)")
+    parser.add_argument("--watch-interval", type=float, default=DEFAULT_WATCH_INTERVAL, metavar="SECONDS",
+                        help=f"With --watch: look for saved layers every SECONDS (default: {DEFAULT_WATCH_INTERVAL:g})")
+
+
+def check_watch_arguments(parser, args):
+    """Reject a --watch-interval that is not positive, and json/junit reports on stdout."""
+    if args.watch_interval <= 0:
+        parser.error("--watch-interval must be a positive number of seconds")
+    if args.watch and args.format != "text" and not args.output:
+        # A new report is written after every run - that needs a file to overwrite
+        parser.error("--watch with --format json/junit needs --output FILE")
+
+
+def add_profile_arguments(parser):
+    """Add --profile, --profile-trace and --usd-trace (where does the validation time go?)."""
+    parser.add_argument("--profile", action="store_true",
+                        help="Print where the time went: per phase, per rule (calls and seconds), "
+                             "prims visited, layers opened and cache hit rates")
+    parser.add_argument("--profile-trace", metavar="FILE",
+                        help="Also write a Chrome trace (JSON) of every phase and rule to FILE - "
+                             "open it in chrome://tracing or ui.perfetto.dev (implies --profile)")
+    parser.add_argument("--usd-trace", action="store_true",
+                        help="With --profile-trace: add USD's own Trace events of each stage open "
+                             "(layer reads, composition) to the trace")
+
+
+def apply_profile_arguments(parser, args):
+    """Check --profile/--profile-trace/--usd-trace and switch profiling on (see profiling.py)."""
+    if args.usd_trace and not args.profile_trace:
+        parser.error("--usd-trace needs --profile-trace FILE")
+    if args.profile_trace:
+        args.profile = True
+    if args.profile:
+        enable_profiling(trace=bool(args.profile_trace), usd_trace=args.usd_trace)
+
+
+def report_profile(args, reports):
+    """Print the profile of `reports` and write the trace file (if --profile was given)."""
+    if not args.profile:
+        return
+    print_profile(reports)
+    if args.profile_trace:
+        write_trace(reports, args.profile_trace)
+        print(f"\nChrome trace written to {args.profile_trace} (open in chrome://tracing or ui.perfetto.dev)")
@@ -0,0 +1,371 @@
+"""
+Asset and Scene Validation
+
+The validators behind validate_asset.py, validate_scene.py and validate_usd.py:
+- validate_asset(): one reusable asset file (geometry, materials, ...)
+- validate_scene(): a root file that stacks layers (e.g. GoodStart_ROOT.usda)
+- validate_file():  auto-detects which of the two a file is
+- validate():       like validate_file(), but returns the ValidationReport
+- check_stage():    the rules on an already opened stage (also used by --watch)
+
+Each of them opens the file as a stage ONCE and hands it to the rule engine
+(see rules.py), which runs every check in a single traversal of the prims.
+"""
+
+# Standard library imports
+from pathlib import Path  # Modern Python path handling
+
+from pxr import Usd, Sdf, Tf
+# Usd: Main USD API for stages, prims, and high-level operations
+# Sdf: Scene Description Foundation - low-level layer and data access
+# Tf: Tools Foundation - USD's error type (raised for unparseable files)
+
+from .profiling import active_profiler, profiled_file, usd_trace_scope
+from .report import ValidationReport, print_findings
+from .resolution import open_layer, retain_layers, shared_asset_checker, shared_reference_cache
+from .rules import ValidationContext, run_rules
+from .fast_scan import fast_scan_file
+
+
+def open_stage(file_path, load_none=False, mask=None):
+    """
+    Open `file_path` as a Stage, optionally without payloads and/or masked.
+
+    - load_none=True: open with Usd.Stage.LoadNone. Payloads (usually the heavy
+      geometry of a set) are NOT loaded, so memory and open time stay small.
+      The payload files are still checked by the payload rule (see rules.py).
+    - mask: list of prim paths (e.g. ["/World/Geo_Shader_Ball"]). Only these
+      prims, their ancestors and their descendants are composed
+      (Usd.StagePopulationMask) - the rest of the scene is never looked at.
+    """
+    load = Usd.Stage.LoadNone if load_none else Usd.Stage.LoadAll
+    if mask:
+        population_mask = Usd.StagePopulationMask()
+        for prim_path in mask:
+            population_mask.Add(Sdf.Path(prim_path))
+        return Usd.Stage.OpenMasked(str(file_path), population_mask, load)
+    return Usd.Stage.Open(str(file_path), load)
+
+
+def check_mask(stage, mask, report):
+    """Warn about mask paths that match no prim (probably a typo)."""
+    for prim_path in mask or ():
+        if not stage.GetPrimAtPath(prim_path):
+            report.warning("mask-not-found", f"Mask path matches no prim: {prim_path}", prim=prim_path)
+
+
+def check_stage(stage, kind, report, open_sublayer_stages=False, load_none=False, mask=None,
+                all_instances=False, subtrees=None, single_prims=(), layer_paths_cache=None,
+                all_variants=False, one_payload_at_a_time=False, payload_memory_limit=None,
+                max_faces=None, max_points=None, mesh_counts_cache=None):
+    """
+    Run all rules for `kind` ("asset" or "scene") on an already opened `stage`.
+
+    Findings go into `report`. `subtrees` and `single_prims` limit the prim
+    walk to part of the stage (see traverse_stage() in rules.py) - the
+    layer-level checks always run. `layer_paths_cache` (a dict) keeps the
+    paths read from each layer for the next call (see --watch).
+    all_variants=True also checks the variants that are not selected
+    (see VariantCoverageRule in rules.py). one_payload_at_a_time=True loads the
+    payloads of a stage opened without them one by one, under an optional
+    payload_memory_limit in MB (see PayloadLoadingRule in rules.py).
+    max_faces/max_points are the geometry budget of an asset (see MeshGeometryRule);
+    `mesh_counts_cache` (a dict) keeps the per-prim mesh counts for the next
+    call, so a partial run still checks the budget of the whole stage.
+    Returns the ValidationContext, which holds the counters for the summary.
+    """
+    retain_layers(stage)
+    check_mask(stage, mask, report)
+    load_none = load_none or one_payload_at_a_time  # Then the stage was opened without payloads
+
+    # Run every registered rule in a single traversal. Batch runs share one
+    # reference cache, so each referenced file is checked once for all files.
+    context = ValidationContext(stage, report, kind, open_sublayer_stages=open_sublayer_stages,
+                                load_none=load_none, mask=mask, reference_cache=shared_reference_cache(),
+                                all_instances=all_instances, asset_checker=shared_asset_checker(),
+                                subtrees=subtrees, single_prims=single_prims,
+                                layer_paths_cache=layer_paths_cache, all_variants=all_variants,
+                                one_payload_at_a_time=one_payload_at_a_time,
+                                payload_memory_limit=payload_memory_limit,
+                                max_faces=max_faces, max_points=max_points,
+                                mesh_counts_cache=mesh_counts_cache)
+    profiler = active_profiler()
+    counters_before = _cache_counters(context)
+    run_rules(context)
+
+    # Batch runs share the caches - count only the lookups of this file
+    context.cache_counters = {name: value - counters_before[name]
+                              for name, value in _cache_counters(context).items()}
+    report.stats.update(prims=context.prim_count, payloads=context.payload_count,
+                        prototypes=context.prototype_count,
+                        pruned_instances=context.pruned_instance_count,
+                        reference_cache_hits=context.cache_counters["reference_cache_hits"],
+                        reference_cache_misses=context.cache_counters["reference_cache_misses"])
+    if profiler:
+        counters = dict(context.cache_counters)
+        counters["prims_visited"] = (context.prim_count + report.stats.get("variant_prims", 0)
+                                     + report.stats.get("payload_prims", 0))
+        profiler.count_stage(report, stage, counters)
+    return context
+
+
+def _cache_counters(context):
+    """Hits and misses of the reference cache and the asset file checker so far."""
+    return {"reference_cache_hits": context.reference_cache.hits,
+            "reference_cache_misses": context.reference_cache.misses,
+            "asset_cache_hits": context.asset_checker.hits,
+            "asset_cache_misses": context.asset_checker.misses}
+
+
+def _cache_summary(context, kind):
+    """
+    One line per shared cache with the lookups of THIS file (batch runs share
+    the caches - their own totals are printed once, in the batch summary).
+    """
+    counters = context.cache_counters
+    lines = []
+    if kind == "asset":
+        lines.append(f"Reference cache: {counters['reference_cache_hits']} hit(s), "
+                     f"{counters['reference_cache_misses']} miss(es)")
+    lines.append(f"Asset files: {counters['asset_cache_misses']} path(s) checked, "
+                 f"{counters['asset_cache_hits']} taken from the cache")
+    return "\n".join(lines)
+
+
+def _validate_stage(kind, usd_file, open_sublayer_stages=False, load_none=False, mask=None,
+                    all_instances=False, all_variants=False, one_payload_at_a_time=False,
+                    payload_memory_limit=None, max_faces=None, max_points=None, report=None):
+    """Open `usd_file` once and run all rules for `kind` ("asset" or "scene") on it."""
+    # Convert to absolute path and resolve any ".." or "." in the path
+    usd_file = Path(usd_file).resolve()
+
+    # Collect problems (with issue codes and timings) in a report
+    if report is None:
+        report = ValidationReport(usd_file)
+    report.kind = kind
+    title = "Asset" if kind == "asset" else "Root"
+
+    # Check if file exists
+    if not usd_file.exists():
+        report.error("file-not-found", f"{title} file not found: {usd_file}")
+        print(f"ERROR: {title} file not found: {usd_file}")
+        return False
+
+    print(f"Validating {kind}: {usd_file}")
+
+    # Open the USD file as a Stage - ONCE. Every rule works on this stage.
+    # (load_none/mask make USD load only what we asked about, see open_stage())
+    # Payloads loaded one at a time are loaded later, by PayloadLoadingRule
+    # (--profile: counts the layers this file reads, see profiling.py)
+    load_none = load_none or one_payload_at_a_time
+    with profiled_file(report):
+        with report.phase("open"), usd_trace_scope(report):
+            try:
+                stage = open_stage(usd_file, load_none=load_none, mask=mask)
+            except Tf.ErrorException:
+                stage = None  # Syntax error in the file itself
+        if not stage:
+            report.error("open-failed", f"Failed to open {title.lower()} file: {usd_file}")
+            print(f"ERROR: Failed to open {title.lower()} file: {usd_file}")
+            return False
+        context = check_stage(stage, kind, report, open_sublayer_stages=open_sublayer_stages,
+                              load_none=load_none, mask=mask, all_instances=all_instances,
+                              all_variants=all_variants, one_payload_at_a_time=one_payload_at_a_time,
+                              payload_memory_limit=payload_memory_limit,
+                              max_faces=max_faces, max_points=max_points)
+
+    if kind == "asset":
+        print(f"Found {context.prim_count} prims"
+              + (f", {context.payload_count} payload(s)" if context.payload_count else ""))
+    else:
+        print(f"\nScene contains {context.prim_count} prims")
+        if load_none and not one_payload_at_a_time:
+            print(f"Payloads not loaded - {context.payload_count} payload(s) checked on disk")
+    print(_cache_summary(context, kind))
+    if context.pruned_instance_count:
+        print(f"Instancing: {context.prototype_count} prototype(s) validated once, "
+              f"{context.pruned_instance_count} repeated instance(s) skipped")
+    if context.invalid_prim_count > 0:
+        print(f"  ⚠ {context.invalid_prim_count} invalid prim(s) found")
+
+    # Report results
+    print_findings(report, f"{kind.capitalize()} validation")
+    return report.passed
+
+
+def validate_asset(asset_path, load_none=False, mask=None, all_instances=False, all_variants=False,
+                   one_payload_at_a_time=False, payload_memory_limit=None, max_faces=None, max_points=None,
+                   report=None):
+    """
+    Validate a USD asset file.
+
+    What is a USD Asset?
+    - A USD asset is typically a single USD file containing geometry, materials, or other 3D content
+    - Assets are reusable building blocks that can be referenced by scenes
+    - Examples: A character model, a prop, a material definition
+
+    The asset rules check that all prims are valid, that referenced and payload
+    files exist and can be opened, that sublayers resolve, that no absolute file
+    paths are used, that a default prim is set and that the meshes have valid
+    topology (see rules.py). max_faces/max_points set a geometry budget: the
+    faces/points of all meshes together.
+
+    For big files, load_none=True skips loading payloads and `mask` (a list of
+    prim paths) limits validation to those prims (see open_stage()).
+    Repeated instances are validated once per prototype unless all_instances=True
+    (see traverse_stage() in rules.py). all_variants=True also validates the
+    variants that are not selected (see VariantCoverageRule in rules.py).
+    one_payload_at_a_time=True validates inside the payloads too, loading one
+    at a time - with payload_memory_limit (MB) no more payloads are loaded
+    while the process uses more memory than that (see PayloadLoadingRule).
+
+    All findings are also recorded in `report` (a ValidationReport) if one is given.
+    Returns True if validation passed (warnings are OK).
+    """
+    return _validate_stage("asset", asset_path, load_none=load_none, mask=mask,
+                           all_instances=all_instances, all_variants=all_variants,
+                           one_payload_at_a_time=one_payload_at_a_time,
+                           payload_memory_limit=payload_memory_limit,
+                           max_faces=max_faces, max_points=max_points, report=report)
+
+
+def validate_scene(root_file, open_sublayer_stages=False, load_none=False, mask=None,
+                   all_instances=False, all_variants=False, one_payload_at_a_time=False,
+                   payload_memory_limit=None, report=None):
+    """
+    Validate entire USD scene.
+
+    What is a USD Scene?
+    - A scene is typically the "root" or "master" USD file that combines multiple layers
+    - Scenes use "sublayers" to stack multiple USD files together
+    - The root file references layer files (like AssetImport_LYR.usda) which then reference assets
+    - Example: GoodStart_ROOT.usda combines multiple layer files to build the final scene
+
+    The scene rules check that all sublayers exist and can be opened, report
+    composition errors, check the layer ordering (asset imports at bottom), that
+    all prims are valid and that a default prim is set (see rules.py).
+
+    The scene is composed only ONCE. Set open_sublayer_stages=True to
+    additionally open every sublayer as its own stage (slower - one extra
+    composition per sublayer). For production-size sets, load_none=True opens
+    the scene without loading payloads (their files are still checked) and
+    `mask` limits composition and validation to those prim paths. Repeated
+    instances are validated once per prototype unless all_instances=True, and
+    all_variants=True also validates the variants that are not selected.
+    one_payload_at_a_time=True opens the scene without payloads and then
+    loads, validates and unloads them one by one, so peak memory stays at
+    about the scene plus its biggest payload (payload_memory_limit in MB:
+    stop loading payloads above that).
+
+    All findings are also recorded in `report` (a ValidationReport) if one is given.
+    Returns True if validation passed (warnings are OK).
+    """
+    return _validate_stage("scene", root_file, open_sublayer_stages=open_sublayer_stages,
+                           load_none=load_none, mask=mask, all_instances=all_instances,
+                           all_variants=all_variants, one_payload_at_a_time=one_payload_at_a_time,
+                           payload_memory_limit=payload_memory_limit, report=report)
+
+
+def detect_kind(usd_file, root_layer):
+    """
+    Guess whether `usd_file` (already opened as `root_layer`) is an "asset" or a "scene".
+
+    Heuristic 1: Number of sublayers
+    Scenes typically have multiple sublayers (e.g., 3-4+ layer files)
+    Assets typically have 0-1 sublayers (or none at all)
+
+    Heuristic 2: Filename pattern
+    Files with "ROOT" or "root" in the name are usually scenes
+    Examples: GoodStart_ROOT.usda, scene_root.usd
+    """
+    if len(root_layer.subLayerPaths) > 2 or "root" in Path(usd_file).name.lower():
+        return "scene"
+    return "asset"
+
+
+def validate_file(usd_file, open_sublayer_stages=False, fast=False, cache_dir=None,
+                  load_none=False, mask=None, all_instances=False, all_variants=False,
+                  one_payload_at_a_time=False, payload_memory_limit=None, max_faces=None, max_points=None,
+                  report=None):
+    """
+    Auto-detect whether `usd_file` is an asset or a scene and validate it.
+
+    With fast=True the file is only checked at the layer level (see
+    fast_scan_file()) - no stage is composed, so no auto-detection is needed.
+
+    load_none and mask are passed on to the asset/scene validator (see
+    open_stage()): skip loading payloads, and only validate the masked prims.
+    all_instances=True walks every instance instead of one per prototype,
+    all_variants=True also checks the variants that are not selected, and
+    one_payload_at_a_time=True loads and validates the payloads one by one
+    (with an optional payload_memory_limit in MB). max_faces/max_points are
+    the geometry budget of assets (scenes have none).
+
+    With a `cache_dir` the result is stored there and reused on the next run if
+    neither the file nor anything it depends on has changed
+    (see validate_file_with_result_cache()).
+
+    Issues, timings and statistics are recorded in `report` (a ValidationReport)
+    if one is given - that is what --format json/junit writes out.
+
+    Returns True if validation passed (warnings are OK), False if there were errors
+    or the file could not be opened.
+    """
+    usd_file = Path(usd_file)
+    if report is None:
+        report = ValidationReport(usd_file.resolve())
+
+    # Options of the asset/scene validators
+    stage_options = {"load_none": load_none, "mask": mask, "all_instances": all_instances,
+                     "all_variants": all_variants, "one_payload_at_a_time": one_payload_at_a_time,
+                     "payload_memory_limit": payload_memory_limit,
+                     "max_faces": max_faces, "max_points": max_points}
+    if cache_dir is not None:
+        from .cache import validate_file_with_result_cache  # cache.py calls back into this function
+        return validate_file_with_result_cache(usd_file, cache_dir, report, fast=fast,
+                                               open_sublayer_stages=open_sublayer_stages, **stage_options)
+
+    with report.phase("total"), profiled_file(report):
+        return _detect_and_validate(usd_file, open_sublayer_stages, fast, report, **stage_options)
+
+
+def _detect_and_validate(usd_file, open_sublayer_stages, fast, report, **stage_options):
+    """Pick the right validator for `usd_file` (see validate_file())."""
+    if fast:
+        return fast_scan_file(usd_file, report=report)
+
+    # Read ONLY the file itself as a layer to examine its structure.
+    # This does not compose the scene (no sublayers or references are loaded).
+    # We hold on to the layer while validating, so the validator's stage reuses
+    # it instead of parsing the file a second time.
+    with report.phase("open"):
+        root_layer, open_error = open_layer(str(usd_file.resolve()))
+    if not root_layer:
+        # Can't open file
+        report.error("parse-error", open_error, layer=usd_file)
+        print(f"ERROR: Cannot open USD file: {usd_file}")
+        return False
+
+    # The geometry budget is per asset - scenes don't have one
+    geometry_budget = {"max_faces": stage_options.pop("max_faces", None),
+                       "max_points": stage_options.pop("max_points", None)}
+    if detect_kind(usd_file, root_layer) == "scene":
+        # Scenes have more complex validation (layer ordering, etc.)
+        return validate_scene(usd_file, open_sublayer_stages=open_sublayer_stages, report=report,
+                              **stage_options)
+    return validate_asset(usd_file, report=report, **stage_options, **geometry_budget)
+
+
+def validate(usd_file, **options):
+    """
+    Validate `usd_file` (auto-detected, see validate_file()) and return its ValidationReport.
+
+    The Python API for pipeline tools - no need to run a script and parse its output:
+
+        report = validate("GoodStart_ROOT.usda", load_none=True)
+        if not report.passed:
+            for issue in report.issues: ...
+    """
+    report = ValidationReport(Path(usd_file).resolve())
+    validate_file(usd_file, report=report, **options)
+    return report
@@ -0,0 +1,93 @@
+"""
+Extents and Extents Hints
+
+Every boundable prim (Mesh, Sphere, Points, ...) should carry an `extent`:
+the min/max corners of its geometry. Renderers and viewers use it to cull
+and frame prims without reading the geometry. If it is missing they compute
+it at load time; if it is stale (the points changed, the extent did not) they
+cull or frame the prim wrongly.
+
+Models (component/assembly prims) can also carry an `extentsHint`: the bounds
+of their whole subtree, per purpose (default, render, proxy, guide). A viewer
+can then show an unloaded asset as a box without composing it.
+
+Checking the extent of ONE prim means computing it from its geometry
+(UsdGeom.Boundable.ComputeExtentFromPlugins). The bounds of a model's
+subtree come from a UsdGeom.BBoxCache: ONE cache is shared by all models
+of a stage, so a subtree that is part of several models (an asset inside an
+assembly) is only added up once.
+
+Used by ExtentRule (rules.py) and by the author_extents.py script.
+"""
+
+from pxr import Usd, UsdGeom, Gf
+# Usd: Main USD API (time codes)
+# UsdGeom: Geometry schemas - Boundable, ModelAPI and the BBoxCache
+# Gf: Graphics Foundation - vectors and ranges
+
+
+# Extents may differ by this much (relative to the size of the prim) - writing
+# and reading 32-bit floats is not exact
+EXTENT_TOLERANCE = 1e-4
+
+# Extents are compared at this time: the default value, or the first time sample
+EXTENT_TIME = Usd.TimeCode.EarliestTime()
+
+
+def new_bbox_cache(time=EXTENT_TIME):
+    """
+    A BBoxCache for all purposes that ignores authored extentsHints - the
+    hints are what is being checked, so bounds always come from the gprims.
+    """
+    purposes = [UsdGeom.Tokens.default_, UsdGeom.Tokens.render, UsdGeom.Tokens.proxy, UsdGeom.Tokens.guide]
+    return UsdGeom.BBoxCache(time, purposes, useExtentsHint=False)
+
+
+def computed_extent(prim, time=EXTENT_TIME):
+    """
+    The extent of the boundable `prim` computed from its geometry, or None if
+    USD has no extent computation for its type.
+    """
+    return UsdGeom.Boundable.ComputeExtentFromPlugins(UsdGeom.Boundable(prim), time)
+
+
+def computed_extents_hint(prim, bbox_cache):
+    """The extentsHint of the model `prim` computed with the shared `bbox_cache`."""
+    return UsdGeom.ModelAPI(prim).ComputeExtentsHint(bbox_cache)
+
+
+def bounds_differ(authored, computed):
+    """
+    True if two extents (or extentsHints - a min/max pair per purpose) are
+    not the same within EXTENT_TOLERANCE.
+    """
+    if authored is None or computed is None:
+        return authored is not computed
+    if len(authored) != len(computed):
+        return True
+    if authored == computed:
+        return False  # Exactly the same - the usual case, no need to look at each corner
+    for index in range(0, len(computed) - 1, 2):
+        low, high = Gf.Vec3d(computed[index]), Gf.Vec3d(computed[index + 1])
+        size = 0.0 if is_empty((low, high)) else (high - low).GetLength()  # Empty: e.g. a purpose without prims
+        tolerance = EXTENT_TOLERANCE * max(size, 1.0)
+        for authored_corner, computed_corner in ((authored[index], low), (authored[index + 1], high)):
+            if any(abs(authored_corner[axis] - computed_corner[axis]) > tolerance for axis in range(3)):
+                return True
+    return False
+
+
+def is_empty(extent):
+    """True for an extent whose (first) min corner is above its max corner - bounds of nothing."""
+    low, high = extent[0], extent[1]
+    return any(low[axis] > high[axis] for axis in range(3))
+
+
+def format_extent(extent):
+    """An extent as short text, e.g. "(-50, -50, -50)..(50, 50, 50)", or "(empty)"."""
+    low, high = extent[0], extent[1]
+    if is_empty(extent):
+        text = "(empty)"
+    else:
+        text = "..".join(f"({', '.join(f'{value + 0:g}' for value in corner)})" for corner in (low, high))
+    return text + (" ..." if len(extent) > 2 else "")
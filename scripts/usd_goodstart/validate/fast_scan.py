@@ -0,0 +1,121 @@
+"""
+Fast Layer-Only Scan (--fast)
+
+Checks only what a pre-commit hook needs: does every layer parse, and does
+every authored path resolve? No Usd.Stage is composed and no prims are walked.
+"""
+
+# Standard library imports
+from pathlib import Path  # Modern Python path handling
+
+from .asset_files import MDL_SOURCE_ATTRIBUTE, AssetFileChecker
+from .report import ValidationReport, print_findings
+from .resolution import (iter_layer_asset_paths, open_layer, resolve_layer_asset_path, shared_asset_checker,
+                         shared_layer_scans)
+
+
+def scan_layer(layer, scanned_layers, asset_checker):
+    """
+    Check that every path authored in `layer` resolves (layer-level, no stage).
+
+    Returns a dict with "issues" (severity, code, message, prim, layer) and
+    "dependencies" (resolved paths of sublayers, references and payloads that
+    have to be scanned next).
+    Results are remembered in `scanned_layers` (layer identifier -> result),
+    so a layer that is used by many files is only checked once per batch run.
+    Asset files (textures, MDL, UDIM tiles) are checked with `asset_checker`
+    (an AssetFileChecker - one folder listing per folder, see asset_files.py).
+    """
+    cached = scanned_layers.get(layer.identifier)
+    if cached is not None:
+        return cached
+
+    issues = []
+    dependencies = []
+    for kind, asset_path, spec_path in iter_layer_asset_paths(layer):
+        where = f"{spec_path} in {layer.identifier}"
+        if kind == "asset":
+            status = asset_checker.check(layer, asset_path)["status"]
+            if status in ("found", "remote") or (status == "search-path" and spec_path.name == MDL_SOURCE_ATTRIBUTE):
+                continue
+            issues.append(("warning", "unresolved-asset", f"Unresolved asset path: {asset_path} at {where}",
+                           spec_path, layer.identifier))
+            continue
+        resolved_path = resolve_layer_asset_path(layer, asset_path)
+        if resolved_path and Path(resolved_path).exists():
+            dependencies.append(resolved_path)  # Another layer to scan
+            continue
+        if kind == "sublayer":
+            # A missing sublayer means the scene is incomplete
+            issue = ("error", "missing-sublayer", f"Missing sublayer: {asset_path} ({where})")
+        elif kind == "reference":
+            issue = ("warning", "missing-reference", f"Potential missing reference: {asset_path} at {where}")
+        else:
+            issue = ("warning", "missing-payload", f"Potential missing payload: {asset_path} at {where}")
+        prim_path = spec_path if not spec_path.IsAbsoluteRootPath() else None
+        issues.append(issue + (prim_path, layer.identifier))
+
+    result = {"issues": issues, "dependencies": dependencies}
+    scanned_layers[layer.identifier] = result
+    return result
+
+
+def fast_scan_file(usd_file, report=None):
+    """
+    Fast layer-only check of `usd_file` and every layer it depends on.
+
+    Unlike validate_asset()/validate_scene(), this never builds a Usd.Stage and
+    never walks composed prims. It only answers two questions:
+    1. Does every layer (the file, its sublayers, references, payloads) parse?
+    2. Does every path authored in those layers resolve to an existing file?
+    That makes it fast enough for pre-commit checks.
+
+    All findings are also recorded in `report` (a ValidationReport) if one is given.
+
+    Returns True if there were no errors (warnings are OK).
+    """
+    usd_file = Path(usd_file).resolve()
+    if report is None:
+        report = ValidationReport(usd_file)
+    report.kind = "fast-scan"
+    print(f"Fast scan (layers only): {usd_file}")
+
+    if not usd_file.exists():
+        report.error("file-not-found", f"File not found: {usd_file}")
+        print(f"ERROR: File not found: {usd_file}")
+        return False
+
+    # Walk the layer dependency graph breadth-first.
+    # `visited` stops us from scanning a layer twice (and from looping forever
+    # if two layers reference each other).
+    to_visit = [str(usd_file)]
+    visited = set()
+    # Layers scanned before: in a batch run shared by all files, otherwise
+    # only for this file (the layers may have changed before the next call)
+    scanned_layers = shared_layer_scans()
+    if scanned_layers is None:
+        scanned_layers = {}
+    asset_checker = shared_asset_checker() or AssetFileChecker()
+    with report.phase("scan"):
+        while to_visit:
+            layer_path = to_visit.pop(0)
+            if layer_path in visited:
+                continue
+            visited.add(layer_path)
+
+            layer, open_error = open_layer(layer_path)
+            if not layer:
+                report.error("parse-error", open_error, layer=layer_path)
+                continue
+
+            result = scan_layer(layer, scanned_layers, asset_checker)
+            for severity, code, message, prim_path, layer_id in result["issues"]:
+                report.add_issue(severity, code, message, prim=prim_path, layer=layer_id)
+            to_visit.extend(result["dependencies"])
+
+    print(f"Checked {len(visited)} layer(s)")
+    report.stats.update(layers=len(visited))
+
+    # Report results
+    print_findings(report, "Fast scan")
+    return report.passed
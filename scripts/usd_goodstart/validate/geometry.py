@@ -0,0 +1,185 @@
+"""
+Mesh Geometry Checks (NumPy)
+
+A mesh prim stores its topology in a few flat arrays:
+- points:             one position per vertex
+- faceVertexCounts:   how many vertices each face has (3 = triangle, 4 = quad, ...)
+- faceVertexIndices:  the vertices of all faces one after another, as
+                      indices into points
+
+Broken arrays (an index past the end of points, counts that don't add up,
+NaN positions) crash or confuse renderers, and they are easy to produce with
+a bad export. Meshes can have millions of points, so these checks never loop
+over points or faces in Python: the USD arrays (Vt arrays) are viewed as NumPy
+arrays WITHOUT copying them, and every check is one NumPy operation over the
+whole array.
+
+NumPy is optional. Without it, `numpy` is None and the geometry checks are
+skipped (see MeshGeometryRule in rules.py):
+
+    pip install numpy
+"""
+
+try:
+    import numpy  # Array math on the USD arrays (optional)
+except ImportError:
+    numpy = None
+
+
+# Faces smaller than this (area relative to the squared size of the mesh) count
+# as degenerate - about the precision of 32-bit float points
+DEGENERATE_AREA_TOLERANCE = 1e-12
+
+# Meshes with at most this many points are remembered by their content, so
+# a mesh that comes in many times is only checked once (see MeshGeometryRule)
+SMALL_MESH_POINTS = 1000
+
+# How many example faces/indices a message lists
+EXAMPLE_COUNT = 5
+
+
+def as_array(value, dtype=None):
+    """
+    A USD array value (e.g. Vt.Vec3fArray) as a NumPy array - a view of the
+    same memory, not a copy. None stays None.
+    """
+    if value is None:
+        return None
+    return numpy.asarray(value, dtype=dtype)
+
+
+def examples(positions):
+    """The first few entries of `positions` as text, e.g. "3, 17, 52, ..."."""
+    shown = ", ".join(str(position) for position in positions[:EXAMPLE_COUNT].tolist())
+    return shown + (", ..." if len(positions) > EXAMPLE_COUNT else "")
+
+
+def check_mesh_arrays(points, counts, indices):
+    """
+    Check the topology arrays of one mesh (NumPy arrays, see as_array()).
+
+    Returns a dict of findings - empty if the mesh is fine:
+    - "count_mismatch":    (sum of counts, number of indices) if they differ
+    - "small_faces":       faces with fewer than 3 vertices
+    - "bad_indices":       positions in `indices` outside of `points`
+    - "non_finite_points": points with a NaN or infinite coordinate
+    - "degenerate_faces":  faces with (almost) zero area
+    Each of the last four is an array of positions.
+    """
+    findings = {}
+    point_count = len(points)
+
+    non_finite = numpy.flatnonzero(~numpy.isfinite(points).all(axis=1)) if point_count else None
+    if non_finite is not None and len(non_finite):
+        findings["non_finite_points"] = non_finite
+
+    bad_indices = numpy.flatnonzero((indices < 0) | (indices >= point_count))
+    if len(bad_indices):
+        findings["bad_indices"] = bad_indices
+
+    small_faces = numpy.flatnonzero(counts < 3)
+    if len(small_faces):
+        findings["small_faces"] = small_faces
+
+    index_total = int(counts.sum(dtype=numpy.int64))
+    if index_total != len(indices) or (counts < 0).any():
+        findings["count_mismatch"] = (index_total, len(indices))
+
+    # Face areas need valid indices and points (faces with < 3 vertices are reported above)
+    if not findings.keys() & {"count_mismatch", "bad_indices", "non_finite_points"}:
+        too_small = _face_areas(points, counts, indices) <= DEGENERATE_AREA_TOLERANCE * _squared_size(points)
+        degenerate = numpy.flatnonzero(too_small & (counts >= 3))
+        if len(degenerate):
+            findings["degenerate_faces"] = degenerate
+    return findings
+
+
+def _squared_size(points):
+    """Squared length of the bounding box diagonal of `points`."""
+    if not len(points):
+        return 0.0
+    diagonal = points.max(axis=0).astype(numpy.float64) - points.min(axis=0)
+    return float(diagonal @ diagonal)
+
+
+def _face_areas(points, counts, indices):
+    """
+    Area of every face (0 for faces with fewer than 3 vertices).
+
+    Each face is split into a fan of triangles around its first vertex
+    (v0 v1 v2, v0 v2 v3, ...) and the cross products of its triangles are
+    summed up; for a planar polygon the length of that sum is twice its area
+    (also for concave polygons). The loop goes over the corner NUMBER, not
+    over faces: a quad mesh needs 2 rounds, each over all faces at once.
+    """
+    areas = numpy.zeros(len(counts))
+    starts = numpy.cumsum(counts, dtype=numpy.int64) - counts  # First index of each face
+    faces = numpy.flatnonzero(counts >= 3)
+    if not len(faces):
+        return areas
+    counts, starts = counts[faces], starts[faces]
+    origin = points[indices[starts]].astype(numpy.float64)
+    previous = points[indices[starts + 1]] - origin
+    normal = numpy.zeros((len(faces), 3))
+    for corner in range(2, int(counts.max())):
+        if counts.min() > corner:
+            current = points[indices[starts + corner]] - origin
+            normal += _cross(previous, current)
+        else:
+            # Some faces have no vertex with this number - leave them alone
+            longer = numpy.flatnonzero(counts > corner)
+            current = previous.copy()
+            current[longer] = points[indices[starts[longer] + corner]] - origin[longer]
+            normal[longer] += _cross(previous[longer], current[longer])
+        previous = current
+    areas[faces] = 0.5 * numpy.sqrt((normal * normal).sum(axis=1))
+    return areas
+
+
+def _cross(a, b):
+    """Cross products of two (N, 3) arrays (faster than numpy.cross for this shape)."""
+    return numpy.stack([a[:, 1] * b[:, 2] - a[:, 2] * b[:, 1],
+                        a[:, 2] * b[:, 0] - a[:, 0] * b[:, 2],
+                        a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]], axis=1)
+
+
+def expected_primvar_size(interpolation, point_count, face_count, index_count):
+    """
+    How many values a primvar with `interpolation` needs on a mesh
+    (before elementSize), or None for an unknown interpolation.
+    """
+    return {
+        "constant": 1,
+        "uniform": face_count,        # One per face
+        "vertex": point_count,        # One per point
+        "varying": point_count,
+        "faceVarying": index_count,   # One per face corner
+    }.get(interpolation)
+
+
+def check_primvar_arrays(values, indices, expected):
+    """
+    Check one primvar: `values` (NumPy array), its `indices` (None if not
+    indexed) and the `expected` number of elements.
+
+    Returns a dict of findings - empty if the primvar is fine:
+    - "size":        (number of elements, expected) if they differ
+    - "bad_indices": positions in `indices` outside of `values`
+    - "non_finite":  values with a NaN or infinite component (float values only)
+    """
+    findings = {}
+    size = len(indices) if indices is not None else len(values)
+    if size != expected:
+        findings["size"] = (size, expected)
+    if indices is not None:
+        bad_indices = numpy.flatnonzero((indices < 0) | (indices >= len(values)))
+        if len(bad_indices):
+            findings["bad_indices"] = bad_indices
+    if values.dtype.kind == "f" and len(values):
+        finite = numpy.isfinite(values)
+        if finite.ndim > 1:
+            finite = finite.reshape(len(values), -1).all(axis=1)
+        non_finite = numpy.flatnonzero(~finite)
+        if len(non_finite):
+            findings["non_finite"] = non_finite
+    return findings
@@ -0,0 +1,68 @@
+"""
+Layer File Formats (text .usda vs. binary crate .usdc)
+
+USD stores layers in two formats:
+- text (usda):  human-readable, diffs nicely in git - but every number of
+                every point has to be parsed from text when the file is opened
+- crate (usdc): binary, opens much faster, uses less memory and can load
+                big arrays (points, normals, ...) only when they are needed
+
+A `.usd` file can be either - only the first bytes of the file tell. Small
+layers that people edit by hand are fine as text; heavy geometry belongs in
+crate. scripts/usd_format.py measures both formats and converts files.
+"""
+
+# Standard library imports
+import os       # For file sizes
+
+
+# First bytes of the file formats
+CRATE_MAGIC = b"PXR-USDC"
+TEXT_MAGIC = b"#usda"
+USDZ_MAGIC = b"PK\x03\x04"  # usdz packages are zip files
+
+# Text layers at least this big are reported as better stored as crate (bytes)
+DEFAULT_TEXT_SIZE_LIMIT = 1024 * 1024
+
+
+def format_size(size):
+    """File size in bytes as a short text like "7.9 KB" or "2.8 MB"."""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.1f} KB"
+
+
+def detect_file_format(file_path):
+    """
+    The format of the USD file `file_path`: "usda" (text), "usdc" (crate),
+    "usdz" (package) - or None if it can't be read or is not a USD file.
+
+    Looks at the file content, not the extension: `.usd` files can be text or crate.
+    """
+    try:
+        with open(file_path, "rb") as stream:
+            header = stream.read(len(CRATE_MAGIC))
+    except OSError:
+        return None
+    if header.startswith(CRATE_MAGIC):
+        return "usdc"
+    if header.startswith(TEXT_MAGIC):
+        return "usda"
+    if header.startswith(USDZ_MAGIC):
+        return "usdz"
+    return None
+
+
+def is_large_text_layer(file_path, size_limit=DEFAULT_TEXT_SIZE_LIMIT):
+    """
+    The size of `file_path` in bytes if it is a text layer of at least
+    `size_limit` bytes, otherwise None. (The cheap size check comes first, so
+    small files are never opened.)
+    """
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        return None
+    if size < size_limit or detect_file_format(file_path) != "usda":
+        return None
+    return size
@@ -0,0 +1,74 @@
+"""
+Process Memory
+
+How much memory this Python process uses right now - used to keep
+validation of big sets under a memory limit (--payload-memory-limit, see
+PayloadLoadingRule in rules.py) - and at most so far, used by the scripts
+that measure the memory of a load (usd_format.py, benchmark_validation.py).
+"""
+
+# Standard library imports
+import sys      # For the platform name
+
+try:
+    import resource  # Peak memory of a process - Unix only
+except ImportError:
+    resource = None
+
+
+def _proc_status_mb(field):
+    """The memory `field` ("VmRSS", "VmHWM") of /proc/self/status in MB - Linux only, None elsewhere."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as stream:
+            for line in stream:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024  # Reported in KB
+    except OSError:
+        pass
+    return None
+
+
+def _max_rss_mb():
+    """Peak memory of this process in MB from getrusage(), or None on Windows."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in KB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def current_memory_mb():
+    """
+    Memory (resident set size) of this process in MB, or None if unknown.
+
+    Linux reports the current value (/proc/self/status). Other Unix systems
+    only report the PEAK so far - it never goes down, so a limit stays
+    reached once it was crossed. Windows: None.
+    """
+    current = _proc_status_mb("VmRSS")
+    return current if current is not None else _max_rss_mb()
+
+
+def peak_memory_mb():
+    """
+    Highest memory (resident set size) of this process so far in MB, or None
+    if unknown (Windows).
+
+    It includes Python's own start-up - measure the growth from a baseline,
+    or call reset_peak_memory() first.
+    """
+    peak = _proc_status_mb("VmHWM")
+    return peak if peak is not None else _max_rss_mb()
+
+
+def reset_peak_memory():
+    """
+    Count peak_memory_mb() from now on (Linux only). Returns False where this
+    is not possible - the peak then still includes everything before.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        return False
+    return _proc_status_mb("VmHWM") is not None
@@ -0,0 +1,59 @@
+"""
+Dedicated Opinion Layers
+
+Some scripts fix a scene without touching the layers its opinions came from:
+they write their own opinions (corrected extents, instanceable flags, ...)
+into a layer of their own - by default in 020_LYR_USD next to the root file -
+and add that layer as the FIRST (strongest) sublayer of the root file.
+Running the script again updates the layer in place.
+
+Used by the author_extents.py and analyze_instancing.py scripts.
+"""
+
+# Standard library imports
+import os       # For relative sublayer paths
+
+from pxr import Sdf
+# Sdf: Scene Description Foundation - layers and their sublayer lists
+
+
+def default_layer_path(root_file, layer_name):
+    """020_LYR_USD/`layer_name` next to `root_file`, or ROOT_`layer_name` without a layer folder."""
+    layer_folder = root_file.parent / "020_LYR_USD"
+    if layer_folder.is_dir():
+        return layer_folder / layer_name
+    return root_file.parent / f"{root_file.stem}_{layer_name}"
+
+
+def open_layer_for_update(output, comment):
+    """
+    The layer at `output`: the existing file, or a new (not yet saved)
+    anonymous layer with `comment` - save it with save_layer().
+    """
+    if output.exists():
+        return Sdf.Layer.FindOrOpen(str(output))
+    layer = Sdf.Layer.CreateAnonymous(output.name)
+    layer.comment = comment
+    return layer
+
+
+def save_layer(layer, output):
+    """Save a layer from open_layer_for_update() to `output` (a new layer is exported there)."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if layer.anonymous:
+        layer.Export(str(output))
+    else:
+        layer.Save()
+
+
+def add_sublayer(root_file, output):
+    """Add `output` as the first (strongest) sublayer of `root_file`. Returns False if it already is one."""
+    root_layer = Sdf.Layer.FindOrOpen(str(root_file))
+    relative = os.path.relpath(output, root_file.parent).replace(os.sep, "/")
+    relative = relative if relative.startswith(".") else f"./{relative}"
+    for sublayer_path in root_layer.subLayerPaths:
+        if os.path.normpath(root_layer.ComputeAbsolutePath(sublayer_path)) == os.path.normpath(str(output)):
+            return False
+    root_layer.subLayerPaths.insert(0, relative)
+    root_layer.Save()
+    return True
@@ -0,0 +1,125 @@
+"""
+Concurrent File System Probes
+
+On network storage (NAS, SynologyDrive, SMB/NFS mounts) every "does this file
+exist?" is a round trip to the server that can take several milliseconds.
+Checking hundreds of references and texture folders one after another adds all
+those waits up.
+
+run_probes() sends the probes off together through a small pool of threads,
+so the total wait is about as long as the SLOWEST answer instead of the sum of
+all answers. Only plain file system calls (os.path.exists, os.scandir) run in
+the threads - USD itself (opening stages and layers, composition) always stays
+on the main thread.
+
+A probe that takes longer than the timeout is given up on and reported as
+TIMED_OUT, so a single hanging mount cannot stall the whole validation.
+
+Usage:
+    from usd_goodstart.validate.probes import configure_probes, run_probes
+
+    configure_probes(workers=32, timeout=5)
+    results = run_probes(os.path.exists, ["/mnt/nas/a.usd", "/mnt/nas/b.usd"])
+"""
+
+# Standard library imports
+import queue    # Work queue shared by the probe threads
+import threading  # Probe threads
+import time     # For the per-probe timeout
+
+
+# Default number of probes in flight at the same time (--probe-workers)
+DEFAULT_PROBE_WORKERS = 16
+
+# Default seconds to wait for one probe before giving up on it (--probe-timeout)
+DEFAULT_PROBE_TIMEOUT = 10.0
+
+# Result of a probe that did not answer in time
+TIMED_OUT = "timed-out"
+
+# Current settings (see configure_probes())
+_settings = {"workers": DEFAULT_PROBE_WORKERS, "timeout": DEFAULT_PROBE_TIMEOUT}
+
+
+def configure_probes(workers=None, timeout=None):
+    """
+    Set how many probes run at the same time and how long one may take.
+
+    workers=1 probes one file at a time. timeout=0 waits as long as it takes.
+    Values that are None are left unchanged.
+    """
+    if workers is not None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        _settings["workers"] = workers
+    if timeout is not None:
+        if timeout < 0:
+            raise ValueError("timeout must not be negative")
+        _settings["timeout"] = timeout
+
+
+def probe_settings():
+    """The current settings as (workers, timeout) - e.g. to pass them to worker processes."""
+    return _settings["workers"], _settings["timeout"]
+
+
+def run_probes(probe, items):
+    """
+    Call probe(item) for every item, several at the same time.
+
+    Returns a dict item -> result. Items whose probe did not answer within the
+    timeout map to TIMED_OUT. Duplicate items are probed only once.
+
+    The threads are daemon threads: a probe stuck on a dead mount is simply
+    left behind (a replacement thread takes over its place in the pool) and
+    never keeps the program from exiting.
+    """
+    items = list(dict.fromkeys(items))  # Unique, in their original order
+    if not items:
+        return {}
+    workers, timeout = probe_settings()
+
+    pending = queue.Queue()
+    for item in items:
+        pending.put(item)
+    started = {item: threading.Event() for item in items}
+    finished = {item: threading.Event() for item in items}
+    start_times = {}
+    answers = {}
+
+    def work():
+        while True:
+            try:
+                item = pending.get_nowait()
+            except queue.Empty:
+                return
+            start_times[item] = time.monotonic()
+            started[item].set()
+            try:
+                answers[item] = probe(item)
+            except Exception as exc:  # Handed to the main thread below
+                answers[item] = exc
+            finished[item].set()
+
+    def start_worker():
+        threading.Thread(target=work, name="usd-probe", daemon=True).start()
+
+    for _ in range(min(workers, len(items))):
+        start_worker()
+
+    results = {}
+    for item in items:
+        # Items are taken from the queue in order, and every item before this
+        # one has finished or was given up on - so this one starts soon
+        started[item].wait()
+        remaining = None
+        if timeout:
+            remaining = max(start_times[item] + timeout - time.monotonic(), 0)
+        if finished[item].wait(remaining):
+            if isinstance(answers[item], Exception):
+                raise answers[item]
+            results[item] = answers[item]
+        else:
+            results[item] = TIMED_OUT
+            start_worker()  # Keep the pool at full size without the stuck thread
+    return results
@@ -0,0 +1,356 @@
+"""
+Validation Profiling (--profile)
+
+Where does the validation time go? With profiling switched on, the
+validators record - per validated file, in report.profile:
+- "rules":    seconds spent in begin(), check_prim() and finish() of every
+              rule, and how many prims each rule checked
+- "counters": prims visited, layers used and opened, and the hits/misses of
+              the reference and asset file caches
+- "events":   (with trace=True) Chrome trace events of every phase and rule,
+              to look at in chrome://tracing or https://ui.perfetto.dev
+
+The phase timings (report.timings) are recorded with or without profiling.
+Switched off, the hooks cost one function call per phase - nothing per prim.
+
+Other tools can follow along: every Profiler calls its `listeners` with each
+event (a dict like {"name": "open", "cat": "phase", "ph": "B", "ts": ...}),
+"B" when a phase, rule or file starts and "E" when it ends.
+
+With usd_trace=True, USD's own Trace collector records what USD does while a
+stage is opened (layer reads, composition, ...) and those events are added to
+the Chrome trace too.
+
+Usage:
+    from usd_goodstart.validate import validate
+    from usd_goodstart.validate.profiling import enable_profiling, print_profile, write_trace
+
+    profiler = enable_profiling(trace=True)
+    profiler.listeners.append(lambda event: print(event["ph"], event["name"]))
+    report = validate("GoodStart_ROOT.usda")
+    print_profile([report])
+    write_trace([report], "validation_trace.json")
+"""
+
+# Standard library imports
+import os       # Process id (Chrome trace "pid") and temporary files
+import re       # For shortening USD's C++ function names
+import json     # Chrome trace files are JSON
+import time     # Clock of the trace events
+import tempfile  # USD writes its trace to a file
+import threading  # Thread id (Chrome trace "tid")
+import contextlib  # For the span() and usd_trace_scope() helpers
+
+from pxr import Sdf, Trace
+# Sdf: Scene Description Foundation - lists the layers that are loaded
+# Trace: USD's own performance instrumentation (Trace.Collector)
+
+
+# Namespace prefix of USD's C++ names in its trace, e.g. "pxrInternal_v0_26_8__pxrReserved__::"
+_USD_NAMESPACE = re.compile(r"pxrInternal_\w+?__pxrReserved__::")
+
+# Start of the thread names of the USD Trace events in the Chrome trace
+USD_TRACE_THREAD = "USD"
+
+# The profiler of this process (None = profiling is off), see enable_profiling()
+_profiler = None
+
+
+class Profiler:
+    """
+    Records timings, counters and events of the files validated while it is active.
+
+    Everything is stored on the ValidationReport of the file (report.profile),
+    so results of --jobs worker processes come back with their reports.
+    """
+
+    def __init__(self, trace=False, usd_trace=False):
+        self.trace = trace          # Keep Chrome trace events (report.profile["events"])
+        self.usd_trace = usd_trace  # Record USD's own Trace events while stages open
+        self.listeners = []         # Called with every event (see module docstring)
+        self._prim_checks = 0       # > 0 while a check_prim() call runs
+        self._file_report = None    # Report of the file being validated (see file())
+        self._layers_before = None  # Layer identifiers loaded before that file
+
+    def span(self, report, name, category):
+        """
+        Context manager: report the start ("B") and end ("E") of `name`.
+
+        Spans inside check_prim() (e.g. the reference_checks phase of a single
+        prim) happen once per prim - they are timed as usual, but not sent as
+        events, which keeps traces of big stages small.
+        """
+        if self._prim_checks:
+            return contextlib.nullcontext()
+        return self._span(report, name, category)
+
+    @contextlib.contextmanager
+    def _span(self, report, name, category):
+        self._emit(report, name, category, "B")
+        try:
+            yield
+        finally:
+            self._emit(report, name, category, "E")
+
+    def _emit(self, report, name, category, event_type):
+        """Send one event to the listeners (and keep it for the trace)."""
+        if not (self.trace or self.listeners):
+            return
+        event = {"name": name, "cat": category, "ph": event_type, "ts": _now(),
+                 "pid": os.getpid(), "tid": threading.get_ident(), "args": {"file": report.file}}
+        if self.trace:
+            profile_of(report)["events"].append(event)
+        for listener in self.listeners:
+            listener(event)
+
+    @contextlib.contextmanager
+    def file(self, report):
+        """Validate one file: a "file" span, and remember which layers were loaded before it."""
+        if self._file_report is report:
+            yield  # Already inside this file (validate_file() -> validate_asset())
+            return
+        outer = self._file_report, self._layers_before
+        self._file_report = report
+        self._layers_before = {layer.identifier for layer in Sdf.Layer.GetLoadedLayers()}
+        try:
+            with self.span(report, os.path.basename(report.file), "file"):
+                yield
+        finally:
+            self._file_report, self._layers_before = outer
+
+    def count_stage(self, report, stage, counters):
+        """Add `counters` (name -> number) and the layer counts of `stage` to the file's counters."""
+        used_layers = [layer for layer in stage.GetUsedLayers() if not layer.anonymous]
+        counters = dict(counters, layers_used=len(used_layers))
+        if self._layers_before is not None:
+            # Layers that were not in memory yet when the file started: read from disk
+            counters["layers_opened"] = sum(1 for layer in used_layers
+                                            if layer.identifier not in self._layers_before)
+        profile_counters = profile_of(report)["counters"]
+        for name, value in counters.items():
+            profile_counters[name] = profile_counters.get(name, 0) + value
+
+    def timed_rule(self, rule, report):
+        """`rule`, wrapped so that every call is timed into report.profile["rules"]."""
+        return TimedRule(rule, self, report)
+
+    @contextlib.contextmanager
+    def usd_trace_scope(self, report):
+        """Record USD's own Trace events of the block (only with usd_trace=True)."""
+        if not self.usd_trace:
+            yield
+            return
+        collector = Trace.Collector()
+        collector.Clear()
+        Trace.Reporter.globalReporter.ClearTree()
+        start = _now()
+        collector.enabled = True
+        try:
+            yield
+        finally:
+            collector.enabled = False
+            events = _read_usd_trace()
+            collector.Clear()
+            timestamps = [event["ts"] for event in events if "ts" in event]
+            # USD has its own clock - line its first event up with the start of the block
+            offset = start - min(timestamps) if timestamps else 0
+            for event in events:
+                if "ts" in event:
+                    event["ts"] += offset
+                event.update(name=_USD_NAMESPACE.sub("", event.get("name", "")), cat="usd",
+                             pid=os.getpid(), tid=f"{USD_TRACE_THREAD} {event.get('tid', '')}".strip())
+            if self.trace:
+                profile_of(report)["events"].extend(events)
+
+
+class TimedRule:
+    """
+    A rule whose begin(), check_prim() and finish() calls are timed.
+
+    Used instead of the rule itself while profiling (see run_rules()). Times
+    are inclusive: the finish() of a rule that checks prims again (variants,
+    payloads) includes those prim checks.
+    """
+
+    def __init__(self, rule, profiler, report):
+        self.rule = rule
+        self.name = rule.name
+        self.phase = rule.phase
+        self.profiler = profiler
+        self.report = report
+        self.times = profile_of(report)["rules"].setdefault(
+            rule.name, {"begin": 0.0, "check_prim": 0.0, "finish": 0.0, "prims": 0})
+
+    def __getattr__(self, name):
+        return getattr(self.rule, name)  # Everything else comes from the rule itself
+
+    def begin(self, context):
+        self._call("begin", context)
+
+    def check_prim(self, prim, context):
+        profiler = self.profiler
+        profiler._prim_checks += 1
+        start = time.perf_counter()
+        try:
+            self.rule.check_prim(prim, context)
+        finally:
+            self.times["check_prim"] += time.perf_counter() - start
+            self.times["prims"] += 1
+            profiler._prim_checks -= 1
+
+    def finish(self, context):
+        self._call("finish", context)
+
+    def _call(self, method, context):
+        start = time.perf_counter()
+        try:
+            with self.profiler.span(self.report, f"{self.name} {method}", "rule"):
+                getattr(self.rule, method)(context)
+        finally:
+            self.times[method] += time.perf_counter() - start
+
+
+def enable_profiling(trace=False, usd_trace=False):
+    """
+    Switch profiling on for every file validated from now on (in this process).
+
+    trace=True keeps Chrome trace events (see write_trace()), usd_trace=True
+    adds USD's own Trace events of each stage open. Returns the Profiler.
+    """
+    global _profiler
+    _profiler = Profiler(trace=trace, usd_trace=usd_trace)
+    return _profiler
+
+
+def disable_profiling():
+    """Switch profiling off again."""
+    global _profiler
+    _profiler = None
+
+
+def active_profiler():
+    """The Profiler of this process, or None if profiling is off."""
+    return _profiler
+
+
+def profiling_settings():
+    """The current settings as (trace, usd_trace), or None if off - e.g. for worker processes."""
+    if _profiler is None:
+        return None
+    return _profiler.trace, _profiler.usd_trace
+
+
+def profiled_file(report):
+    """Context manager around the validation of one file: Profiler.file() while profiling."""
+    return _profiler.file(report) if _profiler else contextlib.nullcontext()
+
+
+def usd_trace_scope(report):
+    """Context manager around a stage open: Profiler.usd_trace_scope() while profiling."""
+    return _profiler.usd_trace_scope(report) if _profiler else contextlib.nullcontext()
+
+
+def profile_of(report):
+    """The profile data of `report` (created on first use)."""
+    if report.profile is None:
+        report.profile = {"rules": {}, "counters": {}, "events": []}
+    return report.profile
+
+
+def _now():
+    """Current time in microseconds (the unit of Chrome trace timestamps)."""
+    return time.perf_counter() * 1e6
+
+
+def _read_usd_trace():
+    """The events USD's Trace collector recorded, as Chrome trace events."""
+    handle, trace_file = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+    try:
+        Trace.Reporter.globalReporter.ReportChromeTracingToFile(trace_file)
+        with open(trace_file, encoding="utf-8") as stream:
+            return json.load(stream).get("traceEvents", [])
+    except (OSError, ValueError):
+        return []
+    finally:
+        os.remove(trace_file)
+
+
+def print_profile(reports, top=5):
+    """Print where the time of `reports` went: phases, rules, counters and the slowest files."""
+    profiled = [report for report in reports if report.profile]
+    if not profiled:
+        print("\nPROFILE: nothing was profiled (all results taken from the cache?)")
+        return
+    total = sum(report.timings.get("total", 0.0) for report in profiled)
+    print(f"\nPROFILE ({len(profiled)} file(s)" + (f", {total:.3f} s" if total else "") + ")")
+
+    # Phases (they overlap: "traverse" includes "reference_checks", ...)
+    phases = {}
+    for report in profiled:
+        for name, seconds in report.timings.items():
+            phases[name] = phases.get(name, 0.0) + seconds
+    print(f"\n  {'Phase':<24}{'Seconds':>10}")
+    for name, seconds in sorted(phases.items(), key=lambda item: -item[1]):
+        print(f"  {name:<24}{seconds:>10.4f}")
+
+    # Rules
+    rules = {}
+    for report in profiled:
+        for name, times in report.profile["rules"].items():
+            totals = rules.setdefault(name, dict.fromkeys(times, 0))
+            for key, value in times.items():
+                totals[key] += value
+    if rules:
+        print(f"\n  {'Rule':<24}{'Prims':>8}{'begin s':>10}{'check_prim s':>14}{'finish s':>10}{'Total s':>10}")
+        by_time = sorted(rules.items(), key=lambda item: -(item[1]["begin"] + item[1]["check_prim"]
+                                                          + item[1]["finish"]))
+        for name, times in by_time:
+            rule_total = times["begin"] + times["check_prim"] + times["finish"]
+            print(f"  {name:<24}{times['prims']:>8}{times['begin']:>10.4f}{times['check_prim']:>14.4f}"
+                  f"{times['finish']:>10.4f}{rule_total:>10.4f}")
+
+    # Counters
+    counters = {}
+    for report in profiled:
+        for name, value in report.profile["counters"].items():
+            counters[name] = counters.get(name, 0) + value
+    if counters:
+        print("\n  Counters:")
+        print(f"    prims visited:       {counters.get('prims_visited', 0)}")
+        layers = f"    layers used:         {counters.get('layers_used', 0)}"
+        if "layers_opened" in counters:
+            layers += f" ({counters['layers_opened']} read from disk)"
+        print(layers)
+        for label, key in (("reference cache", "reference_cache"), ("asset file cache", "asset_cache")):
+            hits, misses = counters.get(f"{key}_hits", 0), counters.get(f"{key}_misses", 0)
+            if hits or misses:
+                print(f"    {label + ':':<21}{hits} hit(s), {misses} miss(es) - "
+                      f"{100 * hits / (hits + misses):.0f}% hit rate")
+
+    if len(profiled) > 1:
+        print("\n  Slowest files:")
+        slowest = sorted(profiled, key=lambda report: -report.timings.get("total", 0.0))[:top]
+        for report in slowest:
+            print(f"    {report.timings.get('total', 0.0):>8.4f} s  {report.file}")
+
+
+def write_trace(reports, output):
+    """
+    Write the events of `reports` as a Chrome trace file (JSON).
+
+    Open it in chrome://tracing or https://ui.perfetto.dev. Each worker process
+    (--jobs) is its own row; USD's Trace events are on their own "USD ..." threads.
+    """
+    events = [event for report in reports if report.profile for event in report.profile["events"]]
+    metadata = []
+    for pid in sorted({event["pid"] for event in events}):
+        metadata.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                         "args": {"name": f"usd validation (pid {pid})"}})
+        usd_threads = {event["tid"] for event in events
+                       if event["pid"] == pid and str(event["tid"]).startswith(USD_TRACE_THREAD)}
+        for thread in sorted(usd_threads):
+            metadata.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread,
+                             "args": {"name": thread}})
+    with open(output, "w", encoding="utf-8") as stream:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, stream)
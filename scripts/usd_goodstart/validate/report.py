@@ -0,0 +1,322 @@
+"""
+Validation Report Helpers
+
+Used by every validator in this package and by the validation scripts.
+
+The validation scripts print human-readable text. For dashboards and CI
+systems they can also write machine-readable reports:
+- JSON:  one object per validated file with issues, timings and statistics
+- JUnit: one <testcase> per validated file (understood by most CI systems)
+
+Every issue has a stable `code` (see ISSUE_CODES below), a severity
+("error" or "warning"), a message, and - where known - the prim path and
+the layer the problem was found in. Codes never change meaning, so they are
+safe to filter on; messages may be reworded over time.
+
+Each report also records wall time per validation phase (in seconds):
+- "open":              opening/composing the stage
+- "traverse":          walking all prims (includes "reference_checks" and "payload_checks")
+- "reference_checks":  resolving and checking referenced files (incl. the concurrent prefetch)
+- "payload_checks":    checking payload files (without loading them)
+- "sublayer_checks":   checking the sublayers of the root layer
+- "composition_checks": reading composition errors (scenes)
+- "asset_checks":      checking the files of asset attributes (textures, MDL, ...)
+- "format_checks":     looking for big text layers that should be crate
+- "geometry_checks":   checking mesh topology, points and primvars (assets)
+- "extent_checks":     comparing gprim extents and model extentsHints with the geometry
+- "variant_checks":    checking the variants that are not selected (--all-variants)
+- "payload_loading":   loading, checking and unloading payloads (--payloads-one-at-a-time)
+- "scan":              layer-only scan (--fast mode)
+- "reload":            reloading saved layers (--watch mode)
+- "total":             the whole validation of the file
+
+Usage:
+    from usd_goodstart.validate import ValidationReport, write_reports
+
+    report = ValidationReport("010_ASS_USD/0_CUBE.usda", "asset")
+    with report.phase("open"):
+        stage = Usd.Stage.Open(...)
+    report.warning("no-default-prim", "No default prim set")
+    write_reports([report], "json", "report.json")
+"""
+
+# Standard library imports
+import sys      # For writing reports to stdout
+import json     # JSON report format
+import time     # Wall-clock timing of validation phases
+import contextlib  # For the phase() timing helper
+import xml.etree.ElementTree as ElementTree  # JUnit XML report format
+
+from .profiling import active_profiler
+
+
+# Format version of the JSON report - bump when fields are removed or renamed
+REPORT_FORMAT_VERSION = 1
+
+# Report formats supported by write_reports()
+REPORT_FORMATS = ("text", "json", "junit")
+
+# Stable issue codes and what they mean.
+# Add new codes at the end; never change the meaning of an existing code.
+ISSUE_CODES = {
+    "file-not-found": "The file to validate does not exist",
+    "open-failed": "USD could not open the file as a stage",
+    "parse-error": "A layer could not be parsed (syntax error or unsupported format)",
+    "invalid-prim": "A prim in the composed stage is invalid",
+    "absolute-path": "A reference, payload, sublayer or asset attribute uses an absolute file path (not portable)",
+    "missing-reference": "A referenced file does not exist",
+    "unreadable-reference": "A referenced file exists but cannot be opened as USD",
+    "missing-payload": "A payload file does not exist",
+    "unresolved-sublayer": "A sublayer path cannot be resolved",
+    "missing-sublayer": "A sublayer file does not exist",
+    "unreadable-sublayer": "A sublayer file exists but cannot be opened as USD",
+    "sublayer-stage-failed": "A sublayer opens as a layer but not as a stage",
+    "composition-error": "USD reported an error while composing the stage",
+    "unresolved-asset": "An asset path (texture, MDL, ...) does not resolve",
+    "layer-order": "The asset import layer is not at the bottom of the subLayers list",
+    "no-default-prim": "The file has no default prim",
+    "validator-crash": "The validator itself failed while checking the file",
+    "unreadable-payload": "A payload file exists but cannot be opened as USD",
+    "mask-not-found": "A --mask prim path matches no prim in the stage",
+    "missing-asset-file": "A file used by an asset attribute (texture, MDL, UDIM tiles) does not exist",
+    "asset-path-case": "An asset path only matches a file with different upper/lower case",
+    "asset-outside-project": "A relative asset path points outside the project folder",
+    "probe-timeout": "The file system did not answer within --probe-timeout, so a file could not be checked",
+    "large-text-layer": "A big layer is stored as text (.usda) - binary crate (.usdc) opens faster",
+    "payload-not-loaded": "A payload was not loaded because --payload-memory-limit was reached (checked on disk only)",
+    "mesh-topology": "A mesh's faceVertexIndices point past its points, or its faceVertexCounts don't add up",
+    "invalid-points": "A mesh has NaN or infinite points",
+    "degenerate-face": "A mesh has faces with fewer than 3 vertices or without area",
+    "primvar-size": "Normals or a primvar have a different number of values than their interpolation needs",
+    "primvar-index": "An indexed primvar has indices outside of its values",
+    "invalid-primvar-values": "Normals or a float primvar contain NaN or infinite values",
+    "geometry-budget": "An asset has more faces or points than --max-faces/--max-points allow",
+    "missing-extent": "A gprim has no extent, so renderers and viewers compute its bounds when loading",
+    "stale-extent": "A gprim's extent or a model's extentsHint does not match its geometry",
+}
+
+
+class ValidationReport:
+    """
+    Collects everything found while validating ONE file.
+
+    - issues:  list of dicts with code, severity, message, prim, layer
+    - timings: seconds spent per validation phase (see phase())
+    - stats:   numbers worth tracking, e.g. {"prims": 19}
+    - profile: per-rule timings and counters - only with --profile (see profiling.py)
+    """
+
+    def __init__(self, file_path, kind=None):
+        self.file = str(file_path)
+        self.kind = kind  # "asset", "scene" or "fast-scan"
+        self.issues = []
+        self.timings = {}
+        self.stats = {}
+        self.profile = None
+
+    def add_issue(self, severity, code, message, prim=None, layer=None):
+        """Record one issue. `prim` and `layer` are optional locations."""
+        self.issues.append({
+            "code": code,
+            "severity": severity,
+            "message": message,
+            "prim": str(prim) if prim else None,
+            "layer": str(layer) if layer else None,
+        })
+
+    def error(self, code, message, prim=None, layer=None):
+        """Record a critical issue (validation fails)."""
+        self.add_issue("error", code, message, prim, layer)
+
+    def warning(self, code, message, prim=None, layer=None):
+        """Record a potential issue (validation still passes)."""
+        self.add_issue("warning", code, message, prim, layer)
+
+    @property
+    def errors(self):
+        """Messages of all errors, in the order they were found."""
+        return [issue["message"] for issue in self.issues if issue["severity"] == "error"]
+
+    @property
+    def warnings(self):
+        """Messages of all warnings, in the order they were found."""
+        return [issue["message"] for issue in self.issues if issue["severity"] == "warning"]
+
+    @property
+    def passed(self):
+        """True if there are no errors (warnings are OK)."""
+        return not self.errors
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Measure the wall time of a block of code:
+
+            with report.phase("open"):
+                stage = Usd.Stage.Open(path)
+
+        Using the same phase name several times adds the times up.
+        While profiling, the start and end are also sent as events (see profiling.py).
+        """
+        profiler = active_profiler()
+        span = profiler.span(self, name, "phase") if profiler else contextlib.nullcontext()
+        start = time.perf_counter()
+        try:
+            with span:
+                yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def to_dict(self):
+        """The report as plain data (for JSON, caching, and worker processes)."""
+        data = {
+            "file": self.file,
+            "kind": self.kind,
+            "passed": self.passed,
+            "error_count": len(self.errors),
+            "warning_count": len(self.warnings),
+            "issues": list(self.issues),
+            "timings": {name: round(seconds, 6) for name, seconds in self.timings.items()},
+            "stats": dict(self.stats),
+        }
+        if self.profile:
+            data["profile"] = self.profile
+        return data
+
+    def restore(self, data):
+        """Fill this report from to_dict() data (e.g. a cached result)."""
+        self.file = data["file"]
+        self.kind = data["kind"]
+        self.issues = list(data["issues"])
+        self.timings = dict(data["timings"])
+        self.stats = dict(data["stats"])
+        self.profile = data.get("profile")
+        return self
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a report from to_dict() data."""
+        return cls(data["file"]).restore(data)
+
+
+def print_findings(report, title):
+    """Print the errors and warnings of `report` and the final verdict line."""
+    errors = report.errors
+    warnings = report.warnings
+
+    if errors:
+        print("\nERRORS:")
+        for error in errors:
+            print(f"  - {error}")
+
+    if warnings:
+        print("\nWARNINGS:")
+        for warning in warnings:
+            print(f"  - {warning}")
+
+    if not errors and not warnings:
+        print(f"\n✓ {title} passed")
+    elif errors:
+        print(f"\n✗ {title} failed with {len(errors)} error(s)")
+    else:
+        print(f"\n⚠ {title} passed with {len(warnings)} warning(s)")
+
+
+def reports_to_json(reports):
+    """All reports as one JSON-ready dict, with a summary on top."""
+    return {
+        "format_version": REPORT_FORMAT_VERSION,
+        "summary": {
+            "files": len(reports),
+            "passed": sum(1 for report in reports if report.passed),
+            "failed": sum(1 for report in reports if not report.passed),
+            "errors": sum(len(report.errors) for report in reports),
+            "warnings": sum(len(report.warnings) for report in reports),
+            "total_seconds": round(sum(report.timings.get("total", 0.0) for report in reports), 6),
+        },
+        "files": [report.to_dict() for report in reports],
+    }
+
+
+def reports_to_junit(reports):
+    """
+    All reports as a JUnit XML element tree.
+
+    Each file becomes a <testcase>. Errors become a <failure>, warnings are
+    listed in <system-out> so they are visible without failing the build.
+    """
+    suite = ElementTree.Element("testsuite", {
+        "name": "usd-validation",
+        "tests": str(len(reports)),
+        "failures": str(sum(1 for report in reports if not report.passed)),
+        "errors": "0",
+        "time": f"{sum(report.timings.get('total', 0.0) for report in reports):.6f}",
+    })
+    for report in reports:
+        case = ElementTree.SubElement(suite, "testcase", {
+            "classname": f"usd.{report.kind or 'file'}",
+            "name": report.file,
+            "time": f"{report.timings.get('total', 0.0):.6f}",
+        })
+        if not report.passed:
+            failure = ElementTree.SubElement(case, "failure", {
+                "message": f"{len(report.errors)} error(s)",
+                "type": "usd-validation",
+            })
+            failure.text = "\n".join(_format_issue(issue) for issue in report.issues
+                                     if issue["severity"] == "error")
+        if report.warnings:
+            output = ElementTree.SubElement(case, "system-out")
+            output.text = "\n".join(_format_issue(issue) for issue in report.issues
+                                    if issue["severity"] == "warning")
+    suites = ElementTree.Element("testsuites")
+    suites.append(suite)
+    return ElementTree.ElementTree(suites)
+
+
+def _format_issue(issue):
+    """One issue as a single line of text: [code] message (prim, layer)."""
+    where = ", ".join(part for part in (issue["prim"], issue["layer"]) if part)
+    return f"[{issue['code']}] {issue['message']}" + (f" ({where})" if where else "")
+
+
+def write_reports(reports, report_format, output=None):
+    """
+    Write `reports` as "json" or "junit" to the file `output`
+    (or to stdout if no output file is given). "text" writes nothing,
+    because the validators already printed their text report.
+    """
+    if report_format == "text":
+        return
+    if report_format == "json":
+        text = json.dumps(reports_to_json(reports), indent=2) + "\n"
+    elif report_format == "junit":
+        tree = reports_to_junit(reports)
+        if hasattr(ElementTree, "indent"):  # Pretty-printing needs Python 3.9+
+            ElementTree.indent(tree)
+        text = ElementTree.tostring(tree.getroot(), encoding="unicode") + "\n"
+        text = '<?xml version="1.0" encoding="UTF-8"?>\n' + text
+    else:
+        raise ValueError(f"Unknown report format: {report_format}")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as stream:
+            stream.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+@contextlib.contextmanager
+def human_output_for(report_format, output=None):
+    """
+    Keep stdout clean for machine-readable reports.
+
+    When a JSON/JUnit report goes to stdout, the normal human-readable
+    text is sent to stderr instead, so `... --format json > report.json`
+    produces a valid JSON file.
+    """
+    if report_format != "text" and not output:
+        with contextlib.redirect_stdout(sys.stderr):
+            yield
+    else:
+        yield
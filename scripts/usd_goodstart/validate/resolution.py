@@ -0,0 +1,321 @@
+"""
+Asset Path Resolution Helpers
+
+Everything the validators need to turn authored paths (@./020_LYR_USD/file.usda@,
+@../010_ASS_USD/asset.usd@, texture paths, ...) into files on disk:
+- resolve_layer_asset_path(): resolve a path relative to the layer it was written in
+- ReferenceResolutionCache:   resolve + check each unique referenced file only once
+- get_authored_references() / get_authored_payloads(): what a prim points to
+- open_layer() / iter_layer_asset_paths(): layer-level access without a stage
+
+It also holds the state of a batch run (see start_batch_session()), so many
+files validated in one process share parsed layers, reference lookups and
+asset file checks (see asset_files.py).
+"""
+
+# Standard library imports
+import os       # For operating system operations
+from pathlib import Path  # Modern Python path handling
+
+from pxr import Sdf, Ar, Tf
+# Sdf: Scene Description Foundation - low-level layer and data access
+# Ar: Asset Resolution - turns authored asset paths into real file paths
+# Tf: Tools Foundation - USD's error type (raised for unparseable files)
+
+from .asset_files import AssetFileChecker, is_remote_path, is_search_path
+from .probes import TIMED_OUT, run_probes
+
+
+# Attribute types whose values are file paths (textures, MDL files, ...)
+ASSET_VALUE_TYPES = (Sdf.ValueTypeNames.Asset, Sdf.ValueTypeNames.AssetArray)
+
+# Layer registry for batch mode.
+# USD keeps a layer in memory only as long as something holds on to it. When we
+# validate many files in one process we keep every layer we have seen in this dict,
+# so a shared layer (e.g. 0_CUBE.usda, which AssetImport_LYR.usda references and
+# which is also validated on its own) is parsed ONCE and reused by every later stage.
+# It stays None for single-file runs, where there is nothing to share.
+_layer_registry = None
+
+# Reference resolution cache shared by all files of a batch run (None otherwise).
+# See ReferenceResolutionCache below.
+_shared_reference_cache = None
+
+# Asset file checker (textures, MDL, ...) shared by all files of a batch run
+# (None otherwise), so each texture folder is listed once for the whole run.
+_shared_asset_checker = None
+
+# Results of fast_scan.scan_layer() shared by all files of a batch run (None
+# otherwise), so a layer used by many files is scanned once per run.
+_shared_layer_scans = None
+
+
+def start_batch_session():
+    """
+    Start sharing parsed layers and reference lookups between validations.
+
+    Used by batch runs (--tree) and by every --jobs worker process.
+    """
+    global _layer_registry, _shared_reference_cache, _shared_asset_checker, _shared_layer_scans
+    _layer_registry = {}
+    _shared_reference_cache = ReferenceResolutionCache()
+    _shared_asset_checker = AssetFileChecker()
+    _shared_layer_scans = {}
+
+
+def end_batch_session():
+    """Release all layers and cached lookups of the batch run."""
+    global _layer_registry, _shared_reference_cache, _shared_asset_checker, _shared_layer_scans
+    _layer_registry = None
+    _shared_reference_cache = None
+    _shared_asset_checker = None
+    _shared_layer_scans = None
+
+
+def batch_layer_count():
+    """Number of unique layers kept alive by the current batch run."""
+    return len(_layer_registry or ())
+
+
+def shared_reference_cache():
+    """The reference cache of the current batch run, or None outside a batch run."""
+    return _shared_reference_cache
+
+
+def shared_asset_checker():
+    """The asset file checker of the current batch run, or None outside a batch run."""
+    return _shared_asset_checker
+
+
+def shared_layer_scans():
+    """The fast-scan results (layer identifier -> result) of the current batch run, or None outside a batch run."""
+    return _shared_layer_scans
+
+
+def retain_layer(layer):
+    """Keep `layer` alive for the rest of a batch run."""
+    if _layer_registry is not None:
+        _layer_registry.setdefault(layer.identifier, layer)
+
+
+def retain_layers(stage):
+    """Keep all layers used by `stage` alive for the rest of a batch run."""
+    if _layer_registry is None:
+        return
+    for layer in stage.GetUsedLayers():
+        retain_layer(layer)
+
+
+def resolve_layer_asset_path(layer, asset_path):
+    """
+    Resolve an asset path that was authored inside `layer`.
+
+    Relative paths like @./020_LYR_USD/file.usda@ are anchored to the directory of
+    the layer that contains them (exactly like USD composition does), then handed
+    to the asset resolver. Returns the resolved file path as a string, or "" if the
+    asset cannot be found.
+    """
+    anchored_path = Sdf.ComputeAssetPathRelativeToLayer(layer, asset_path)
+    return str(Ar.GetResolver().Resolve(anchored_path))
+
+
+def is_absolute_file_path(asset_path):
+    """
+    True if `asset_path` is an absolute file system path like C:/Projects/... or /mnt/...
+
+    Absolute paths break when projects are moved or shared - USD files should
+    use relative paths like @../010_ASS_USD/asset.usd@ instead.
+    """
+    if not asset_path or asset_path.startswith(("@", "./", "../")):
+        return False
+    # Windows drive letters (C:\, D:/) or Unix absolute paths (/...)
+    return os.path.isabs(asset_path) or (len(asset_path) > 1 and asset_path[1] == ":")
+
+
+class ReferenceResolutionCache:
+    """
+    Remembers how each referenced asset path was resolved.
+
+    Set dressing often references the same few assets thousands of times
+    (e.g. @../010_ASS_USD/0_CUBE.usda@ on every copy of a cube). Resolving the
+    path, checking the file on disk and opening it as a layer is the same work
+    for every copy, so we do it once per unique (anchor layer, asset path) pair
+    and answer all later lookups from memory.
+
+    `hits` and `misses` count how many lookups were answered from the cache
+    and how many had to do the real work.
+
+    On network storage, call prefetch() with all paths first: it checks the
+    files concurrently (see probes.py), so the lookups that follow don't wait
+    for the file system one by one.
+    """
+
+    def __init__(self):
+        self._entries = {}  # (anchor layer identifier, asset path) -> result dict
+        self._probed = {}   # (anchor layer identifier, asset path) -> (file path, exists) from prefetch()
+        self.hits = 0
+        self.misses = 0
+        self.timed_out = 0
+
+    def prefetch(self, asset_paths):
+        """
+        Check the files of many (anchor layer, asset path) pairs at once.
+
+        Only plain file paths are probed in the background (relative and
+        absolute paths). Search paths and URLs are left to the asset resolver,
+        which runs on the main thread when they are looked up.
+        """
+        file_paths = {}  # file path -> keys that point to it
+        for anchor_layer, asset_path in asset_paths:
+            key = (anchor_layer.identifier, asset_path)
+            if key in self._entries or key in self._probed or not asset_path \
+                    or anchor_layer.anonymous or is_remote_path(asset_path) or is_search_path(asset_path):
+                continue
+            file_path = os.path.normpath(Sdf.ComputeAssetPathRelativeToLayer(anchor_layer, asset_path))
+            file_paths.setdefault(file_path, []).append(key)
+        for file_path, exists in run_probes(os.path.exists, sorted(file_paths)).items():
+            for key in file_paths[file_path]:
+                self._probed[key] = (file_path, None if exists == TIMED_OUT else exists)
+
+    def lookup(self, anchor_layer, asset_path):
+        """
+        Resolve `asset_path` as authored in `anchor_layer`.
+
+        Returns a dict with:
+        - "resolved_path": the file path the resolver found ("" if none)
+        - "exists": True if that file exists on disk
+          (None if the file system did not answer within the probe timeout)
+        - "can_open": True if USD can open it as a layer
+        """
+        key = (anchor_layer.identifier, asset_path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        probed = self._probed.pop(key, None)
+        if probed is not None:
+            # Already checked by prefetch(): a plain file path resolves to itself
+            file_path, exists = probed
+            resolved_path = file_path if exists else ""
+            if exists is None:
+                self.timed_out += 1
+        else:
+            resolved_path = resolve_layer_asset_path(anchor_layer, asset_path)
+            exists = bool(resolved_path) and Path(resolved_path).exists()
+        # The stage has usually opened referenced layers already, in which case
+        # FindOrOpen just hands back the layer that is in memory
+        try:
+            can_open = exists and bool(Sdf.Layer.FindOrOpenRelativeToLayer(anchor_layer, asset_path))
+        except Tf.ErrorException:
+            can_open = False  # The file exists but does not parse
+        entry = {"resolved_path": resolved_path, "exists": exists, "can_open": can_open}
+        self._entries[key] = entry
+        return entry
+
+    def summary(self):
+        """One-line description of the cache statistics for reports."""
+        return (f"Reference cache: {self.hits} hit(s), {self.misses} miss(es), "
+                f"{len(self._entries)} unique asset path(s)")
+
+
+def get_authored_references(prim):
+    """
+    Return all references authored on `prim` as (layer, reference) pairs.
+
+    A prim can get opinions from several layers (its "prim stack"). Each layer may
+    add references, and relative reference paths must be resolved against the
+    layer they were written in - so we keep the layer next to each reference.
+    """
+    references = []
+    for prim_spec in prim.GetPrimStack():
+        for ref in prim_spec.referenceList.GetAddedOrExplicitItems():
+            references.append((prim_spec.layer, ref))
+    return references
+
+
+def get_authored_payloads(prim):
+    """
+    Return all payloads authored on `prim` as (layer, payload) pairs.
+
+    Works like get_authored_references(). The payloads are only read from the
+    prim's scene description, so this also works when they are NOT loaded.
+    """
+    payloads = []
+    for prim_spec in prim.GetPrimStack():
+        for payload in prim_spec.payloadList.GetAddedOrExplicitItems():
+            payloads.append((prim_spec.layer, payload))
+    return payloads
+
+
+def open_layer(layer_path):
+    """
+    Open a layer without composing a stage.
+
+    Returns (layer, error message). A file with broken syntax makes USD raise an
+    exception instead of returning None - we turn both cases into a message.
+    """
+    try:
+        layer = Sdf.Layer.FindOrOpen(layer_path)
+    except Tf.ErrorException as exc:
+        details = " ".join(str(exc).split())  # USD's message spans several lines
+        return None, f"Cannot parse layer: {layer_path} ({details})"
+    if not layer:
+        return None, f"Cannot open layer: {layer_path}"
+    retain_layer(layer)
+    return layer, None
+
+
+def iter_layer_asset_paths(layer, kinds=None):
+    """
+    List every external file path authored in ONE layer, without composing anything.
+
+    Returns a list of (kind, asset path, spec path) tuples where kind is one of:
+    - "sublayer":  entries of the layer's subLayers list
+    - "reference": references on prims (also inside variants)
+    - "payload":   payloads on prims (also inside variants)
+    - "asset":     values of asset-valued attributes (textures, MDL files, ...)
+
+    Pass `kinds` (e.g. ("asset",)) to list only those - skipping the others
+    makes the walk over a big layer faster.
+    """
+    kinds = kinds or ("sublayer", "reference", "payload", "asset")
+    want_arcs = "reference" in kinds or "payload" in kinds
+    want_assets = "asset" in kinds
+    found = []
+    if "sublayer" in kinds:
+        for sublayer_path in layer.subLayerPaths:
+            found.append(("sublayer", sublayer_path, layer.pseudoRoot.path))
+
+    def visit(spec_path):
+        if spec_path.IsPrimPath() or spec_path.IsPrimVariantSelectionPath():
+            if not want_arcs:
+                return
+            prim_spec = layer.GetPrimAtPath(spec_path)
+            if not prim_spec:
+                return
+            for ref in prim_spec.referenceList.GetAddedOrExplicitItems():
+                if ref.assetPath and "reference" in kinds:  # Internal references (no file) have no asset path
+                    found.append(("reference", ref.assetPath, spec_path))
+            for payload in prim_spec.payloadList.GetAddedOrExplicitItems():
+                if payload.assetPath and "payload" in kinds:
+                    found.append(("payload", payload.assetPath, spec_path))
+        elif want_assets and spec_path.IsPropertyPath():
+            attr_spec = layer.GetAttributeAtPath(spec_path)
+            if not attr_spec or attr_spec.typeName not in ASSET_VALUE_TYPES:
+                return
+            # Asset attributes can have a default value and/or time samples
+            values = [attr_spec.default]
+            for time in layer.ListTimeSamplesForPath(spec_path):
+                values.append(layer.QueryTimeSample(spec_path, time))
+            for value in values:
+                if isinstance(value, Sdf.AssetPath):
+                    value = [value]  # Treat single values like a one-element array
+                for asset_path in value or []:
+                    if asset_path.path:  # Skip empty @@ values
+                        found.append(("asset", asset_path.path, spec_path))
+
+    # Traverse visits every spec in the layer - prims, variants, properties
+    layer.Traverse(layer.pseudoRoot.path, visit)
+    return found
@@ -0,0 +1,1230 @@
+"""
+Validation Rules
+
+Every check the validators run is a RULE: a small class registered with
+@register_rule. The rule engine (run_rules()) opens nothing itself - it gets a
+composed stage and runs all rules for the file kind ("asset" or "scene"):
+
+1. rule.begin(context)             once per file, before the prim walk
+                                   (layer-level checks: sublayers, metadata, ...)
+2. rule.check_prim(prim, context)  for every prim - ALL rules share ONE
+                                   traversal of the stage instead of each
+                                   walking the prims on its own
+3. rule.finish(context)            once per file, after the prim walk
+
+Rules report problems with context.report.error(...) / .warning(...) using a
+code from ISSUE_CODES (see report.py) or a new code of their own.
+
+Adding your own rule:
+
+    from pxr import UsdGeom
+    from usd_goodstart.validate import Rule, register_rule
+
+    @register_rule
+    class DigitalTwinIdRule(Rule):
+        name = "digital-twin-id"
+        kinds = ("asset",)
+
+        def check_prim(self, prim, context):
+            if prim.IsA(UsdGeom.Mesh) and not prim.HasAttribute("digitalTwin:assetId"):
+                context.report.warning("missing-metadata", f"No digitalTwin:assetId on {prim.GetPath()}",
+                                       prim=prim.GetPath())
+"""
+
+# Standard library imports
+import contextlib  # For optional phase timing
+import itertools  # For walking several prim ranges in a row
+import os       # For normalizing file paths
+from pathlib import Path  # Modern Python path handling
+
+from pxr import Usd, UsdGeom, Sdf, Pcp
+# Usd: Main USD API for stages, prims, and high-level operations
+# UsdGeom: Geometry schemas (Mesh, primvars) for the geometry checks
+# Sdf: Scene Description Foundation - low-level layer and data access
+# Pcp: Prim Cache Population - USD's composition engine (composition errors)
+
+from .asset_files import (
+    MDL_SOURCE_ATTRIBUTE,
+    TEXTURE_EXTENSIONS,
+    UDIM_TOKEN,
+    AssetFileChecker,
+    find_project_root,
+)
+from . import extents, geometry
+from .layer_format import DEFAULT_TEXT_SIZE_LIMIT, is_large_text_layer
+from .memory import current_memory_mb
+from .profiling import active_profiler
+from .probes import TIMED_OUT, run_probes
+from .resolution import (
+    ReferenceResolutionCache,
+    get_authored_payloads,
+    get_authored_references,
+    is_absolute_file_path,
+    iter_layer_asset_paths,
+    resolve_layer_asset_path,
+)
+
+
+# Composition errors that mean a sublayer is broken. Those are errors for a scene
+# (the scene is incomplete without all its layers); other composition errors,
+# like an unresolvable reference, are reported as warnings.
+SUBLAYER_ERROR_TYPES = (
+    Pcp.ErrorType_InvalidSublayerPath,
+    Pcp.ErrorType_InvalidSublayerOffset,
+    Pcp.ErrorType_InvalidSublayerOwnership,
+    Pcp.ErrorType_SublayerCycle,
+)
+
+# Prims visited when payloads are NOT loaded (--load-none).
+# The default Traverse() skips unloaded prims - including the prim that holds
+# the payload - so we use the default filter without the "is loaded" part.
+UNLOADED_TRAVERSAL_PREDICATE = Usd.PrimIsActive & Usd.PrimIsDefined & ~Usd.PrimIsAbstract
+
+# All registered rule classes, in the order they run
+RULES = []
+
+
+class ValidationContext:
+    """
+    Everything the rules need while ONE file is validated.
+
+    Besides the inputs (stage, report, options) it carries values that rules
+    share with each other and with the caller, e.g. the sublayers already
+    reported as broken, and the prim/payload counters for the summary.
+    """
+
+    def __init__(self, stage, report, kind, open_sublayer_stages=False, load_none=False,
+                 mask=None, reference_cache=None, all_instances=False, asset_checker=None,
+                 subtrees=None, single_prims=(), layer_paths_cache=None, all_variants=False,
+                 one_payload_at_a_time=False, payload_memory_limit=None, max_faces=None, max_points=None,
+                 mesh_counts_cache=None):
+        self.stage = stage
+        self.root_layer = stage.GetRootLayer()
+        self.report = report
+        self.kind = kind  # "asset" or "scene"
+        self.open_sublayer_stages = open_sublayer_stages
+        self.load_none = load_none
+        self.mask = mask
+        self.all_instances = all_instances
+        self.all_variants = all_variants  # Also check the variants that are not selected
+        # Load the payloads one by one (the stage was opened without them), see PayloadLoadingRule
+        self.one_payload_at_a_time = one_payload_at_a_time
+        self.payload_memory_limit = payload_memory_limit  # MB, or None
+        # Geometry budget of an asset: faces and points of all its meshes (None = no limit)
+        self.max_faces = max_faces
+        self.max_points = max_points
+        # Only walk these prims (see traverse_stage()) - None means the whole stage
+        self.subtrees = subtrees
+        self.single_prims = single_prims
+        # Shared by all rules that resolve files, so each unique path is checked once
+        self.reference_cache = reference_cache or ReferenceResolutionCache()
+        self.asset_checker = asset_checker or AssetFileChecker()
+        self.broken_sublayers = []  # Anchored paths (@...@) of sublayers reported as broken
+        self.prim_count = 0
+        self.invalid_prim_count = 0
+        self.payload_count = 0
+        self.prototype_count = 0  # Instanced subtrees validated (once each)
+        self.pruned_instance_count = 0  # Instances whose subtree was skipped
+        self.cache_counters = {}  # Cache hits/misses of this file only (set by check_stage())
+        self.prim_issues = {}  # Prim path -> issues its check_prim() calls reported
+        self.prim_rules = []   # The rules run per prim (set by run_rules())
+        # Layer identifier -> paths authored in it (kept between runs by --watch)
+        self.layer_paths_cache = {} if layer_paths_cache is None else layer_paths_cache
+        # Prim path -> (meshes, faces, points) counted there - kept by --watch
+        # so partial runs still add up the geometry of the whole stage
+        self.mesh_counts = {} if mesh_counts_cache is None else mesh_counts_cache
+        self._authored_paths = None
+
+    def authored_paths(self, kind):
+        """
+        Every `kind` path ("reference", "payload", "asset", ...) authored in the
+        layers the stage uses, as (layer, asset path, spec path) tuples.
+
+        The layers are read once per file and shared by all rules, so rules can
+        collect their paths up front and check them in one concurrent batch.
+        """
+        if self._authored_paths is None:
+            self._authored_paths = [(path_kind, layer, asset_path, spec_path)
+                                    for layer in self.stage.GetUsedLayers() if not layer.anonymous
+                                    for path_kind, asset_path, spec_path in self.layer_paths(layer)]
+        return [(layer, asset_path, spec_path)
+                for path_kind, layer, asset_path, spec_path in self._authored_paths if path_kind == kind]
+
+    def layer_paths(self, layer):
+        """The (kind, asset path, spec path) tuples authored in `layer` - read once."""
+        paths = self.layer_paths_cache.get(layer.identifier)
+        if paths is None:
+            paths = self.layer_paths_cache[layer.identifier] = list(iter_layer_asset_paths(layer))
+        return paths
+
+
+class Rule:
+    """
+    Base class of all validation rules.
+
+    Set `name` (unique, e.g. "default-prim") and `kinds` (the file kinds the
+    rule runs for) and override any of begin(), check_prim() and finish().
+    `phase` names the report timing phase for begin()/finish() (optional).
+    Override is_active() for rules that only run with certain options.
+    """
+
+    name = None
+    kinds = ("asset", "scene")
+    phase = None
+
+    def is_active(self, context):
+        """False skips the rule for this file (e.g. an option is off)."""
+        return True
+
+    def begin(self, context):
+        """Called once before the prim traversal."""
+
+    def check_prim(self, prim, context):
+        """Called for every prim of the (fused) traversal."""
+
+    def finish(self, context):
+        """Called once after the prim traversal."""
+
+
+def register_rule(rule_class):
+    """Add `rule_class` to the rules the validators run (usable as a decorator)."""
+    if not rule_class.name:
+        raise ValueError(f"{rule_class.__name__} has no name")
+    if any(existing.name == rule_class.name for existing in RULES):
+        raise ValueError(f"A rule named '{rule_class.name}' is already registered")
+    RULES.append(rule_class)
+    return rule_class
+
+
+def rules_for(kind):
+    """New instances of every registered rule that runs for `kind` files."""
+    return [rule_class() for rule_class in RULES if kind in rule_class.kinds]
+
+
+def traversal_predicate(load_none=False):
+    """
+    The prims the traversal visits.
+
+    Like Traverse(): active, defined, non-abstract prims - and also unloaded
+    prims if load_none=True. On top of that the walk goes INTO instances
+    (instance proxies), so instanced content is validated too.
+    """
+    predicate = UNLOADED_TRAVERSAL_PREDICATE if load_none else Usd.PrimDefaultPredicate
+    return Usd.TraverseInstanceProxies(predicate)
+
+
+def traverse_stage(stage, load_none=False, all_instances=False, context=None,
+                   subtrees=None, single_prims=(), layer_paths_cache=None):
+    """
+    Walk the prims of `stage` once, for all rules (a Usd.PrimRange).
+
+    What about instancing?
+    Instances (instanceable = true) share one PROTOTYPE: 1000 instances of a
+    tree asset all point to the same composed subtree. Validating that subtree
+    1000 times finds the same problems 1000 times. So the subtree below the
+    FIRST instance of each prototype is walked, and for every further instance
+    of that prototype only the instance prim itself is visited - its children
+    are skipped with PruneChildren(). Set all_instances=True to walk every
+    instance anyway.
+
+    Only part of the stage?
+    With `subtrees` (prim paths) only those prims and everything below them are
+    walked, plus the `single_prims` without their children. --watch uses this
+    to revalidate just the prims a saved layer changed (see watch.py).
+
+    Counts validated prototypes and skipped instances on `context` if given.
+    """
+    predicate = traversal_predicate(load_none)
+    if subtrees is None:
+        prim_ranges = [Usd.PrimRange.Stage(stage, predicate)]
+    else:
+        prim_ranges = [Usd.PrimRange(prim, predicate) for prim in map(stage.GetPrimAtPath, subtrees) if prim]
+        prim_ranges.append(_single_prims(stage, subtrees, single_prims, predicate))
+    if all_instances or not stage.GetPrototypes():
+        # Nothing to skip - no per-prim instancing checks needed
+        return prim_ranges[0] if len(prim_ranges) == 1 else itertools.chain(*prim_ranges)
+    return itertools.chain.from_iterable(_prune_repeated_instances(prim_range, context)
+                                         for prim_range in prim_ranges)
+
+
+def _single_prims(stage, subtrees, single_prims, predicate):
+    """The prims at `single_prims` that pass `predicate` and are not inside one of `subtrees`."""
+    for prim_path in single_prims:
+        if any(prim_path.HasPrefix(root) for root in subtrees):
+            continue  # Already walked as part of that subtree
+        prim = stage.GetPrimAtPath(prim_path)
+        if prim and predicate(prim):
+            yield prim
+
+
+def _prune_repeated_instances(prim_range, context):
+    """Yield the prims of `prim_range`, skipping subtrees of already walked prototypes."""
+    iterator = iter(prim_range)
+    if not hasattr(iterator, "PruneChildren"):
+        yield from iterator  # Single prims - there are no children to skip
+        return
+    seen_prototypes = set()
+    for prim in iterator:
+        if prim.IsInstance():
+            prototype = prim.GetPrototype()
+            if prototype in seen_prototypes:
+                iterator.PruneChildren()  # Same subtree as an instance we already walked
+                if context is not None:
+                    context.pruned_instance_count += 1
+            else:
+                seen_prototypes.add(prototype)
+                if context is not None:
+                    context.prototype_count += 1
+        yield prim
+
+
+def run_rules(context, rules=None):
+    """
+    Run `rules` (default: every registered rule for context.kind) on the stage.
+
+    The prims are walked only ONCE; every rule that checks prims sees each prim
+    during that single traversal. Repeated instances are walked only once per
+    prototype (see traverse_stage()), and context.subtrees/single_prims limit
+    the walk to part of the stage.
+
+    The issues found by check_prim() are also recorded per prim in
+    context.prim_issues, so --watch can replace just the ones of changed prims.
+    While profiling (--profile) every call of every rule is timed.
+    """
+    if rules is None:
+        rules = rules_for(context.kind)
+    rules = [rule for rule in rules if rule.is_active(context)]
+    report = context.report
+    # Only rules that actually override check_prim() are called per prim
+    prim_rules = [rule for rule in rules if type(rule).check_prim is not Rule.check_prim]
+    profiler = active_profiler()
+    if profiler:
+        timed_rules = {rule: profiler.timed_rule(rule, report) for rule in rules}
+        rules = [timed_rules[rule] for rule in rules]
+        prim_rules = [timed_rules[rule] for rule in prim_rules]
+
+    def timed(rule):
+        return report.phase(rule.phase) if rule.phase else contextlib.nullcontext()
+
+    for rule in rules:
+        with timed(rule):
+            rule.begin(context)
+
+    context.prim_rules = prim_rules
+    with report.phase("traverse"):
+        for prim in traverse_stage(context.stage, context.load_none, context.all_instances, context,
+                                   context.subtrees, context.single_prims):
+            context.prim_count += 1
+            issue_count = len(report.issues)
+            for rule in prim_rules:
+                rule.check_prim(prim, context)
+            if len(report.issues) > issue_count:
+                context.prim_issues[prim.GetPath()] = report.issues[issue_count:]
+
+    for rule in rules:
+        with timed(rule):
+            rule.finish(context)
+
+
+# ---------------------------------------------------------------------------
+# Built-in rules (they run in this order)
+# ---------------------------------------------------------------------------
+
+@register_rule
+class SublayerResolutionRule(Rule):
+    """
+    Every sublayer of the root layer must resolve, exist and be readable.
+
+    The stage has ALREADY composed every sublayer while opening the file, so
+    we look the sublayers up in the composed layer stack instead of opening
+    them again. Extra disk access only happens for sublayers that are broken.
+    Broken sublayers are errors for scenes (the scene is incomplete) and
+    warnings for assets.
+    """
+
+    name = "sublayer-resolution"
+    phase = "sublayer_checks"
+
+    def begin(self, context):
+        report = context.report
+        root_layer = context.root_layer
+        report_broken = report.error if context.kind == "scene" else report.warning
+
+        sublayers = root_layer.subLayerPaths
+        report.stats["sublayers"] = len(sublayers)
+        if not sublayers:
+            return
+        print(f"\nFound {len(sublayers)} sublayers:")
+        layer_stack = context.stage.GetLayerStack(includeSessionLayers=False)
+        for i, sublayer_path in enumerate(sublayers):
+            print(f"  {i+1}. {sublayer_path}")
+            anchored_path = Sdf.ComputeAssetPathRelativeToLayer(root_layer, sublayer_path)
+            # Sdf.Layer.Find() only looks at layers that are already in memory - no disk access
+            sublayer_layer = Sdf.Layer.Find(anchored_path)
+            if sublayer_layer and sublayer_layer in layer_stack:
+                # Healthy sublayer: resolved, parsed and part of the composed stage
+                if context.open_sublayer_stages:
+                    # Optional (slow): also compose the sublayer as its own stage
+                    sublayer_stage = Usd.Stage.Open(sublayer_layer)
+                    if not sublayer_stage:
+                        report.warning("sublayer-stage-failed",
+                                       f"Sublayer opens but stage validation failed: {sublayer_layer.realPath}",
+                                       layer=sublayer_layer.identifier)
+                continue
+
+            # Sublayer did not make it into the layer stack - find out why
+            context.broken_sublayers.append(f"@{anchored_path}@")
+            resolved_path = resolve_layer_asset_path(root_layer, sublayer_path)
+            if not resolved_path:
+                report_broken("unresolved-sublayer", f"Cannot resolve sublayer: {sublayer_path}",
+                              layer=root_layer.identifier)
+            elif not Path(resolved_path).exists():
+                report_broken("missing-sublayer", f"Missing sublayer file: {resolved_path}",
+                              layer=root_layer.identifier)
+            else:
+                report.warning("unreadable-sublayer", f"Cannot open sublayer: {resolved_path}",
+                               layer=root_layer.identifier)
+
+
+@register_rule
+class CompositionErrorRule(Rule):
+    """
+    Report the errors USD found while composing the scene, e.g. broken nested
+    sublayers, sublayer cycles or references to files that don't exist.
+    """
+
+    name = "composition-errors"
+    kinds = ("scene",)
+    phase = "composition_checks"
+
+    def begin(self, context):
+        for composition_error in context.stage.GetCompositionErrors():
+            message = str(composition_error)
+            if any(broken in message for broken in context.broken_sublayers):
+                continue  # Already reported by the sublayer rule
+            prim_path = getattr(composition_error.rootSite, "path", None)
+            if composition_error.errorType in SUBLAYER_ERROR_TYPES:
+                # Broken sublayers make the scene incomplete -> error
+                context.report.error("composition-error", f"Composition error: {message}", prim=prim_path)
+            else:
+                # Other composition problems (e.g. missing reference) -> warning
+                context.report.warning("composition-error", f"Composition error: {message}", prim=prim_path)
+
+
+@register_rule
+class LayerOrderRule(Rule):
+    """
+    Asset import layers belong at the BOTTOM of the subLayers list (last entry,
+    weakest opinion), so every other layer can override the imported assets.
+    """
+
+    name = "layer-order"
+    kinds = ("scene",)
+
+    def begin(self, context):
+        sublayers = context.root_layer.subLayerPaths
+        if not sublayers:
+            return
+        last_layer = sublayers[-1]
+        if "AssetImport" in last_layer or "asset" in last_layer.lower():
+            print("✓ Asset import layer correctly positioned at bottom")
+        else:
+            context.report.warning("layer-order", "Consider placing asset import layer at bottom of subLayers array",
+                                   layer=context.root_layer.identifier)
+
+
+@register_rule
+class DefaultPrimRule(Rule):
+    """
+    A default prim tells tools which prim to focus on when opening the file.
+    Not required, but recommended for better tool compatibility.
+    """
+
+    name = "default-prim"
+
+    def begin(self, context):
+        # A mask may hide the default prim, so then only the metadata is checked
+        if context.stage.GetDefaultPrim() or (context.mask and context.root_layer.defaultPrim):
+            return
+        context.report.warning("no-default-prim", f"No default prim set (recommended for {context.kind} files)",
+                               layer=context.root_layer.identifier)
+
+
+@register_rule
+class AbsolutePathRule(Rule):
+    """
+    Sublayers, references and payloads should use relative paths
+    (e.g. @../010_ASS_USD/asset.usd@) - absolute paths break when the project
+    is moved or shared.
+    """
+
+    name = "absolute-paths"
+
+    def begin(self, context):
+        for sublayer_path in context.root_layer.subLayerPaths:
+            if is_absolute_file_path(sublayer_path):
+                context.report.warning("absolute-path",
+                                       f"Absolute file path detected in sublayer: '{sublayer_path}'. "
+                                       "Consider using relative paths (e.g., @./020_LYR_USD/file.usda@) for portability.",
+                                       layer=context.root_layer.identifier)
+
+    def check_prim(self, prim, context):
+        arcs = []
+        if prim.HasAuthoredReferences():
+            arcs.extend(("reference", layer, ref.assetPath) for layer, ref in get_authored_references(prim))
+        if prim.HasAuthoredPayloads():
+            arcs.extend(("payload", layer, payload.assetPath) for layer, payload in get_authored_payloads(prim))
+        if not arcs:
+            return
+        prim_path = prim.GetPath()  # Looked up once, used by every message
+        for arc_kind, layer, asset_path in arcs:
+            if is_absolute_file_path(asset_path):
+                context.report.warning("absolute-path",
+                                       f"Absolute file path detected in {arc_kind}: '{asset_path}' at prim '{prim_path}'. "
+                                       "Consider using relative paths (e.g., @../010_ASS_USD/asset.usd@) for portability.",
+                                       prim=prim_path, layer=layer.identifier)
+
+
+@register_rule
+class ValidPrimRule(Rule):
+    """Every prim in the composed stage must be valid."""
+
+    name = "valid-prims"
+
+    def check_prim(self, prim, context):
+        if not prim.IsValid():
+            context.invalid_prim_count += 1
+            context.report.error("invalid-prim", f"Invalid prim: {prim.GetPath()}", prim=prim.GetPath())
+
+
+@register_rule
+class ReferenceResolutionRule(Rule):
+    """
+    Every referenced file must exist and be readable.
+
+    Missing references are warnings (not errors): the file might be in a
+    different location, loaded from a server (Nucleus) or created later.
+    Scenes get the same information from their composition errors.
+    """
+
+    name = "reference-resolution"
+    kinds = ("asset",)
+    phase = "reference_checks"
+
+    def begin(self, context):
+        # Check every referenced file up front, concurrently - the per-prim
+        # lookups below are then answered from memory
+        context.reference_cache.prefetch((layer, asset_path)
+                                         for layer, asset_path, _ in context.authored_paths("reference"))
+
+    def check_prim(self, prim, context):
+        if not prim.HasAuthoredReferences():
+            return
+        prim_path = prim.GetPath()  # Looked up once, used by every message
+        report = context.report
+        with report.phase("reference_checks"):
+            for ref_layer, ref in get_authored_references(prim):
+                ref_path = ref.assetPath
+                if not ref_path:
+                    continue  # Internal reference (points into the same file)
+                # Resolve, check and open the referenced file - or reuse the
+                # answer if the same reference was already checked before
+                result = context.reference_cache.lookup(ref_layer, ref_path)
+                if result["exists"] is None:
+                    report.warning("probe-timeout",
+                                   f"File system did not answer in time - could not check reference: {ref_path} "
+                                   f"at {prim_path}", prim=prim_path, layer=ref_layer.identifier)
+                elif not result["exists"]:
+                    report.warning("missing-reference", f"Potential missing reference: {ref_path} at {prim_path}",
+                                   prim=prim_path, layer=ref_layer.identifier)
+                elif not result["can_open"]:
+                    report.warning("unreadable-reference",
+                                   f"Referenced file cannot be opened as USD: {result['resolved_path']} at {prim_path}",
+                                   prim=prim_path, layer=ref_layer.identifier)
+
+
+@register_rule
+class PayloadResolutionRule(Rule):
+    """
+    Payload inspection: every payload file must exist and be readable - checked
+    on disk, WITHOUT loading the payload into the stage.
+
+    Runs for assets, and for scenes opened with load_none=True (loaded scene
+    payloads are already covered by the composition errors).
+    """
+
+    name = "payload-resolution"
+    phase = "payload_checks"
+
+    def is_active(self, context):
+        return context.kind == "asset" or context.load_none
+
+    def begin(self, context):
+        context.reference_cache.prefetch((layer, asset_path)
+                                         for layer, asset_path, _ in context.authored_paths("payload"))
+
+    def check_prim(self, prim, context):
+        if not prim.HasAuthoredPayloads():
+            return
+        prim_path = prim.GetPath()  # Looked up once, used by every message
+        report = context.report
+        with report.phase("payload_checks"):
+            for payload_layer, payload in get_authored_payloads(prim):
+                context.payload_count += 1
+                if not payload.assetPath:
+                    continue  # Internal payload (points into the same file)
+                result = context.reference_cache.lookup(payload_layer, payload.assetPath)
+                if result["exists"] is None:
+                    report.warning("probe-timeout",
+                                   f"File system did not answer in time - could not check payload: "
+                                   f"{payload.assetPath} at {prim_path}", prim=prim_path, layer=payload_layer.identifier)
+                elif not result["exists"]:
+                    report.warning("missing-payload",
+                                   f"Missing payload: {payload.assetPath} at {prim_path}",
+                                   prim=prim_path, layer=payload_layer.identifier)
+                elif not result["can_open"]:
+                    report.warning("unreadable-payload",
+                                   f"Payload file cannot be opened as USD: {result['resolved_path']} at {prim_path}",
+                                   prim=prim_path, layer=payload_layer.identifier)
+
+
+@register_rule
+class AssetFileRule(Rule):
+    """
+    Every asset-valued attribute (textures, MDL files, ...) must point to an
+    existing file, with a path that still works on another machine.
+
+    The paths are read from the layers the stage uses (not prim by prim) and
+    each unique path is checked once, using one listing per folder (see
+    asset_files.py) - thousands of textures cost a handful of folder reads.
+    Reported as warnings:
+    - missing files (for a UDIM path: not a single tile)
+    - paths that only match a file with different upper/lower case
+    - absolute paths, and relative paths that leave the project folder
+    """
+
+    name = "asset-files"
+    phase = "asset_checks"
+
+    def begin(self, context):
+        path_count, missing_count = self.check_asset_paths(context, context.authored_paths("asset"))
+        context.report.stats.update(asset_paths=path_count, missing_asset_files=missing_count)
+
+    def check_asset_paths(self, context, authored_paths):
+        """
+        Check the (layer, asset path, spec path) tuples `authored_paths`.
+        Returns (number of unique paths, number of missing files).
+        """
+        report = context.report
+        checker = context.asset_checker
+        project_root = find_project_root(context.root_layer.realPath, checker.directories)
+
+        # Collect first, so a path used by many attributes is reported once
+        uses = {}  # (layer identifier, asset path) -> (layer, [spec paths])
+        for layer, asset_path, spec_path in authored_paths:
+            uses.setdefault((layer.identifier, asset_path), (layer, []))[1].append(spec_path)
+        # List all the folders involved at once (concurrently), then check from memory
+        checker.prefetch((layer, asset_path) for (_, asset_path), (layer, _) in uses.items())
+
+        missing_count = 0
+        for (_, asset_path), (layer, spec_paths) in uses.items():
+            where = f"{spec_paths[0]} in {layer.identifier}"
+            if len(spec_paths) > 1:
+                where += f" (+{len(spec_paths) - 1} more)"
+            prim_path = spec_paths[0].GetPrimPath().StripAllVariantSelections()
+
+            if is_absolute_file_path(asset_path):
+                report.warning("absolute-path",
+                               f"Absolute file path detected in asset attribute: '{asset_path}' at {where}. "
+                               "Consider using relative paths (e.g., @../030_TEX/texture.png@) for portability.",
+                               prim=prim_path, layer=layer.identifier)
+
+            result = checker.check(layer, asset_path)
+            status = result["status"]
+            is_mdl = spec_paths[0].name == MDL_SOURCE_ATTRIBUTE
+            if status == "search-path" and not is_mdl:
+                status = "missing"  # Only MDL names are expected to come from the renderer
+            # Relative paths that climb out of the project break when only the
+            # project folder is copied or checked out somewhere else
+            outside_project = asset_path.startswith(("./", "../")) and not _is_inside(result["path"], project_root)
+
+            if status == "timeout":
+                report.warning("probe-timeout",
+                               f"File system did not answer in time - could not check: {asset_path} at {where}",
+                               prim=prim_path, layer=layer.identifier)
+                continue
+            if status == "missing":
+                if UDIM_TOKEN in asset_path:
+                    message = f"No UDIM tiles found for: {asset_path} at {where}"
+                else:
+                    message = f"Missing {'MDL file' if is_mdl else 'asset file'}: {asset_path} at {where}"
+                if outside_project:
+                    message += f" - points outside the project folder {project_root}"
+                if asset_path.lower().endswith(TEXTURE_EXTENSIONS):
+                    message += " - textures belong in 030_TEX"
+                missing_count += 1
+                report.warning("missing-asset-file", message, prim=prim_path, layer=layer.identifier)
+                continue
+            if status == "case-mismatch":
+                report.warning("asset-path-case",
+                               f"Asset path differs in upper/lower case from the file on disk "
+                               f"('{result['actual_name']}'): {asset_path} at {where}",
+                               prim=prim_path, layer=layer.identifier)
+            if outside_project:
+                report.warning("asset-outside-project",
+                               f"Asset path points outside the project folder {project_root}: "
+                               f"{asset_path} at {where}",
+                               prim=prim_path, layer=layer.identifier)
+
+        return len(uses), missing_count
+
+
+@register_rule
+class LayerFormatRule(Rule):
+    """
+    Big layers should be binary crate (.usdc), not text (.usda).
+
+    Opening a text layer means parsing every number in it - for heavy geometry
+    that is one of the biggest costs of opening a stage. Text layers of at
+    least `size_limit` bytes are reported as warnings (small text layers that
+    people edit by hand are fine). scripts/usd_format.py measures and converts.
+    """
+
+    name = "layer-format"
+    phase = "format_checks"
+    size_limit = DEFAULT_TEXT_SIZE_LIMIT
+
+    def begin(self, context):
+        # Crate layers are known from their format; ".usd" files can be either
+        # and are looked at on disk (only if they are big, see is_large_text_layer())
+        file_paths = [layer.realPath for layer in context.stage.GetUsedLayers()
+                      if not layer.anonymous and layer.realPath and "[" not in layer.realPath
+                      and layer.GetFileFormat().formatId in ("usda", "usd")]
+        sizes = run_probes(lambda file_path: is_large_text_layer(file_path, self.size_limit), file_paths)
+        for file_path in file_paths:
+            size = sizes[file_path]
+            if size and size != TIMED_OUT:
+                context.report.warning("large-text-layer",
+                                       f"Large text layer ({size / (1024 * 1024):.1f} MB): {file_path} - "
+                                       "binary crate (.usdc) opens faster, see scripts/usd_format.py",
+                                       layer=file_path)
+
+
+@register_rule
+class MeshGeometryRule(Rule):
+    """
+    Mesh topology and geometry budget of assets (needs NumPy, see geometry.py).
+
+    Every mesh is checked with whole-array NumPy operations, never per point:
+    - faceVertexIndices must point into points, and faceVertexCounts must add
+      up to the number of indices (errors - renderers crash or drop the mesh)
+    - points must not be NaN or infinite (error)
+    - faces need 3 or more vertices and an area (warnings)
+    - normals and primvars need as many values as their interpolation says,
+      and indexed primvars valid indices
+
+    The faces and points of all meshes are added up and compared with the
+    budget (max_faces/max_points, see --max-faces/--max-points). Meshes inside
+    instances count once per prototype, like every prim check. The counts are
+    kept per prim (context.mesh_counts): a --watch run that checks only the
+    changed prims replaces their counts and adds up all of them.
+    """
+
+    name = "mesh-geometry"
+    kinds = ("asset",)
+    phase = "geometry_checks"
+    _numpy_note_shown = False
+
+    def is_active(self, context):
+        if geometry.numpy is None:
+            if not MeshGeometryRule._numpy_note_shown:
+                MeshGeometryRule._numpy_note_shown = True
+                print("Note: mesh geometry checks skipped - NumPy is not installed (pip install numpy)")
+            return False
+        return True
+
+    def begin(self, context):
+        self.counted = set()  # Prim paths counted in this run
+        self.small_mesh_findings = {}  # Array bytes -> findings (see check_mesh())
+        if context.subtrees is None:
+            context.mesh_counts.clear()
+        else:
+            # Only these prims are checked again - forget their old counts
+            for prim_path in list(context.mesh_counts):
+                if prim_path in context.single_prims or any(prim_path.HasPrefix(root) for root in context.subtrees):
+                    del context.mesh_counts[prim_path]
+
+    def check_prim(self, prim, context):
+        if not prim.IsA(UsdGeom.Mesh):
+            return
+        with context.report.phase("geometry_checks"):
+            self.check_mesh(UsdGeom.Mesh(prim), context)
+
+    def check_mesh(self, mesh, context):
+        """Check the topology arrays and primvars of one mesh."""
+        time = Usd.TimeCode.EarliestTime()  # The default value, or the first time sample
+        points = geometry.as_array(mesh.GetPointsAttr().Get(time))
+        counts = geometry.as_array(mesh.GetFaceVertexCountsAttr().Get(time))
+        indices = geometry.as_array(mesh.GetFaceVertexIndicesAttr().Get(time))
+        if points is None or counts is None or indices is None:
+            return  # Not a complete mesh (e.g. only an override)
+        prim_path = mesh.GetPath()
+        if prim_path not in self.counted:  # Counted again in this run (e.g. another variant): add up
+            self.counted.add(prim_path)
+            context.mesh_counts[prim_path] = (0, 0, 0)
+        meshes, faces, point_total = context.mesh_counts[prim_path]
+        context.mesh_counts[prim_path] = (meshes + 1, faces + len(counts), point_total + len(points))
+
+        report = context.report
+        if len(points) <= geometry.SMALL_MESH_POINTS:
+            # The same small mesh often comes in many times (an asset referenced
+            # over and over) - for tiny arrays the NumPy calls cost more than the
+            # math, so check each distinct mesh only once
+            key = (points.tobytes(), counts.tobytes(), indices.tobytes())
+            findings = self.small_mesh_findings.get(key)
+            if findings is None:
+                findings = self.small_mesh_findings[key] = geometry.check_mesh_arrays(points, counts, indices)
+        else:
+            findings = geometry.check_mesh_arrays(points, counts, indices)
+        if "count_mismatch" in findings:
+            index_total, index_count = findings["count_mismatch"]
+            report.error("mesh-topology", f"Mesh faceVertexCounts add up to {index_total}, but there are "
+                                          f"{index_count} faceVertexIndices: {prim_path}", prim=prim_path)
+        if "bad_indices" in findings:
+            bad = findings["bad_indices"]
+            report.error("mesh-topology", f"Mesh has {len(bad)} faceVertexIndices outside of its {len(points)} "
+                                          f"points (positions {geometry.examples(bad)}): {prim_path}", prim=prim_path)
+        if "non_finite_points" in findings:
+            bad = findings["non_finite_points"]
+            report.error("invalid-points", f"Mesh has {len(bad)} NaN/infinite point(s) "
+                                           f"(points {geometry.examples(bad)}): {prim_path}", prim=prim_path)
+        if "small_faces" in findings:
+            bad = findings["small_faces"]
+            report.warning("degenerate-face", f"Mesh has {len(bad)} face(s) with fewer than 3 vertices "
+                                              f"(faces {geometry.examples(bad)}): {prim_path}", prim=prim_path)
+        if "degenerate_faces" in findings:
+            bad = findings["degenerate_faces"]
+            report.warning("degenerate-face", f"Mesh has {len(bad)} face(s) without area "
+                                              f"(faces {geometry.examples(bad)}): {prim_path}", prim=prim_path)
+        if "count_mismatch" not in findings:
+            self.check_primvars(mesh, len(points), len(counts), len(indices), time, context)
+
+    def check_primvars(self, mesh, point_count, face_count, index_count, time, context):
+        """Check the size (and indices) of the normals and of every primvar of `mesh`."""
+        prim_path = mesh.GetPath()
+        report = context.report
+        checks = []  # (name, interpolation, element size, values, indices)
+        normals_attr = mesh.GetNormalsAttr()
+        if normals_attr.HasAuthoredValue():
+            checks.append(("normals", mesh.GetNormalsInterpolation(), 1, normals_attr.Get(time), None))
+        for primvar in UsdGeom.PrimvarsAPI(mesh).GetPrimvarsWithAuthoredValues():
+            checks.append((primvar.GetPrimvarName(), primvar.GetInterpolation(), primvar.GetElementSize(),
+                           primvar.Get(time), primvar.GetIndices(time) if primvar.IsIndexed() else None))
+
+        for name, interpolation, element_size, values, indices in checks:
+            expected = geometry.expected_primvar_size(interpolation, point_count, face_count, index_count)
+            if expected is None or not hasattr(values, "__len__") or isinstance(values, str):
+                continue  # Unknown interpolation, or a single value (not an array)
+            findings = geometry.check_primvar_arrays(geometry.as_array(values), geometry.as_array(indices),
+                                                     expected * element_size)
+            if "size" in findings:
+                size, expected_size = findings["size"]
+                report.warning("primvar-size", f"{name} ({interpolation}) has {size} value(s), the mesh needs "
+                                               f"{expected_size}: {prim_path}", prim=prim_path)
+            if "bad_indices" in findings:
+                bad = findings["bad_indices"]
+                report.error("primvar-index", f"{name} has {len(bad)} index(es) outside of its {len(values)} "
+                                              f"value(s) (positions {geometry.examples(bad)}): {prim_path}",
+                             prim=prim_path)
+            if "non_finite" in findings:
+                bad = findings["non_finite"]
+                report.warning("invalid-primvar-values",
+                               f"{name} has {len(bad)} NaN/infinite value(s) "
+                               f"(elements {geometry.examples(bad)}): {prim_path}", prim=prim_path)
+
+    def finish(self, context):
+        report = context.report
+        meshes, faces, points = (sum(values) for values in zip((0, 0, 0), *context.mesh_counts.values()))
+        report.stats.update(meshes=meshes, mesh_faces=faces, mesh_points=points)
+        if meshes:
+            print(f"Geometry: {meshes} mesh(es), {faces:,} face(s), {points:,} point(s)")
+        for label, total, budget in (("faces", faces, context.max_faces),
+                                     ("points", points, context.max_points)):
+            if budget is not None and total > budget:
+                report.warning("geometry-budget", f"Asset has {total:,} {label} - over the budget of {budget:,}")
+
+
+@register_rule
+class ExtentRule(Rule):
+    """
+    Missing and stale extents of gprims, and stale extentsHints of models
+    (see extents.py).
+
+    The extent of every gprim (Mesh, Sphere, ...) is computed from its
+    geometry and compared with the authored one. Models that have an
+    extentsHint are collected during the traversal; finish() computes their
+    hints with ONE BBoxCache for the whole stage, so nested models reuse the
+    bounds of their children instead of adding them up again.
+    Extents are compared at the earliest time (default value or first sample).
+    Fix them with author_extents.py.
+    """
+
+    name = "extents"
+    phase = "extent_checks"
+
+    def begin(self, context):
+        self.gprim_count = 0
+        self.hinted_models = []  # Models with an authored extentsHint, checked in finish()
+
+    def check_prim(self, prim, context):
+        if not prim.IsA(UsdGeom.Gprim):
+            if prim.IsModel() and UsdGeom.ModelAPI(prim).GetExtentsHintAttr().HasAuthoredValue():
+                self.hinted_models.append(prim)
+            return
+        self.gprim_count += 1
+        with context.report.phase("extent_checks"):
+            computed = extents.computed_extent(prim)
+            if computed is None:
+                return  # No extent computation for this type
+            prim_path = prim.GetPath()
+            extent_attr = UsdGeom.Boundable(prim).GetExtentAttr()
+            # Sphere, Cube, Cone, ... have a fallback extent (for their default
+            # size) - Get() returns it when nothing is authored
+            authored = extent_attr.Get(extents.EXTENT_TIME) if extent_attr.HasAuthoredValue() else None
+            if authored is None:
+                context.report.warning("missing-extent", f"Gprim has no extent - renderers compute its bounds "
+                                                         f"when loading: {prim_path}", prim=prim_path)
+            elif extents.bounds_differ(authored, computed):
+                context.report.warning("stale-extent", f"extent {extents.format_extent(authored)} does not match "
+                                                       f"the geometry {extents.format_extent(computed)}: "
+                                                       f"{prim_path}", prim=prim_path)
+
+    def finish(self, context):
+        context.report.stats["gprims"] = self.gprim_count
+        bbox_cache = extents.new_bbox_cache()  # Shared by all models
+        for prim in self.hinted_models:
+            authored = UsdGeom.ModelAPI(prim).GetExtentsHintAttr().Get(extents.EXTENT_TIME)
+            computed = extents.computed_extents_hint(prim, bbox_cache)
+            if extents.bounds_differ(authored, computed):
+                context.report.warning("stale-extent", f"extentsHint {extents.format_extent(authored)} does not "
+                                                       f"match the model's prims {extents.format_extent(computed)}: "
+                                                       f"{prim.GetPath()}", prim=prim.GetPath())
+
+
+class _RecomposingRule(Rule):
+    """
+    Base of the rules that change what the stage composes - select another
+    variant, load a payload - and check the prims that appear.
+
+    check_subtree() runs the prim rules on the recomposed subtree, checks the
+    asset paths of layers that only came in now, reports new composition
+    errors (scenes) and labels the new findings with where they were found.
+    Findings that were already reported (e.g. for the prims as opened) are
+    dropped, so nothing is reported twice.
+    """
+
+    def begin(self, context):
+        self.found_prims = []  # Paths collected by check_prim(), in traversal order
+
+    def start_rechecks(self, context):
+        """Remember what is already known about the stage (call once before check_subtree())."""
+        stage = context.stage
+        self.seen_issues = {_issue_key(issue) for issue in context.report.issues}
+        self.seen_errors = {str(error) for error in stage.GetCompositionErrors()} if context.kind == "scene" else set()
+        self.known_layers = {layer.identifier for layer in stage.GetUsedLayers()}
+
+    def check_subtree(self, context, prim_path, owner, label):
+        """
+        Run the prim rules on `prim_path` and everything below it, as the stage
+        composes it right now. New findings get "(in `label`)" and are recorded
+        for the prim `owner` (so --watch keeps them like other prim findings).
+
+        Returns the paths check_prim() collected below `prim_path`.
+        """
+        report = context.report
+        issue_count = len(report.issues)
+        payload_count = context.payload_count  # The summary counts the payloads of the stage as opened
+        self.found_prims = []
+        for prim in traverse_stage(context.stage, context.load_none, context.all_instances, subtrees=[prim_path]):
+            self.stats["rechecked_prims"] += 1
+            for rule in context.prim_rules:
+                rule.check_prim(prim, context)  # Also collects the prims this rule handles next
+        context.payload_count = payload_count
+        self._check_new_layers(context)
+        if context.kind == "scene":
+            self._check_composition_errors(context)
+        self._label_new_issues(context, issue_count, owner, label)
+
+        found, self.found_prims = self.found_prims, []
+        return [path for path in found if path != prim_path]
+
+    def _check_new_layers(self, context):
+        """Check the asset paths of layers that were not part of the stage before."""
+        new_layers = [layer for layer in context.stage.GetUsedLayers()
+                      if not layer.anonymous and layer.identifier not in self.known_layers]
+        if not new_layers:
+            return
+        self.known_layers.update(layer.identifier for layer in new_layers)
+        authored_paths = [(layer, asset_path, spec_path) for layer in new_layers
+                          for path_kind, asset_path, spec_path in context.layer_paths(layer)
+                          if path_kind == "asset"]
+        path_count, missing_count = AssetFileRule().check_asset_paths(context, authored_paths)
+        stats = context.report.stats
+        stats["asset_paths"] = stats.get("asset_paths", 0) + path_count
+        stats["missing_asset_files"] = stats.get("missing_asset_files", 0) + missing_count
+
+    def _check_composition_errors(self, context):
+        """Report the composition errors that are new (scenes, see CompositionErrorRule)."""
+        for composition_error in context.stage.GetCompositionErrors():
+            message = str(composition_error)
+            if message in self.seen_errors:
+                continue
+            self.seen_errors.add(message)
+            context.report.warning("composition-error", f"Composition error: {message}",
+                                   prim=getattr(composition_error.rootSite, "path", None))
+
+    def _label_new_issues(self, context, issue_count, owner, label):
+        """Drop the new issues that were already found and add `label` to the others."""
+        report = context.report
+        new_issues = []
+        for issue in report.issues[issue_count:]:
+            key = _issue_key(issue)
+            if key in self.seen_issues:
+                continue
+            self.seen_issues.add(key)
+            issue["message"] += f" (in {label})"
+            new_issues.append(issue)
+        report.issues[issue_count:] = new_issues
+        if new_issues:
+            context.prim_issues.setdefault(owner, []).extend(new_issues)
+
+
+@register_rule
+class VariantCoverageRule(_RecomposingRule):
+    """
+    Check every variant of every variant set, not only the selected ones
+    (only with all_variants=True, see --all-variants).
+
+    The traversal only sees the SELECTED variant of each variant set, so a
+    broken reference in another variant goes unnoticed until someone selects
+    it. Opening the file once per combination would cost
+    (variants of set 1) x (variants of set 2) x ... compositions. Instead:
+    1. The variant specs are inspected at the layer level first. A variant
+       without references or payloads needs no composing - its texture and
+       other asset paths are already checked by the asset-files rule, which
+       reads every spec of every layer, variants included.
+    2. Every other variant is selected ONCE, on the same stage, in its session
+       layer (Usd.EditContext) - the other variant sets keep their selection.
+       USD recomposes just the subtree of that prim, the prim rules check it,
+       and the selection is removed again.
+    So the work grows with the number of variants, not with their product.
+    Variant sets that only exist inside a variant are covered while that
+    variant is selected. Variant sets inside instances are skipped (instance
+    proxies cannot be edited).
+
+    Findings name the variant they were found in, e.g.
+    "... (in variant model=broken of /Asset)".
+    """
+
+    name = "variant-coverage"
+    phase = "variant_checks"
+
+    def is_active(self, context):
+        return context.all_variants
+
+    def begin(self, context):
+        super().begin(context)
+        self.covered = set()    # (prim path, variant set, variant) already checked
+        self.arc_variants = {}  # Layer identifier -> variant spec paths with references/payloads
+        self.stats = {"variants": 0, "composed_variants": 0, "rechecked_prims": 0}
+
+    def check_prim(self, prim, context):
+        if prim.HasVariantSets() and not prim.IsInstanceProxy():
+            self.found_prims.append(prim.GetPath())
+
+    def finish(self, context):
+        self.start_rechecks(context)
+        prim_paths, self.found_prims = self.found_prims, []
+        for prim_path in prim_paths:
+            self._cover_prim(prim_path, context)
+
+        stats = self.stats
+        context.report.stats.update(variants=stats["variants"], composed_variants=stats["composed_variants"],
+                                    variant_prims=stats["rechecked_prims"])
+        if stats["variants"]:
+            print(f"\nVariants: {stats['variants']} not selected variant(s) checked, "
+                  f"{stats['composed_variants']} composed (the others add no references or payloads)")
+
+    def _cover_prim(self, prim_path, context, owner=None):
+        """
+        Check the variants of every variant set of the prim at `prim_path` that
+        are not selected. `owner` is the prim whose variant made these variant
+        sets appear (None for the variant sets of the stage as opened).
+        """
+        prim = context.stage.GetPrimAtPath(prim_path)
+        if not prim:
+            return
+        variant_sets = prim.GetVariantSets()
+        for set_name in variant_sets.GetNames():
+            variant_set = variant_sets.GetVariantSet(set_name)
+            selected = variant_set.GetVariantSelection()
+            self.covered.add((prim_path, set_name, selected))  # Checked by the normal traversal
+            for variant_name in variant_set.GetVariantNames():
+                if (prim_path, set_name, variant_name) in self.covered:
+                    continue
+                self.covered.add((prim_path, set_name, variant_name))
+                self.stats["variants"] += 1
+                if self._adds_arcs(prim, set_name, variant_name, context):
+                    self._check_variant(prim_path, set_name, variant_name, context, owner or prim_path)
+
+    def _adds_arcs(self, prim, set_name, variant_name, context):
+        """True if a layer authors references or payloads inside this variant (no composing needed to tell)."""
+        for prim_spec in prim.GetPrimStack():
+            variant_path = prim_spec.path.AppendVariantSelection(set_name, variant_name)
+            if variant_path in self._arc_variants(prim_spec.layer, context):
+                return True
+        return False
+
+    def _arc_variants(self, layer, context):
+        """The variant spec paths in `layer` that contain a reference or payload (read once per layer)."""
+        variant_paths = self.arc_variants.get(layer.identifier)
+        if variant_paths is None:
+            variant_paths = self.arc_variants[layer.identifier] = {
+                prefix
+                for path_kind, _, spec_path in context.layer_paths(layer) if path_kind in ("reference", "payload")
+                for prefix in spec_path.GetPrefixes() if prefix.IsPrimVariantSelectionPath()}
+        return variant_paths
+
+    def _check_variant(self, prim_path, set_name, variant_name, context, owner):
+        """Select the variant, check the recomposed subtree, then select back."""
+        with _selected_variant(context.stage, prim_path, set_name, variant_name):
+            self.stats["composed_variants"] += 1
+            nested = self.check_subtree(context, prim_path, owner,
+                                        f"variant {set_name}={variant_name} of {prim_path}")
+            # Variant sets below this prim (e.g. only defined inside this variant)
+            for nested_path in nested:
+                self._cover_prim(nested_path, context, owner)
+
+
+@register_rule
+class PayloadLoadingRule(_RecomposingRule):
+    """
+    Load the payloads ONE AT A TIME and validate what is inside them
+    (only with one_payload_at_a_time=True, see --payloads-one-at-a-time).
+
+    With all payloads loaded, a set needs the memory of all its heavy assets
+    at once. Without payloads (--load-none) the payload files are checked on
+    disk, but nothing inside them is validated. Here the stage is opened
+    without payloads; then each payload is loaded on its own (stage.Load),
+    its prims are checked by the prim rules, and it is unloaded again
+    (stage.Unload) before the next one. Peak memory stays at about the stage
+    plus the biggest payload. Payloads inside a payload are loaded while
+    their parent payload is loaded.
+
+    payload_memory_limit (MB): no further payload is loaded while the process
+    uses more memory than that. Those payloads are reported as
+    "payload-not-loaded" and only checked on disk.
+    """
+
+    name = "payload-loading"
+    phase = "payload_loading"
+
+    def is_active(self, context):
+        return context.one_payload_at_a_time
+
+    def begin(self, context):
+        super().begin(context)
+        self.done = set()  # Prim paths whose payload was handled
+        self.stats = {"rechecked_prims": 0}
+        self.loaded_count = 0
+        self.skipped_count = 0
+        self.peak_memory = None       # MB, highest while a payload was loaded
+        self.largest = (0.0, None)    # (MB the payload added, prim path)
+
+    def check_prim(self, prim, context):
+        if prim.HasAuthoredPayloads() and not prim.IsLoaded() and not prim.IsInstanceProxy():
+            self.found_prims.append(prim.GetPath())
+
+    def finish(self, context):
+        self.start_rechecks(context)
+        prim_paths, self.found_prims = self.found_prims, []
+        for prim_path in prim_paths:
+            self._load_and_check(prim_path, context)
+
+        report = context.report
+        report.stats.update(loaded_payloads=self.loaded_count, payloads_not_loaded=self.skipped_count,
+                            payload_prims=self.stats["rechecked_prims"])
+        if self.peak_memory is not None:
+            report.stats["payload_peak_memory_mb"] = round(self.peak_memory, 1)
+        summary = f"\nPayloads: {self.loaded_count} loaded one at a time and unloaded again"
+        if self.skipped_count:
+            summary += f", {self.skipped_count} not loaded (memory limit)"
+        if self.largest[1]:
+            summary += (f" - peak memory {self.peak_memory:.0f} MB, "
+                        f"largest: {self.largest[1]} (+{self.largest[0]:.0f} MB)")
+        print(summary)
+
+    def _load_and_check(self, prim_path, context, owner=None):
+        """Load the payload of the prim at `prim_path`, check its prims and nested payloads, unload it."""
+        stage = context.stage
+        prim = stage.GetPrimAtPath(prim_path)
+        if prim_path in self.done or not prim or prim.IsLoaded():
+            return  # E.g. seen while another variant was selected
+        self.done.add(prim_path)
+
+        limit = context.payload_memory_limit
+        memory_before = current_memory_mb()
+        if limit is not None and memory_before is not None and memory_before > limit:
+            self.skipped_count += 1
+            context.report.warning("payload-not-loaded",
+                                   f"Payload not loaded - memory limit reached ({memory_before:.0f} MB used, "
+                                   f"limit {limit:g} MB): {prim_path} (its files were checked on disk only)",
+                                   prim=prim_path)
+            return
+
+        stage.Load(prim_path, Usd.LoadWithoutDescendants)
+        try:
+            self.loaded_count += 1
+            nested = self.check_subtree(context, prim_path, owner or prim_path, f"payload of {prim_path}")
+            memory = current_memory_mb()
+            if memory is not None:
+                self.peak_memory = max(self.peak_memory or 0.0, memory)
+                if memory_before is not None and memory - memory_before > self.largest[0]:
+                    self.largest = (memory - memory_before, prim_path)
+            # Payloads inside this payload - loaded while this one is loaded
+            for nested_path in nested:
+                self._load_and_check(nested_path, context, owner or prim_path)
+        finally:
+            stage.Unload(prim_path)  # Release it before the next payload is loaded
+
+
+@contextlib.contextmanager
+def _selected_variant(stage, prim_path, set_name, variant_name):
+    """
+    Select `variant_name` of the variant set `set_name` while the block runs.
+
+    The selection is authored in the stage's session layer (the strongest
+    layer, never saved), so the files on disk are not touched. Afterwards it
+    is removed again, together with the empty "over" specs it needed.
+    """
+    session_layer = stage.GetSessionLayer()
+    variant_set = stage.GetPrimAtPath(prim_path).GetVariantSet(set_name)
+    with Usd.EditContext(stage, session_layer):
+        variant_set.SetVariantSelection(variant_name)
+    try:
+        yield
+    finally:
+        with Usd.EditContext(stage, session_layer):
+            variant_set.ClearVariantSelection()
+        session_layer.RemoveInertSceneDescription()
+
+
+def _issue_key(issue):
+    """What makes two issues the same finding."""
+    return issue["code"], issue["message"], issue["prim"], issue["layer"]
+
+
+def _is_inside(file_path, folder):
+    """True if `file_path` lies inside `folder` (after resolving any "..")."""
+    file_path = os.path.normpath(file_path)
+    return os.path.commonpath([file_path, str(folder)]) == str(folder)
@@ -0,0 +1,270 @@
+"""
+Watch Mode (--watch)
+
+Keeps a file open and validates it again every time one of its layers is saved.
+
+A normal run starts Python, imports USD, opens and composes the whole stage and
+checks every prim - for every single save. In watch mode that happens ONCE.
+After that, a save only costs:
+1. noticing it: the modification times of the stage's layer files are polled
+   (one os.stat per layer and interval - works on every platform and on
+   network drives, no extra packages needed)
+2. reloading ONLY the saved layers (Sdf.Layer.Reload) - USD then recomposes
+   just the prims those layers have opinions on
+3. re-running the prim checks on just the prims USD reports as changed
+   (Usd.Notice.ObjectsChanged). The layer-level checks (sublayers, composition
+   errors, default prim, texture files, ...) always run again, but the paths
+   authored in unchanged layers are remembered instead of read again.
+
+Findings for prims that did not change are kept from the previous run, so
+every run still prints the complete list of problems of the whole file.
+
+Usage:
+    python scripts/validate_scene.py GoodStart_ROOT.usda --watch
+    # ... then save e.g. 020_LYR_USD/Mtl_work_LYR.usda - stop with Ctrl+C
+"""
+
+# Standard library imports
+import os       # For reading file modification times
+import io       # For hiding the rules' detail output on repeated runs
+import time     # For the polling interval and timestamps
+import contextlib  # For redirecting output
+from pathlib import Path  # Modern Python path handling
+
+from pxr import Usd, Sdf, Tf
+# Usd: Main USD API for stages, prims, and change notices
+# Sdf: Scene Description Foundation - layers and prim paths
+# Tf: Tools Foundation - notice registration and USD's error type
+
+from .core import check_stage, detect_kind, open_stage
+from .profiling import usd_trace_scope
+from .report import ValidationReport, print_findings
+from .resolution import open_layer
+
+
+# Default seconds between two looks at the layer files (--watch-interval)
+DEFAULT_WATCH_INTERVAL = 0.5
+
+
+def _file_signature(file_path):
+    """(modification time, size) of `file_path` - changes on every save. None if missing."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _ChangedPrims:
+    """Collects the prims USD recomposes (Usd.Notice.ObjectsChanged) while layers reload."""
+
+    def __init__(self, stage):
+        self.subtrees = set()  # Prims recomposed with all their children ("resynced")
+        self.prims = set()     # Prims where only properties or metadata changed
+        self._listener = Tf.Notice.Register(Usd.Notice.ObjectsChanged, self._on_objects_changed, stage)
+
+    def _on_objects_changed(self, notice, sender):
+        for path in notice.GetResyncedPaths():
+            if path.IsPrimPath() or path.IsAbsoluteRootPath():
+                self.subtrees.add(path)
+            else:
+                self.prims.add(path.GetPrimPath())  # An added or removed property
+        for path in notice.GetChangedInfoOnlyPaths():
+            if not path.IsAbsoluteRootPath():  # Layer metadata - checked by the layer-level rules
+                self.prims.add(path.GetPrimPath())
+
+    def take(self):
+        """The collected (subtrees, prims) - and start collecting anew."""
+        subtrees, prims = self.subtrees, self.prims
+        self.subtrees, self.prims = set(), set()
+        return subtrees, prims
+
+    def revoke(self):
+        """Stop listening."""
+        self._listener.Revoke()
+
+
+class _Watcher:
+    """
+    The open stage of the watched file, the files it is built from, and the
+    prim findings of the previous runs.
+    """
+
+    def __init__(self, usd_file, kind, options):
+        self.usd_file = usd_file
+        self.kind = kind
+        self.options = options  # The options of check_stage() (open_sublayer_stages, load_none, ...)
+        self.stage = None
+        self.changes = None
+        self.signatures = {}   # File path -> _file_signature() when last read
+        self.prim_issues = {}  # Prim path -> issues of that prim (from the last run that checked it)
+        self.read_errors = {}  # Layer file path -> why its newest version could not be read
+        self.layer_paths = {}  # Layer identifier -> paths authored in it (see ValidationContext)
+        self.mesh_counts = {}  # Prim path -> mesh counts, for the geometry budget (see MeshGeometryRule)
+        self.prim_total = 0    # Prims in the stage (counted by the last full run)
+
+    def open(self):
+        """Open (or re-open) the stage and validate it completely. Returns the report."""
+        if self.changes:
+            self.changes.revoke()
+        self.stage, self.changes = None, None
+        self.prim_issues, self.read_errors, self.layer_paths, self.mesh_counts = {}, {}, {}, {}
+
+        report = ValidationReport(self.usd_file, self.kind)
+        with report.phase("total"):
+            with report.phase("open"), usd_trace_scope(report):
+                try:
+                    # Payloads loaded one at a time are loaded by the rules, not when opening
+                    load_none = self.options["load_none"] or self.options["one_payload_at_a_time"]
+                    self.stage = open_stage(self.usd_file, load_none=load_none, mask=self.options["mask"])
+                except Tf.ErrorException:
+                    self.stage = None  # Syntax error in the file itself
+            if not self.stage:
+                report.error("open-failed", f"Failed to open file: {self.usd_file}")
+                self.signatures = {str(self.usd_file): _file_signature(self.usd_file)}
+                return report
+            self.changes = _ChangedPrims(self.stage)
+            context = self._check(report)
+
+        print(f"\n{self.kind.capitalize()} contains {context.prim_count} prims")
+        return report
+
+    def _check(self, report, subtrees=None, single_prims=()):
+        """Run the rules (on all prims or just the changed ones) and merge in the kept prim findings."""
+        for file_path, message in self.read_errors.items():
+            report.error("parse-error", message, layer=file_path)
+        context = check_stage(self.stage, self.kind, report, subtrees=subtrees, single_prims=single_prims,
+                              layer_paths_cache=self.layer_paths, mesh_counts_cache=self.mesh_counts,
+                              **self.options)
+
+        if subtrees is None:
+            self.prim_issues = dict(context.prim_issues)
+            self.prim_total = context.prim_count
+        else:
+            # Forget the findings of every prim that was checked again ...
+            for prim_path in list(self.prim_issues):
+                if prim_path in single_prims or any(prim_path.HasPrefix(root) for root in subtrees):
+                    del self.prim_issues[prim_path]
+            # ... and take the new ones
+            self.prim_issues.update(context.prim_issues)
+
+        # Layer-level findings of this run first, then the findings of all prims
+        new_prim_issues = {id(issue) for issues in context.prim_issues.values() for issue in issues}
+        report.issues = [issue for issue in report.issues if id(issue) not in new_prim_issues]
+        report.issues.extend(issue for issues in self.prim_issues.values() for issue in issues)
+        report.stats.update(prims=self.prim_total, revalidated_prims=context.prim_count)
+
+        self._update_signatures(context)
+        return context
+
+    def _update_signatures(self, context):
+        """Watch every layer the stage uses now, plus the sublayers that are still missing."""
+        watched = [layer.realPath for layer in self.stage.GetUsedLayers() if not layer.anonymous and layer.realPath]
+        watched.extend(anchored_path.strip("@") for anchored_path in context.broken_sublayers)
+        self.signatures = {file_path: self.signatures.get(file_path) or _file_signature(file_path)
+                           for file_path in watched}
+
+    def changed_files(self):
+        """The watched files that were saved (or created or deleted) since they were last read."""
+        return [file_path for file_path, signature in self.signatures.items()
+                if _file_signature(file_path) != signature]
+
+    def revalidate(self, changed_files):
+        """Reload `changed_files` and check the prims they changed. Returns the report."""
+        report = ValidationReport(self.usd_file, self.kind)
+        with report.phase("total"):
+            with report.phase("reload"):
+                reopen = self.stage is None
+                if self.changes:
+                    self.changes.take()  # Forget changes from before
+                for file_path in changed_files:
+                    self.signatures[file_path] = _file_signature(file_path)
+                    layer = Sdf.Layer.Find(file_path)
+                    if layer is None:
+                        reopen = True  # A file the stage could not use before (e.g. a new sublayer)
+                        continue
+                    self.layer_paths.pop(layer.identifier, None)  # Read its paths again
+                    try:
+                        reloaded = layer.Reload()
+                        error = None if reloaded else f"Cannot read layer: {file_path}"
+                    except Tf.ErrorException as exc:
+                        error = f"Cannot parse layer: {file_path} ({' '.join(str(exc).split())})"
+                    if error:
+                        # USD keeps the last version it could read - validate that one
+                        self.read_errors[file_path] = error + " - validating its last readable version"
+                    else:
+                        self.read_errors.pop(file_path, None)
+
+            if reopen:
+                return None  # The caller opens the stage again
+
+            subtrees, single_prims = self.changes.take()
+            if Sdf.Path.absoluteRootPath in subtrees or any(
+                    Usd.Prim.IsPathInPrototype(path) for path in subtrees | single_prims):
+                # The whole stage was recomposed (e.g. sublayers changed), or an
+                # instance prototype changed - the prims that use it are not
+                # listed one by one, so check everything
+                subtrees, single_prims = None, ()
+            else:
+                subtrees = sorted(subtrees)
+            # The rules' detail output was already shown by the first run
+            with contextlib.redirect_stdout(io.StringIO()):
+                context = self._check(report, subtrees, single_prims)
+
+        print(f"Revalidated {context.prim_count} of {self.prim_total} prims "
+              f"in {report.timings['total'] * 1000:.0f} ms")
+        return report
+
+
+def watch_file(usd_file, kind=None, interval=DEFAULT_WATCH_INTERVAL, on_result=None,
+               open_sublayer_stages=False, load_none=False, mask=None, all_instances=False,
+               all_variants=False, one_payload_at_a_time=False, payload_memory_limit=None,
+               max_faces=None, max_points=None):
+    """
+    Validate `usd_file`, then keep it open and validate again whenever one of
+    its layer files changes - until Ctrl+C.
+
+    kind is "asset" or "scene" (None = auto-detect, see detect_kind()).
+    Every `interval` seconds the layer files are checked for changes.
+    on_result(report) is called after every run, e.g. to write a JSON report.
+    The other options work like in validate_scene() and validate_asset() (see core.py).
+
+    Returns True if the last run passed (warnings are OK).
+    """
+    usd_file = Path(usd_file).resolve()
+    if kind is None:
+        root_layer, _ = open_layer(str(usd_file))
+        kind = detect_kind(usd_file, root_layer) if root_layer else "asset"
+    title = f"{kind.capitalize()} validation"
+    watcher = _Watcher(usd_file, kind, {"open_sublayer_stages": open_sublayer_stages, "load_none": load_none,
+                                        "mask": mask, "all_instances": all_instances,
+                                        "all_variants": all_variants,
+                                        "one_payload_at_a_time": one_payload_at_a_time,
+                                        "payload_memory_limit": payload_memory_limit,
+                                        "max_faces": max_faces, "max_points": max_points})
+
+    def finish_run(report):
+        print_findings(report, title)
+        if on_result:
+            on_result(report)
+        print(f"\nWatching {len(watcher.signatures)} file(s) for changes - press Ctrl+C to stop")
+        return report
+
+    print(f"Validating {kind}: {usd_file}")
+    report = finish_run(watcher.open())
+    try:
+        while True:
+            time.sleep(interval)
+            changed_files = watcher.changed_files()
+            if not changed_files:
+                continue
+            names = ", ".join(os.path.relpath(file_path, usd_file.parent) for file_path in changed_files)
+            print(f"\n[{time.strftime('%H:%M:%S')}] Changed: {names}")
+            result = watcher.revalidate(changed_files)
+            if result is None:
+                print("Re-opening the stage")
+                result = watcher.open()
+            report = finish_run(result)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    return report.passed
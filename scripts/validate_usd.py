@@ -16,323 +16,195 @@ Usage:
     python scripts/validate_usd.py path/to/asset.usda
     python scripts/validate_usd.py GoodStart_ROOT.usda
 
+    # Batch / whole-tree mode: validate many files in ONE process
+    python scripts/validate_usd.py --tree 010_ASS_USD 020_LYR_USD GoodStart_ROOT.usda
+
+    # Parallel mode: spread the files over 8 worker processes (0 = all CPU cores)
+    python scripts/validate_usd.py --jobs 8 010_ASS_USD 020_LYR_USD GoodStart_ROOT.usda
+
+    # Fast layer-only scan (no stage composition) - e.g. for pre-commit hooks
+    python scripts/validate_usd.py --fast --tree 020_LYR_USD
+
+    # Incremental mode: only re-validate what changed since the last run
+    python scripts/validate_usd.py --cache --tree 010_ASS_USD 020_LYR_USD GoodStart_ROOT.usda
+
+    # Large scenes: don't load payloads, and only validate part of the scene
+    python scripts/validate_usd.py --load-none --mask /World/Geo GoodStart_ROOT.usda
+
+    # Watch mode: keep the file open and validate again whenever a layer is saved
+    python scripts/validate_usd.py --watch GoodStart_ROOT.usda
+
+    # Where does the time go? Per-phase/per-rule timings and a Chrome trace
+    python scripts/validate_usd.py --profile-trace trace.json --tree 010_ASS_USD GoodStart_ROOT.usda
+
+    # Machine-readable reports (issue codes, severities, per-phase timings)
+    python scripts/validate_usd.py --tree 010_ASS_USD GoodStart_ROOT.usda --format json > report.json
+    python scripts/validate_usd.py --tree 010_ASS_USD GoodStart_ROOT.usda --format junit -o report.xml
+
 Note: This script validates USD files but does not modify them. USD files should use
 relative paths (e.g., @../010_ASS_USD/asset.usd@, @./020_LYR_USD/file.usda@) for portability.
 The script uses absolute paths internally for validation but USD files themselves should
 contain relative paths. See README.md "Path Best Practices" section for guidance.
+
+The checks themselves live in the usd_goodstart.validate package (same folder),
+see usd_goodstart/validate/rules.py. This script is the command-line front end.
 """
 
 # Standard library imports
 import sys      # For command-line arguments and exit codes
 import os       # For operating system operations
+import argparse # For parsing command-line options (--tree, --jobs, ...)
 from pathlib import Path  # Modern Python path handling
 
-# USD library imports
+# USD library check
 try:
-    from pxr import Usd, Sdf, UsdUtils
-    # Usd: Main USD API for stages, prims, and high-level operations
-    # Sdf: Scene Description Foundation - low-level layer and data access
-    # UsdUtils: Utility functions for USD operations
+    import pxr  # noqa: F401 - only checks that usd-core is installed
 except ImportError:
     print("Error: usd-core not installed. Install with: pip install usd-core")
     sys.exit(1)
 
-
-def validate_asset(asset_path):
-    """
-    Validate a USD asset file.
-    
-    What is a USD Asset?
-    - A USD asset is typically a single USD file containing geometry, materials, or other 3D content
-    - Assets are reusable building blocks that can be referenced by scenes
-    - Examples: A character model, a prop, a material definition
-    
-    This function checks:
-    1. File exists and can be opened
-    2. All prims (3D objects) are valid
-    3. References to other files are valid
-    4. Layer composition is correct
-    5. Best practices are followed
-    """
-    # Convert to absolute path and resolve any ".." or "." in the path
-    asset_path = Path(asset_path).resolve()
-    
-    # Check if file exists
-    if not asset_path.exists():
-        print(f"ERROR: Asset file not found: {asset_path}")
-        return False
-    
-    print(f"Validating asset: {asset_path}")
-    
-    # Open the USD file as a Stage
-    # A Stage is USD's main container - think of it as the "scene" or "world"
-    stage = Usd.Stage.Open(str(asset_path))
-    if not stage:
-        print(f"ERROR: Failed to open USD file: {asset_path}")
-        return False
-    
-    # Initialize lists to collect problems
-    errors = []      # Critical issues that prevent the asset from working
-    warnings = []    # Issues that might cause problems but don't break the asset
-    
-    # Check for root layer (the main file itself)
-    root_layer = stage.GetRootLayer()
-    if not root_layer:
-        errors.append("No root layer found")
-        return False
-    
-    # Validate all prims in the asset
-    # A "prim" is USD's term for any object (geometry, lights, cameras, materials, etc.)
-    prim_count = 0
-    for prim in stage.Traverse():  # Traverse walks through ALL prims in the hierarchy
-        prim_count += 1
-        
-        # Check if this prim is valid
-        if not prim.IsValid():
-            errors.append(f"Invalid prim: {prim.GetPath()}")
-            continue  # Skip to next prim
-        
-        # Check for broken references
-        # References are USD's way of linking to other USD files
-        if prim.HasAuthoredReferences():
-            # Get all references this prim points to
-            refs = prim.GetReferences().GetAddedOrExplicitItems()
-            for ref in refs:
-                ref_path = ref.assetPath  # The path to the referenced file
-                if ref_path:
-                    # Use USD's built-in asset resolver to find the file
-                    resolved_layer = Sdf.Layer.FindOrOpen(ref_path)
-                    if not resolved_layer:
-                        # If USD's resolver can't find it, check if it's a relative path
-                        if not ref_path.startswith("@"):  # "@" indicates USD asset path
-                            # Try resolving relative to current layer's location
-                            layer_path = root_layer.ResolvePath(ref_path)
-                            if not layer_path or not Path(layer_path).exists():
-                                # Warning (not error) because file might be elsewhere or created dynamically
-                                warnings.append(f"Potential missing reference: {ref_path} at {prim.GetPath()}")
-    
-    print(f"Found {prim_count} prims")
-    
-    # Check layer composition (sublayers)
-    # Sublayers are additional USD files stacked on top of the root layer
-    if root_layer:
-        sublayers = root_layer.subLayerPaths
-        if sublayers:
-            for sublayer_path in sublayers:
-                # Resolve the sublayer path
-                resolved_path = root_layer.ResolvePath(sublayer_path)
-                if not resolved_path:
-                    warnings.append(f"Cannot resolve sublayer: {sublayer_path}")
-                elif not Path(resolved_path).exists():
-                    warnings.append(f"Missing sublayer file: {resolved_path}")
-    
-    # Check for default prim (USD best practice)
-    # Default prim tells tools which prim to focus on when opening the file
-    if not stage.GetDefaultPrim():
-        warnings.append("No default prim set (recommended for asset files)")
-    
-    # Report results
-    if errors:
-        print("\nERRORS:")
-        for error in errors:
-            print(f"  - {error}")
-    
-    if warnings:
-        print("\nWARNINGS:")
-        for warning in warnings:
-            print(f"  - {warning}")
-    
-    if not errors and not warnings:
-        print("\n✓ Asset validation passed")
-        return True
-    
-    if errors:
-        print(f"\n✗ Asset validation failed with {len(errors)} error(s)")
-    else:
-        print(f"\n⚠ Asset validation passed with {len(warnings)} warning(s)")
-    
-    return len(errors) == 0
-
-
-def validate_scene(root_file):
-    """
-    Validate entire USD scene.
-    
-    What is a USD Scene?
-    - A scene is typically the "root" or "master" USD file that combines multiple layers
-    - Scenes use "sublayers" to stack multiple USD files together
-    - The root file references layer files (like AssetImport_LYR.usda) which then reference assets
-    - Example: GoodStart_ROOT.usda combines multiple layer files to build the final scene
-    
-    This function checks:
-    1. Root file exists and can be opened
-    2. All sublayers exist and can be opened
-    3. Layer ordering follows best practices (asset imports at bottom)
-    4. All prims in the composed scene are valid
-    5. Best practices are followed (default prim, etc.)
-    """
-    # Convert to absolute path
-    root_file = Path(root_file).resolve()
-    
-    # Check if root file exists
-    if not root_file.exists():
-        print(f"ERROR: Root file not found: {root_file}")
-        return False
-    
-    print(f"Validating scene: {root_file}")
-    
-    # Open the root USD file as a Stage
-    # The stage represents the final composed scene (root + all sublayers combined)
-    stage = Usd.Stage.Open(str(root_file))
-    if not stage:
-        print(f"ERROR: Failed to open root file: {root_file}")
-        return False
-    
-    # Initialize lists to collect problems
-    errors = []      # Critical issues
-    warnings = []    # Potential issues
-    
-    # Check for root layer (the main file itself)
-    root_layer = stage.GetRootLayer()
-    if not root_layer:
-        errors.append("No root layer found")
-        return False
-    
-    # Validate all sublayers
-    # Sublayers are additional USD files that are "stacked" on top of the root layer
-    sublayers = root_layer.subLayerPaths
-    print(f"\nFound {len(sublayers)} sublayers:")
-    
-    # Check each sublayer
-    for i, sublayer_path in enumerate(sublayers):
-        print(f"  {i+1}. {sublayer_path}")
-        # Resolve the sublayer path (handle relative paths)
-        resolved_path = root_layer.ResolvePath(sublayer_path)
-        
-        if not resolved_path:
-            errors.append(f"Cannot resolve sublayer: {sublayer_path}")
-        elif not Path(resolved_path).exists():
-            errors.append(f"Missing sublayer file: {resolved_path}")
-        else:
-            # Validate sublayer can be opened as a USD layer
-            sublayer_layer = Sdf.Layer.FindOrOpen(str(resolved_path))
-            if not sublayer_layer:
-                warnings.append(f"Cannot open sublayer: {resolved_path}")
-            else:
-                # Also try opening as a full Stage to validate composition
-                sublayer_stage = Usd.Stage.Open(str(resolved_path))
-                if not sublayer_stage:
-                    warnings.append(f"Sublayer opens but stage validation failed: {resolved_path}")
-    
-    # Check layer ordering (USD best practice)
-    # Asset import layers should be at the BOTTOM (last in list)
-    # This allows other layers to override/modify imported assets
-    if sublayers:
-        last_layer = sublayers[-1]  # Last layer has highest "strength"
-        if "AssetImport" in last_layer or "asset" in last_layer.lower():
-            print("✓ Asset import layer correctly positioned at bottom")
-        else:
-            warnings.append("Consider placing asset import layer at bottom of subLayers array")
-    
-    # Check for default prim (USD best practice)
-    if not stage.GetDefaultPrim():
-        warnings.append("No default prim set (recommended for scene files)")
-    
-    # Validate all prims in the composed scene
-    prim_count = 0
-    invalid_prim_count = 0
-    for prim in stage.Traverse():
-        prim_count += 1
-        if not prim.IsValid():
-            invalid_prim_count += 1
-            errors.append(f"Invalid prim: {prim.GetPath()}")
-    
-    print(f"\nScene contains {prim_count} prims")
-    if invalid_prim_count > 0:
-        print(f"  ⚠ {invalid_prim_count} invalid prim(s) found")
-    
-    # Report results
-    if errors:
-        print("\nERRORS:")
-        for error in errors:
-            print(f"  - {error}")
-    
-    if warnings:
-        print("\nWARNINGS:")
-        for warning in warnings:
-            print(f"  - {warning}")
-    
-    if not errors and not warnings:
-        print("\n✓ Scene validation passed")
-        return True
-    
-    if errors:
-        print(f"\n✗ Scene validation failed with {len(errors)} error(s)")
-    else:
-        print(f"\n⚠ Scene validation passed with {len(warnings)} warning(s)")
-    
-    return len(errors) == 0
+# The validation package (scripts/usd_goodstart/validate)
+from usd_goodstart.validate import (
+    DEFAULT_CACHE_DIR,
+    ValidationReport,
+    human_output_for,
+    validate_file,
+    validate_tree,
+    write_reports,
+)
+from usd_goodstart.validate.cli import (
+    add_geometry_arguments,
+    add_probe_arguments,
+    add_profile_arguments,
+    add_report_arguments,
+    add_stage_loading_arguments,
+    add_watch_arguments,
+    apply_probe_arguments,
+    apply_profile_arguments,
+    check_geometry_arguments,
+    check_stage_loading_arguments,
+    check_watch_arguments,
+    report_profile,
+)
+from usd_goodstart.validate.watch import watch_file
 
 
 def main():
     """
     Main function - entry point when script is run from command line.
     
-    This function implements AUTO-DETECTION logic:
+    This function implements AUTO-DETECTION logic (see validate_file()):
     - It tries to figure out if the file is an asset or a scene
     - Uses heuristics: number of sublayers, filename patterns
     - Falls back to asset validation if uncertain
     
     Command-line arguments:
-    - sys.argv[0] = script name (validate_usd.py)
-    - sys.argv[1] = first argument (the USD file path to validate)
+    - path(s) to the USD file(s) to validate
+    - --tree: batch mode, accepts several files and folders (validated in one process)
+    - --jobs N: like --tree, but spread the files over N worker processes
+    - --fast: layer-only scan (no stage composition), for quick pre-commit checks
+    - --cache [DIR]: skip files whose content and dependencies did not change
+    - --load-none: don't load payloads (their files are still checked)
+    - --mask PRIM_PATH: only compose and validate these prims (repeatable)
+    - --all-instances: walk every instance, not just one per prototype
+    - --all-variants: also validate the variants that are not selected
+    - --payloads-one-at-a-time: load, validate and unload one payload after the other
+      (--payload-memory-limit MB: stop loading payloads above that memory use)
+    - --max-faces N, --max-points N: geometry budget of an asset (all meshes together)
+    - --format json|junit, --output FILE: machine-readable report
+    - --probe-workers N, --probe-timeout SECONDS: concurrent file checks (network storage)
+    - --watch: validate again whenever a layer is saved (--watch-interval SECONDS)
+    - --profile: where the time went (--profile-trace FILE: Chrome trace, --usd-trace: with USD's own events)
     """
-    # Check if user provided a file path
-    if len(sys.argv) < 2:
-        print("Usage: python validate_usd.py <path_to_usd_file>")
-        print("\nThis script auto-detects whether to validate as asset or scene.")
-        print("For explicit control, use:")
-        print("  python scripts/validate_asset.py <asset_file>")
-        print("  python scripts/validate_scene.py <scene_file>")
-        sys.exit(1)
-    
-    # Get the file path from command-line arguments
-    usd_file = Path(sys.argv[1])
-    
-    # AUTO-DETECTION LOGIC:
-    # Try to determine if this is an asset or a scene based on file structure
-    
-    # First, try to open the file to examine its structure
-    stage = Usd.Stage.Open(str(usd_file))
-    if stage:
-        root_layer = stage.GetRootLayer()
-        if root_layer:
-            sublayers = root_layer.subLayerPaths
-            
-            # Heuristic 1: Number of sublayers
-            # Scenes typically have multiple sublayers (e.g., 3-4+ layer files)
-            # Assets typically have 0-1 sublayers (or none at all)
-            
-            # Heuristic 2: Filename pattern
-            # Files with "ROOT" or "root" in the name are usually scenes
-            # Examples: GoodStart_ROOT.usda, scene_root.usd
-            
-            # Decision logic:
-            if len(sublayers) > 2 or "root" in usd_file.name.lower():
-                # Likely a scene - validate as scene
-                # Scenes have more complex validation (layer ordering, etc.)
-                success = validate_scene(usd_file)
-            else:
-                # Likely an asset - validate as asset
-                # Assets have simpler structure
-                success = validate_asset(usd_file)
+    parser = argparse.ArgumentParser(
+        description="Validate USD assets or scenes (auto-detected).",
+        epilog="For explicit control, use scripts/validate_asset.py or scripts/validate_scene.py",
+    )
+    parser.add_argument("paths", nargs="+", metavar="PATH",
+                        help="USD file to validate (with --tree: files and/or folders)")
+    parser.add_argument("--tree", action="store_true",
+                        help="Batch mode: validate every USD file in the given files/folders "
+                             "in one process with a shared layer and resolver cache")
+    parser.add_argument("--jobs", "-j", type=int, default=1, metavar="N",
+                        help="Validate files in parallel with N worker processes "
+                             "(0 = one per CPU core). Implies --tree.")
+    parser.add_argument("--open-sublayer-stages", action="store_true",
+                        help="Scenes only: additionally open every sublayer as its own stage "
+                             "(slow, one extra composition per sublayer)")
+    parser.add_argument("--fast", action="store_true",
+                        help="Layer-only scan: check that every layer parses and every authored "
+                             "path resolves, without composing a stage")
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_CACHE_DIR, default=None, metavar="DIR",
+                        help="Incremental mode: reuse results of files whose content and "
+                             f"dependencies did not change (stored in DIR, default {DEFAULT_CACHE_DIR})")
+    add_stage_loading_arguments(parser)  # --load-none, --mask, --all-instances, --all-variants, payloads
+    add_geometry_arguments(parser)  # --max-faces, --max-points
+    add_report_arguments(parser)  # --format, --output
+    add_probe_arguments(parser)  # --probe-workers, --probe-timeout
+    add_watch_arguments(parser)  # --watch, --watch-interval
+    add_profile_arguments(parser)  # --profile, --profile-trace, --usd-trace
+    args = parser.parse_args()
+    
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 or a positive number")
+    check_stage_loading_arguments(parser, args)
+    check_geometry_arguments(parser, args)
+    check_watch_arguments(parser, args)
+    apply_probe_arguments(parser, args)
+    apply_profile_arguments(parser, args)
+    if args.fast and (args.load_none or args.mask or args.all_instances or args.all_variants
+                      or args.payloads_one_at_a_time or args.max_faces or args.max_points):
+        parser.error("--fast never composes a stage; --load-none, --mask, --all-instances, "
+                     "--all-variants, --payloads-one-at-a-time, --max-faces and --max-points "
+                     "cannot be used with it")
+    jobs = args.jobs or os.cpu_count() or 1
+    if len(args.paths) > 1 and not (args.tree or args.jobs != 1):
+        parser.error("multiple paths require --tree")
+    if args.watch and (args.tree or args.jobs != 1 or args.fast or args.cache):
+        parser.error("--watch keeps ONE file open; it cannot be used with --tree, --jobs, --fast or --cache")
+
+    def on_result(report):
+        """After every --watch run: rewrite the json/junit report, print the profile."""
+        write_reports([report], args.format, args.output)
+        report_profile(args, [report])
+
+    if args.watch:
+        # Keep the file open and validate again after every save (until Ctrl+C).
+        # A json/junit report is rewritten after every run.
+        success = watch_file(args.paths[0], interval=args.watch_interval,
+                             on_result=on_result,
+                             open_sublayer_stages=args.open_sublayer_stages, load_none=args.load_none,
+                             mask=args.mask, all_instances=args.all_instances,
+                             all_variants=args.all_variants,
+                             one_payload_at_a_time=args.payloads_one_at_a_time,
+                             payload_memory_limit=args.payload_memory_limit,
+                             max_faces=args.max_faces, max_points=args.max_points)
+        sys.exit(0 if success else 1)
+    
+    options = {"fast": args.fast, "cache_dir": args.cache,
+               "open_sublayer_stages": args.open_sublayer_stages,
+               "load_none": args.load_none, "mask": args.mask, "all_instances": args.all_instances,
+               "all_variants": args.all_variants, "one_payload_at_a_time": args.payloads_one_at_a_time,
+               "payload_memory_limit": args.payload_memory_limit,
+               "max_faces": args.max_faces, "max_points": args.max_points}
+    reports = []
+    # With --format json/junit (and no --output) the human-readable text goes
+    # to stderr, so stdout only contains the machine-readable report
+    with human_output_for(args.format, args.output):
+        if args.tree or args.jobs != 1:
+            success = validate_tree(args.paths, jobs=jobs, reports=reports, **options)
         else:
-            # No root layer - can't determine, default to asset validation
-            success = validate_asset(usd_file)
-    else:
-        # Can't open file - exit with error
-        print(f"ERROR: Cannot open USD file: {usd_file}")
-        sys.exit(1)
+            usd_file = Path(args.paths[0])
+            report = ValidationReport(usd_file.resolve())
+            reports.append(report)
+            if not usd_file.exists():
+                report.error("file-not-found", f"Cannot open USD file: {usd_file}")
+                print(f"ERROR: Cannot open USD file: {usd_file}")
+                success = False
+            else:
+                success = validate_file(usd_file, report=report, **options)
+        report_profile(args, reports)
+    write_reports(reports, args.format, args.output)
     
     # Exit with appropriate code:
     # - 0 = success (no errors)
@@ -344,4 +216,3 @@ def main():
 # (not when imported as a module)
 if __name__ == "__main__":
     main()
-